@@ -0,0 +1,88 @@
+"""Compare database size and throughput of the livedata storage codecs, with and
+without delta encoding.
+
+Run with: python -m benchmarks.bench_dbcodec [--matches N] [--keyframe-interval K]
+"""
+
+import asyncio
+import itertools
+import pathlib
+import tempfile
+import time
+
+import click
+
+from tcboard.dbmanager import DBManager
+from tcboard.ext.squore import SQUORE_CODEC, SquoreMatchLiveData
+
+from .squore import make_livedata
+
+
+async def measure(
+    codec: str | None,
+    livedata: list[SquoreMatchLiveData],
+    *,
+    file: pathlib.Path,
+    keyframe_interval: int | None = None,
+) -> tuple[float, float, int]:
+    async with DBManager(
+        file=file,
+        codec=codec,
+        profile="performance",
+        delta_keyframe_interval=keyframe_interval,
+    ) as db:
+        await db.init_tables()
+        start = time.perf_counter()
+        for ld in livedata:
+            await db.record_livedata(ld)
+        written = time.perf_counter() - start
+
+        start = time.perf_counter()
+        nrecs = len([r async for r in db.get_all_tournament_and_livedata_records()])
+        read = time.perf_counter() - start
+        assert nrecs == len(livedata)
+
+        async with db.execute("pragma wal_checkpoint(truncate)"):
+            pass
+        await db.execute("vacuum")
+
+    return len(livedata) / written, len(livedata) / read, file.stat().st_size
+
+
+@click.command()
+@click.option("--matches", "-n", type=click.IntRange(min=1), default=20)
+@click.option(
+    "--keyframe-interval",
+    "-k",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+)
+def main(matches: int, keyframe_interval: int) -> None:
+    """Store livedata of five-game matches with each codec and report sizes"""
+    livedata = [
+        ld for i in range(matches) for ld in make_livedata(f"42-{i}", court=i % 8)
+    ]
+    click.echo(f"{len(livedata)} records of {matches} five-game matches")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for codec, interval in itertools.product(
+            (None, "zlib", SQUORE_CODEC.name), (None, keyframe_interval)
+        ):
+            name = f"{codec or 'none'}{'+delta' if interval else ''}"
+            write, read, size = asyncio.run(
+                measure(
+                    codec,
+                    livedata,
+                    file=pathlib.Path(tmpdir) / f"{name}.sqlite",
+                    keyframe_interval=interval,
+                )
+            )
+            click.echo(
+                f"{name:>20s}: {size / 1024:9.1f} KiB "
+                f"({size / len(livedata):7.1f} B/record), "
+                f"write {write:8.1f} rec/s, read {read:9.1f} rec/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
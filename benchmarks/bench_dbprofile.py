@@ -0,0 +1,66 @@
+"""Compare ingest throughput of DBManager under the available SQLite profiles.
+
+Run with: python -m benchmarks.bench_dbprofile [--records N] [--write-behind]
+"""
+
+import asyncio
+import pathlib
+import tempfile
+import time
+
+import click
+from pydantic import BaseModel
+
+from tcboard.dbmanager import PROFILES, DBManager
+
+
+class Record(BaseModel):
+    matchid: str
+    score: list[list[str]]
+
+
+async def measure(
+    profile: str, *, records: int, write_behind: bool, directory: pathlib.Path
+) -> float:
+    file = directory / f"{profile}-{int(write_behind)}.sqlite"
+    record = Record(matchid="42-1", score=[["R1--", "--L1"] * 10] * 3)
+    async with DBManager(file=file, profile=profile, write_behind=write_behind) as db:
+        await db.init_tables()
+        start = time.perf_counter()
+        if write_behind:
+            await asyncio.gather(
+                *(
+                    db.insert_json_record("squorelivedata", record)
+                    for _ in range(records)
+                )
+            )
+        else:
+            for _ in range(records):
+                await db.insert_json_record("squorelivedata", record)
+        elapsed = time.perf_counter() - start
+
+    return records / elapsed
+
+
+@click.command()
+@click.option("--records", "-n", type=click.IntRange(min=1), default=2000)
+@click.option("--write-behind", is_flag=True, help="Also measure write-behind mode")
+def main(records: int, write_behind: bool) -> None:
+    """Insert records under each profile and report records/second"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for wb in (False, True) if write_behind else (False,):
+            for profile in PROFILES:
+                rate = asyncio.run(
+                    measure(
+                        profile,
+                        records=records,
+                        write_behind=wb,
+                        directory=pathlib.Path(tmpdir),
+                    )
+                )
+                mode = "write-behind" if wb else "direct"
+                click.echo(f"{profile:>12s} {mode:>12s}: {rate:10.1f} records/s")
+
+
+if __name__ == "__main__":
+    main()
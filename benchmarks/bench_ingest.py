@@ -0,0 +1,47 @@
+"""Compare ingest throughput of raw Squore packets through the generic ModelABC
+registry dispatch, and through LiveData.ingest_json().
+
+Run with: python -m benchmarks.bench_ingest [--repeat N]
+"""
+
+import json
+import time
+from collections.abc import Callable
+
+import click
+
+from tcboard.ext.squore import SquoreMatchLiveData
+from tcboard.livedata import LiveData
+
+from .squore import make_packets_json
+
+MODELID = SquoreMatchLiveData._model_name()
+
+
+def via_registry(raw: bytes) -> LiveData:
+    # what callers had to do: parse to Python, then dispatch by model ID
+    return LiveData.make_model_instance(json.loads(raw), modelid=MODELID)
+
+
+def measure(ingest: Callable[[bytes], LiveData], packets: list[bytes]) -> float:
+    start = time.perf_counter()
+    for raw in packets:
+        ingest(raw)
+    return len(packets) / (time.perf_counter() - start)
+
+
+@click.command()
+@click.option("--repeat", "-n", type=click.IntRange(min=1), default=10)
+def main(repeat: int) -> None:
+    """Ingest the packets of five-game matches"""
+    packets = make_packets_json() * repeat
+    click.echo(f"{len(packets)} packets")
+    for name, ingest in (
+        ("registry", via_registry),
+        ("ingest_json", LiveData.ingest_json),
+    ):
+        click.echo(f"{name:>12s}: {measure(ingest, packets):9.1f} packets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure the cost per Squore packet of what the board does with livedata, with
+and without memoization of the derived fields, and of parsing the games of each
+packet, with and without reusing those parsed for the previous packet.
+
+Run with: python -m benchmarks.bench_livedata [--repeat N]
+"""
+
+import functools
+import time
+from collections.abc import Callable
+from typing import Any
+
+import click
+
+from tcboard.ext.squore import SquoreMatchLiveData
+from tcboard.livestatus import LiveStatus
+
+from .squore import make_packets
+
+
+def handle(ld: SquoreMatchLiveData, forget: Callable[[], None]) -> None:
+    # roughly what MatchState does on receipt, when sorting, and when dumping;
+    # forget() is called in between to undo the memoization
+    for _ in range(3):
+        _ = ld.status >= LiveStatus.WARMUP
+        forget()
+    _ = ld.endtime if ld.status == LiveStatus.FINISHED else ld.starttime
+    forget()
+    _ = ld.matchscore
+    forget()
+    ld.model_dump_json()
+
+
+def forget(ld: SquoreMatchLiveData) -> None:
+    ld._memo.clear()
+    ld._parsed = []
+
+
+def measure(packets: list[dict[str, Any]], *, repeat: int, memoize: bool) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        livedata = [SquoreMatchLiveData.model_validate(p) for p in packets]
+        start = time.perf_counter()
+        for ld in livedata:
+            handle(ld, (lambda: None) if memoize else functools.partial(forget, ld))
+        elapsed += time.perf_counter() - start
+
+    return elapsed / (repeat * len(packets))
+
+
+def measure_games(
+    packets: list[dict[str, Any]], *, repeat: int, incremental: bool
+) -> float:
+    elapsed = 0.0
+    for _ in range(repeat):
+        livedata = [SquoreMatchLiveData.model_validate(p) for p in packets]
+        start = time.perf_counter()
+        for prev, ld in zip([None, *livedata], livedata, strict=False):
+            if incremental and prev is not None:
+                ld.continue_from(prev)
+            _ = ld.games
+        elapsed += time.perf_counter() - start
+
+    return elapsed / (repeat * len(packets))
+
+
+@click.command()
+@click.option("--repeat", "-n", type=click.IntRange(min=1), default=5)
+def main(repeat: int) -> None:
+    """Handle the packets of a five-game match with and without memoization"""
+    packets = make_packets()
+    click.echo(f"{len(packets)} packets of a five-game match, {repeat} time(s)")
+    for memoize in (False, True):
+        per_packet = measure(packets, repeat=repeat, memoize=memoize)
+        click.echo(
+            f"{'memoized' if memoize else 'recomputed':>20s}: "
+            f"{per_packet * 1e6:8.1f} µs/packet"
+        )
+    for incremental in (False, True):
+        per_packet = measure_games(packets, repeat=repeat, incremental=incremental)
+        click.echo(
+            f"{'games, incremental' if incremental else 'games, full':>20s}: "
+            f"{per_packet * 1e6:8.1f} µs/packet"
+        )
+
+
+if __name__ == "__main__":
+    main()
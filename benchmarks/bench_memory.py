@@ -0,0 +1,105 @@
+"""Measure the memory taken by the livedata history of a tournament, as kept for
+replay, with and without sharing sub-models and interning strings.
+
+Each variant runs in fresh processes, once traced, and once not, so that the
+peak resident set sizes are comparable, and not inflated by tracing.
+
+Run with: python -m benchmarks.bench_memory [--courts N] [--rounds N]
+"""
+
+import itertools
+import multiprocessing
+import resource
+import tracemalloc
+from datetime import datetime, timedelta
+
+import click
+
+from tcboard.ext.squore import SquoreMatchLiveData
+from tcboard.livedata import LiveData
+
+from .squore import FIVE_GAMES, make_packets_json
+
+NAMES = (
+    "Jane Doe",
+    "Mary Major",
+    "Aroha Ngata",
+    "Lena Brunner",
+    "Sofia Rossi",
+    "Mia Schmid",
+    "Hana Sato",
+    "Emma Wilson",
+)
+SCORES = (FIVE_GAMES, ((11, 5), (11, 8), (11, 9)), ((7, 11), (11, 6), (11, 4), (11, 9)))
+
+
+def make_tournament(courts: int, rounds: int) -> list[bytes]:
+    """Return the packets of all matches, as recorded, i.e. court by court."""
+    pairs = itertools.cycle(itertools.combinations(NAMES, 2))
+    scores = itertools.cycle(SCORES)
+    start = datetime(2026, 1, 1, 9, 0, 0)
+    ret = []
+    for rnd in range(rounds):
+        for court in range(1, courts + 1):
+            ret += make_packets_json(
+                f"{rnd + 1}-{court}",
+                court=court,
+                games=next(scores),
+                start=start + timedelta(hours=rnd),
+                players=next(pairs),
+            )
+    return ret
+
+
+def measure(packets: list[bytes], *, shared: bool, trace: bool) -> int:
+    SquoreMatchLiveData.share_values = shared
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if trace:
+        tracemalloc.start()
+    if shared:
+        history = [LiveData.ingest_json(p) for p in packets]
+    else:
+        history = [SquoreMatchLiveData.model_validate_json(p) for p in packets]
+    if trace:
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return size
+
+    del history
+    # ru_maxrss is in kiB on Linux
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss) * 2**10
+
+
+def run(
+    ctx: multiprocessing.context.SpawnContext,
+    packets: list[bytes],
+    *,
+    shared: bool,
+    trace: bool,
+) -> int:
+    with ctx.Pool(1) as pool:
+        return pool.apply(measure, (packets,), {"shared": shared, "trace": trace})
+
+
+@click.command()
+@click.option("--courts", type=click.IntRange(min=1), default=8)
+@click.option("--rounds", type=click.IntRange(min=1), default=6)
+def main(courts: int, rounds: int) -> None:
+    """Keep the livedata of a tournament in memory, with and without sharing"""
+    packets = make_tournament(courts, rounds)
+    click.echo(f"{len(packets)} packets of {courts * rounds} matches")
+    ctx = multiprocessing.get_context("spawn")
+    for shared in (False, True):
+        size, rss = (
+            run(ctx, packets, shared=shared, trace=trace) for trace in (True, False)
+        )
+        click.echo(
+            f"{'shared' if shared else 'not shared':>12s}: "
+            f"{size / 2**20:7.1f} MiB allocated, "
+            f"{size / len(packets) / 2**10:5.1f} kiB/packet, "
+            f"peak RSS +{rss / 2**20:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Measure the latency of the event loop while it ingests Squore packets, and
+dumps a large tournament, with all of that done on the loop, and offloaded to
+a process pool.
+
+Latency is how late a task wakes up, which asks to be woken every millisecond,
+i.e. roughly how long any HTTP client would have to wait.
+
+Run with: python -m benchmarks.bench_offload [--workers N] [--dumps N]
+"""
+
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import click
+from tptools import (
+    Court,
+    Draw,
+    DrawType,
+    Entry,
+    Event,
+    MatchStatus,
+    Player,
+    Stage,
+    Tournament,
+)
+
+from tcboard import TCMatch, TCTournament
+from tcboard.offload import OffloadService
+
+from .squore import make_packets_json
+
+
+def make_tournament(nmatches: int = 512) -> TCTournament:
+    event = Event(id=1, name="Open")
+    stage = Stage(id=1, name="Main", event=event)
+    draws = {
+        i: Draw(id=i, name=f"Draw {i}", type=DrawType.MONRAD, size=32, stage=stage)
+        for i in range(1, 9)
+    }
+    entries = {
+        i: Entry(
+            id=i,
+            event=event,
+            player1=Player(id=i, firstname=f"First {i}", lastname=f"Last {i}"),
+        )
+        for i in range(1, 257)
+    }
+    courts = {i: Court(id=i, name=f"Court {i}") for i in range(1, 9)}
+    start = datetime(2026, 1, 1, 9, 0, 0)
+    matches = {}
+    for n in range(nmatches):
+        matchid = f"{n // 64 + 1}-{n % 64 + 1}"
+        matches[matchid] = TCMatch(
+            id=matchid,
+            matchnr=n % 64 + 1,
+            draw=draws[n // 64 % 8 + 1],
+            time=start + timedelta(minutes=40 * (n // 8)),
+            court=courts[n % 8 + 1],
+            status=MatchStatus.PENDING,
+            starttime=None,
+            endtime=None,
+            A=entries[2 * n % 256 + 1],
+            B=entries[(2 * n + 1) % 256 + 1],
+        )
+    return Tournament[Entry, Draw, Court, TCMatch](
+        name="Championships 2026",
+        entries=entries,
+        draws=draws,
+        courts=courts,
+        matches=matches,
+    )
+
+
+async def probe(latencies: list[float], done: asyncio.Event) -> None:
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        latencies.append(time.perf_counter() - start - 0.001)
+
+
+async def measure(
+    offload: OffloadService,
+    tournament: TCTournament,
+    packets: list[bytes],
+    *,
+    dumps: int,
+) -> tuple[list[float], float]:
+    async def dump() -> None:
+        for _ in range(dumps):
+            # as for the frontend, i.e. with the players' names formatted
+            await offload.dump_json(tournament)
+            await asyncio.sleep(0)
+
+    async def ingest() -> None:
+        for raw in packets:
+            await offload.ingest_livedata(raw)
+            await asyncio.sleep(0)
+
+    latencies: list[float] = []
+    done = asyncio.Event()
+    prober = asyncio.create_task(probe(latencies, done))
+    start = time.perf_counter()
+    await asyncio.gather(dump(), ingest())
+    elapsed = time.perf_counter() - start
+    done.set()
+    await prober
+    return latencies, elapsed
+
+
+def percentiles(latencies: list[float]) -> str:
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return (
+        ", ".join(f"p{p} {quantiles[p - 1] * 1000:6.1f}ms" for p in (50, 90, 99))
+        + f", max {max(latencies) * 1000:6.1f}ms"
+    )
+
+
+async def run(workers: int, dumps: int) -> None:
+    tournament = make_tournament()
+    packets = make_packets_json()
+    click.echo(
+        f"{dumps} dump(s) of a tournament of {len(tournament.matches)} matches, "
+        f"and {len(packets)} packets"
+    )
+    for max_workers in (0, workers):
+        async with OffloadService(max_workers=max_workers) as offload:
+            # warm up the pool
+            await offload.ingest_livedata(packets[0])
+            latencies, elapsed = await measure(
+                offload, tournament, packets, dumps=dumps
+            )
+        name = f"{max_workers} process(es)" if max_workers else "on the loop"
+        click.echo(f"{name:>15s}: {percentiles(latencies)}, took {elapsed:.2f}s")
+
+
+@click.command()
+@click.option("--workers", "-w", type=click.IntRange(min=1), default=2)
+@click.option("--dumps", "-n", type=click.IntRange(min=1), default=5)
+def main(workers: int, dumps: int) -> None:
+    """Measure event loop latency with and without offloading"""
+    asyncio.run(run(workers, dumps))
+
+
+if __name__ == "__main__":
+    main()
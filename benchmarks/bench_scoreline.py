@@ -0,0 +1,51 @@
+"""Compare memory use and dump time of the games of a five-game match, with the
+scorelines as lists of Points, and as compact Scorelines.
+
+Run with: python -m benchmarks.bench_scoreline [--repeat N]
+"""
+
+import time
+import tracemalloc
+from typing import Any
+
+import click
+
+from tcboard.ext.squore import SquoreMatchLiveData
+
+from .squore import make_packets
+
+
+def measure(packet: dict[str, Any], *, repeat: int, compact: bool) -> tuple[int, float]:
+    SquoreMatchLiveData.compact_scorelines = compact
+    livedata = SquoreMatchLiveData.model_validate(packet)
+
+    tracemalloc.start()
+    games = livedata.games
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for game in games:
+            game.model_dump_json()
+    return size, (time.perf_counter() - start) / repeat
+
+
+@click.command()
+@click.option("--repeat", "-n", type=click.IntRange(min=1), default=100)
+def main(repeat: int) -> None:
+    """Parse and dump the games of a finished five-game match"""
+    packet = make_packets()[-1]
+    rallies = sum(len(g) for g in packet["score"])
+    click.echo(f"{rallies} rallies of a five-game match, dumped {repeat} time(s)")
+    for compact in (False, True):
+        size, elapsed = measure(packet, repeat=repeat, compact=compact)
+        click.echo(
+            f"{'Scoreline' if compact else 'list[Point]':>12s}: "
+            f"{size / 1024:7.1f} KiB ({size / rallies:6.1f} B/rally), "
+            f"dump {elapsed * 1e6:8.1f} µs/match"
+        )
+
+
+if __name__ == "__main__":
+    main()
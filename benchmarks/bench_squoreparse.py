@@ -0,0 +1,55 @@
+"""Compare parsing Squore scorelines by token lookup with the regular expression
+parser, and validated Point construction.
+
+Run with: python -m benchmarks.bench_squoreparse [--repeat N]
+"""
+
+import time
+from collections.abc import Callable
+
+import click
+
+from tcboard.ext.squore.point import (
+    Point,
+    _parse_squore_line,
+    make_point_from_squore_line,
+)
+
+from .squore import make_packets
+
+
+def parse_validated(squore: str, *, duration: int | None = None) -> Point:
+    server, side, player, data = _parse_squore_line(squore)
+    return Point(
+        server=server, serveside=side, player=player, data=data, duration=duration
+    )
+
+
+def measure(
+    parse: Callable[..., Point], scoreline: list[list[str]], *, repeat: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for game in scoreline:
+            for token in game:
+                parse(token, duration=25)
+    return (time.perf_counter() - start) / repeat
+
+
+@click.command()
+@click.option("--repeat", "-n", type=click.IntRange(min=1), default=1000)
+def main(repeat: int) -> None:
+    """Parse the full scoreline of a five-game match"""
+    scoreline = make_packets()[-1]["score"]
+    click.echo(
+        f"{sum(len(g) for g in scoreline)} rallies of a five-game match, "
+        f"{repeat} time(s)"
+    )
+    slow = measure(parse_validated, scoreline, repeat=repeat)
+    fast = measure(make_point_from_squore_line, scoreline, repeat=repeat)
+    click.echo(f"{'regex':>8s}: {slow * 1e6:8.1f} µs/scoreline")
+    click.echo(f"{'lookup':>8s}: {fast * 1e6:8.1f} µs/scoreline ({slow / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Generate realistic sequences of Squore packets for benchmarks."""
+
+import json
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from typing import Any
+
+from tcboard.ext.squore import SquoreMatchLiveData
+
+FIVE_GAMES = ((11, 9), (9, 11), (11, 7), (8, 11), (12, 10))
+
+
+def _rallies(a: int, b: int) -> list[int]:
+    # interleave the rally winners so that the game ends a-b with the last rally
+    winner = int(b > a)
+    need = [a - (winner == 0), b - (winner == 1)]
+    got = [0, 0]
+    ret = []
+    while got != need:
+        p = int(
+            got[0] >= need[0]
+            or (got[1] < need[1] and got[1] * need[0] < got[0] * need[1])
+        )
+        got[p] += 1
+        ret.append(p)
+    return ret + [winner]
+
+
+def make_packets(
+    matchid: str = "42-1",
+    *,
+    court: int | None = 1,
+    games: Iterable[tuple[int, int]] = FIVE_GAMES,
+    start: datetime | None = None,
+    players: tuple[str, str] = ("Jane Doe", "Mary Major"),
+) -> list[dict[str, Any]]:
+    """Return one raw packet per rally, as Squore would send them."""
+    start = start or datetime(2026, 1, 1, 10, 0, 0)
+    base: dict[str, Any] = {
+        "court": court,
+        "appName": "Squore",
+        "appPackage": "com.doubleyellow.scoreboard",
+        "clubs": {"A": "Squash Club Aotearoa", "B": "Squash Club Zürich"},
+        "colors": {"A": "#FF0000", "B": "#0000FF"},
+        "countries": {"A": "NZL", "B": "SUI"},
+        "event": {"name": "Championships 2026", "division": "Womens Open"},
+        "format": {"numberOfPointsToWinGame": 11, "numberOfGamesToWinMatch": 3},
+        "isGameBall": False,
+        "isHandOut": False,
+        "isMatchBall": False,
+        "liveScoreDeviceId": f"device-{matchid}",
+        "lockState": "Unlocked",
+        "metadata": {
+            "sourceID": matchid,
+            "device": {"batteryCharging": False, "batteryPercentage": 87},
+            "source": "tcboard",
+            "version": 3,
+            "language": "en",
+            "wifi": {"ipaddress": "192.168.1.23"},
+        },
+        "players": {"A": players[0], "B": players[1]},
+        "server": "A",
+        "serveSide": "R",
+        "start": start.isoformat(),
+        "when": {"date": start.date().isoformat(), "time": "10:00"},
+    }
+
+    packets: list[dict[str, Any]] = []
+    score: list[list[str]] = []
+    timing: list[dict[str, Any]] = []
+    gamescores: list[str] = []
+    result = [0, 0]
+    now = start
+    server, side = 0, "R"
+    for a, b in games:
+        gstart = now
+        tokens: list[str] = []
+        offsets: list[int] = []
+        pts = [0, 0]
+        score.append(tokens)
+        timing.append({"start": gstart.isoformat(), "end": gstart.isoformat()})
+        gamescores.append("0-0")
+        for winner in _rallies(a, b):
+            now += timedelta(seconds=25)
+            pts[winner] += 1
+            if winner == server:
+                token = f"{side}{pts[winner]}--" if winner == 0 else f"--{side}{pts[1]}"
+                side = "L" if side == "R" else "R"
+            else:
+                token = f"-{pts[0]}{side}-" if winner == 0 else f"{side}--{pts[1]}"
+                server, side = winner, "R"
+            tokens.append(token)
+            offsets.append(int((now - gstart).total_seconds()))
+            timing[-1] = {
+                "start": gstart.isoformat(),
+                "end": now.isoformat(),
+                "offsets": list(offsets),
+            }
+            gamescores[-1] = f"{pts[0]}-{pts[1]}"
+            last = pts == [a, b]
+            if last:
+                result[int(b > a)] += 1
+            packets.append(
+                base
+                | {
+                    "server": "AB"[server],
+                    "serveSide": side,
+                    "lastScorer": "AB"[winner],
+                    "isGameBall": max(pts) >= 10 and not last,
+                    "result": f"{result[0]}-{result[1]}",
+                    "gamescores": ",".join(gamescores),
+                    "score": [list(t) for t in score],
+                    "timing": [dict(t) for t in timing],
+                    "isVictoryFor": "AB"[winner] if 3 in result else None,
+                }
+            )
+        now += timedelta(seconds=90)
+
+    return packets
+
+
+def make_packets_json(*args: Any, **kwargs: Any) -> list[bytes]:
+    return [json.dumps(p).encode() for p in make_packets(*args, **kwargs)]
+
+
+def make_livedata(*args: Any, **kwargs: Any) -> list[SquoreMatchLiveData]:
+    return [
+        SquoreMatchLiveData.model_validate(p) for p in make_packets(*args, **kwargs)
+    ]
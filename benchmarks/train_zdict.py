@@ -0,0 +1,82 @@
+"""Build the preset zlib dictionary for Squore livedata records from sample
+records, and compare how well it compresses records of other matches with
+plain zlib, and the other Squore codecs.
+
+The dictionary of a registered codec must never change, as records compressed
+with it cannot be read without it, so write a new file with a new version, and
+register a new codec for it.
+
+Run with: python -m benchmarks.train_zdict [--output FILE] [--samples N]
+"""
+
+import itertools
+import pathlib
+import statistics
+
+import click
+
+from tcboard.dbcodec import Codec, ZlibCodec
+
+from .squore import make_livedata
+
+PLAYERS = [
+    ("Jane Doe", "Mary Major"),
+    ("Aroha Ngata", "Lea Müller"),
+    ("Joe Bloggs", "John Smith"),
+    ("Hemi Walker", "Luca Rossi"),
+]
+
+
+def make_records(first: int, count: int) -> list[bytes]:
+    # records from throughout the matches, i.e. with short and long scores, and
+    # interleaved, so that the last ones are not all of the same match
+    matches = [
+        make_livedata(
+            f"{i}-{i % 64 + 1}", court=i % 8 + 1, players=PLAYERS[i % len(PLAYERS)]
+        )[::10]
+        for i in range(first, first + count)
+    ]
+    return [
+        ld.model_dump_json(round_trip=True).encode()
+        for lds in itertools.zip_longest(*matches)
+        for ld in lds
+        if ld is not None
+    ]
+
+
+def ratio(codec: Codec, records: list[bytes]) -> float:
+    return statistics.mean(len(codec.encode(r)) / len(r) for r in records)
+
+
+@click.command()
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, path_type=pathlib.Path),
+    default=None,
+    help="File to write the dictionary to",
+)
+@click.option("--samples", "-n", type=click.IntRange(min=1), default=16)
+def main(output: pathlib.Path | None, samples: int) -> None:
+    """Build a preset dictionary from sample records, and measure it"""
+    # zlib favours the end of the dictionary, and takes only the last 32 KiB
+    trained = ZlibCodec.from_samples("trained", make_records(0, 4)[-samples:])
+    assert trained.zdict is not None
+    click.echo(f"Dictionary of {len(trained.zdict)} bytes")
+
+    others = make_records(100, 4)
+    for codec in (
+        ZlibCodec(),
+        Codec.get("zlib+squore1"),
+        Codec.get("zlib+squore2"),
+        trained,
+    ):
+        click.echo(f"{codec.name:>15s}: {ratio(codec, others) * 100:5.1f}% of size")
+
+    if output is not None:
+        output.write_bytes(trained.zdict)
+        click.echo(f"Wrote dictionary to {output}")
+
+
+if __name__ == "__main__":
+    main()
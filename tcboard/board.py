@@ -0,0 +1,165 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+import bisect
+import logging
+from collections.abc import Iterable, Iterator
+from typing import Any, NamedTuple
+
+from .livedata import LiveData
+from .matchslot import MatchSlot
+from .matchstate import MatchState
+
+logger = logging.getLogger(__name__)
+
+# The board holds the match states, indexed by match, court, and device, and
+# with the states of each slot kept sorted, so that none of the lookups of the
+# frontend needs to scan or sort all matches. The indexes are updated as the
+# states change, i.e. when livedata are received through the board, or when
+# update() is called after changing a state directly.
+
+type SortKey = tuple[Any, ...]
+
+
+class _Entry(NamedTuple):
+    slot: MatchSlot
+    key: SortKey
+    court: int | None
+    deviceid: str | None
+
+
+def _sort_key(matchstate: MatchState[Any]) -> SortKey:
+    # MatchState compares by its __cmp_fields__, but None does not compare with
+    # anything, so those states sort last, and ties are broken by match ID
+    values = (
+        f(matchstate) if callable(f) else getattr(matchstate, f)
+        for f in matchstate.__cmp_fields__
+    )
+    return (*((v is None, v) for v in values), matchstate.match.id)
+
+
+def _court(matchstate: MatchState[Any]) -> int | None:
+    livedata: LiveData | None = matchstate.livedata
+    if livedata is not None:
+        return livedata.court
+
+    court = matchstate.match.court
+    return None if court is None else court.id
+
+
+class Board[LiveDataT: LiveData]:
+    def __init__(self, matchstates: Iterable[MatchState[LiveDataT]] = ()) -> None:
+        self._matchstates: dict[str, MatchState[LiveDataT]] = {}
+        self._entries: dict[str, _Entry] = {}
+        self._by_court: dict[int | None, dict[str, MatchState[LiveDataT]]] = {}
+        self._current: dict[int | None, MatchState[LiveDataT]] = {}
+        self._by_device: dict[str, MatchState[LiveDataT]] = {}
+        self._sorted: dict[MatchSlot, list[SortKey]] = {slot: [] for slot in MatchSlot}
+        for matchstate in matchstates:
+            self.add(matchstate)
+
+    def add(self, matchstate: MatchState[LiveDataT]) -> None:
+        matchid = matchstate.match.id
+        if matchid in self._matchstates:
+            self.remove(matchid)
+        self._matchstates[matchid] = matchstate
+        self._index(matchstate)
+
+    def remove(self, matchid: str) -> MatchState[LiveDataT]:
+        matchstate = self._matchstates.pop(matchid)
+        self._unindex(matchstate)
+        return matchstate
+
+    def update(self, matchstate: MatchState[LiveDataT]) -> None:
+        entry = self._entries[matchstate.match.id]
+        if entry != self._make_entry(matchstate):
+            self._unindex(matchstate)
+            self._index(matchstate)
+
+    def receive_livedata(self, livedata: LiveDataT) -> MatchState[LiveDataT] | None:
+        # Exceptions from validating the livedata are left to the caller, and
+        # leave the state, and hence the indexes, unchanged
+        if (matchstate := self._matchstates.get(livedata.matchid)) is None:
+            logger.warning(f"Livedata for match not on the board: {livedata}")
+            return None
+
+        matchstate.validate_and_receive_livedata(livedata)
+        self.update(matchstate)
+        return matchstate
+
+    def get(self, matchid: str) -> MatchState[LiveDataT] | None:
+        return self._matchstates.get(matchid)
+
+    def on_court(self, court: int | None) -> list[MatchState[LiveDataT]]:
+        return list(self._by_court.get(court, {}).values())
+
+    def current_on_court(self, court: int | None) -> MatchState[LiveDataT] | None:
+        return self._current.get(court)
+
+    def scored_by(self, deviceid: str) -> MatchState[LiveDataT] | None:
+        return self._by_device.get(deviceid)
+
+    def in_slot(self, slot: MatchSlot) -> list[MatchState[LiveDataT]]:
+        # sorted by MatchState.__cmp_fields__, i.e. by time
+        return [self._matchstates[key[-1]] for key in self._sorted[slot]]
+
+    def dump_json(self, slot: MatchSlot | None = None, **kwargs: Any) -> bytes:
+        # A JSON array of the states, all of them, or those of the slot, which
+        # is pieced together from the JSON cached by each state, so that this
+        # can be returned by the HTTP layer as is
+        matchstates = self if slot is None else self.in_slot(slot)
+        return b"[" + b",".join(ms.cached_json(**kwargs) for ms in matchstates) + b"]"
+
+    @staticmethod
+    def _make_entry(matchstate: MatchState[Any]) -> _Entry:
+        livedata = matchstate.livedata
+        return _Entry(
+            slot=matchstate.slot,
+            key=_sort_key(matchstate),
+            court=_court(matchstate),
+            deviceid=None if livedata is None else livedata.deviceid,
+        )
+
+    def _index(self, matchstate: MatchState[LiveDataT]) -> None:
+        matchid = matchstate.match.id
+        entry = self._entries[matchid] = self._make_entry(matchstate)
+        bisect.insort(self._sorted[entry.slot], entry.key)
+        self._by_court.setdefault(entry.court, {})[matchid] = matchstate
+        if entry.slot == MatchSlot.CURRENT:
+            self._current[entry.court] = matchstate
+        if entry.deviceid is not None:
+            self._by_device[entry.deviceid] = matchstate
+
+    def _unindex(self, matchstate: MatchState[LiveDataT]) -> None:
+        matchid = matchstate.match.id
+        entry = self._entries.pop(matchid)
+        keys = self._sorted[entry.slot]
+        del keys[bisect.bisect_left(keys, entry.key)]
+
+        court = self._by_court[entry.court]
+        del court[matchid]
+        if not court:
+            del self._by_court[entry.court]
+
+        if self._current.get(entry.court) is matchstate:
+            del self._current[entry.court]
+            # should there have been another current match on the court, then
+            # that takes over
+            for other in court.values():
+                if self._entries[other.match.id].slot == MatchSlot.CURRENT:
+                    self._current[entry.court] = other
+
+        if (
+            entry.deviceid is not None
+            and self._by_device.get(entry.deviceid) is matchstate
+        ):
+            del self._by_device[entry.deviceid]
+
+    def __len__(self) -> int:
+        return len(self._matchstates)
+
+    def __iter__(self) -> Iterator[MatchState[LiveDataT]]:
+        return iter(self._matchstates.values())
+
+    def __contains__(self, matchid: object) -> bool:
+        return matchid in self._matchstates
@@ -0,0 +1,27 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+from .livedata import LiveData
+from .matchstate import MatchState
+
+
+class BoardSnapshot[LiveDataT: LiveData](BaseModel):
+    matchstates: list[MatchState[LiveDataT]] = []
+    # ID of the last livedata record reflected in the match states, so that on
+    # restore, only newer records need to be replayed:
+    livedata_id: int = 0
+    timestamp: datetime | None = None
+
+    def model_post_init(self, _: Any) -> None:
+        if self.timestamp is None:
+            self.timestamp = datetime.now()
+
+    def dump_json(self) -> str:
+        # livedata are dumped as their actual class, not as LiveData, so that
+        # ModelABC can restore them from their _modelid
+        return self.model_dump_json(round_trip=True, serialize_as_any=True)
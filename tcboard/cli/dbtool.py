@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import pathlib
+from typing import IO, Literal
+
+import click
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from ..dbexport import COMPRESSIONS, import_ndjson, iter_export
+from ..dbmanager import DBManager
+from .util import get_clictx
+
+logger = logging.getLogger(__name__)
+
+
+async def _export(dbfile: pathlib.Path, output: IO[bytes], compression: str) -> None:
+    async with DBManager(file=dbfile) as db:
+        async for chunk in iter_export(db, COMPRESSIONS[compression]):
+            output.write(chunk)
+
+
+async def _import(
+    dbfile: pathlib.Path, input: IO[bytes], batch_size: int, force: bool
+) -> int:
+    async with DBManager(file=dbfile) as db:
+        await db.init_tables()
+        async with db.query(
+            "select exists(select 1 from tournament) "
+            "or exists(select 1 from squorelivedata) as used"
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row and row["used"] and not force:
+            raise click.ClickException(
+                f"Database {dbfile} is not empty, use --force to import anyway"
+            )
+
+        count = await import_ndjson(db, input, batch_size=batch_size)
+
+    return count
+
+
+def export_endpoint(
+    request: Request, compression: Literal["gzip", "zstd", "none"] = "gzip"
+) -> StreamingResponse:
+    clictx = get_clictx(request)
+    if clictx.db is None:
+        raise HTTPException(status_code=503, detail="No database available")
+
+    suffix = {"gzip": ".gz", "zstd": ".zst"}.get(compression, "")
+    return StreamingResponse(
+        iter_export(clictx.db, COMPRESSIONS[compression]),
+        media_type={"gzip": "application/gzip", "zstd": "application/zstd"}.get(
+            compression, "application/x-ndjson"
+        ),
+        headers={
+            "Content-Disposition": f'attachment; filename="tcboard.ndjson{suffix}"'
+        },
+    )
+
+
+@click.group()
+def tcboard_db() -> None:
+    """Export and import the tcboard event log"""
+
+
+@tcboard_db.command()
+@click.argument("dbfile", type=click.Path(exists=True, path_type=pathlib.Path))
+@click.argument("output", type=click.File("wb"), default="-")
+@click.option(
+    "--compression",
+    "-c",
+    type=click.Choice(list(COMPRESSIONS)),
+    default="gzip",
+    show_default=True,
+    help="Compress the NDJSON output",
+)
+def export(dbfile: pathlib.Path, output: IO[bytes], compression: str) -> None:
+    """Write all records of the database to OUTPUT as NDJSON"""
+    asyncio.run(_export(dbfile, output, compression))
+
+
+@tcboard_db.command(name="import")
+@click.argument("dbfile", type=click.Path(path_type=pathlib.Path))
+@click.argument("input", type=click.File("rb"), default="-")
+@click.option(
+    "--batch-size",
+    "-b",
+    type=click.IntRange(min=1),
+    default=5000,
+    show_default=True,
+    help="Number of records per transaction",
+)
+@click.option("--force", is_flag=True, help="Import into a database with records")
+def import_(
+    dbfile: pathlib.Path, input: IO[bytes], batch_size: int, force: bool
+) -> None:
+    """Load NDJSON records (compressed or not) from INPUT into the database"""
+    count = asyncio.run(_import(dbfile, input, batch_size, force))
+    click.echo(f"Imported {count} record(s) into {dbfile}", err=True)
@@ -20,10 +20,13 @@ from fastapi import FastAPI, Request
 from fastapi.responses import (
     FileResponse,
     PlainTextResponse,
+    StreamingResponse,
 )
 from starlette.types import StatefulLifespan, StatelessLifespan
 from tptools.util import silence_logger
 
+from ..dbmanager import DBManager
+from .dbtool import export_endpoint
 from .util import CliContext, pass_clictx
 
 PLUGINS = []
@@ -71,6 +74,7 @@ def make_app(
     app.get("/", response_class=PlainTextResponse, name="root")(_pong)
     app.get("/favicon.ico", response_class=FileResponse)(_favicon)
     app.get("/robots.txt", response_class=PlainTextResponse)(_robotstxt)
+    app.get("/export", response_class=StreamingResponse)(export_endpoint)
 
     return app
 
@@ -104,12 +108,21 @@ boardlogger = logging.getLogger(__name__ + ".board")
     show_default=True,
     help="Port to listen on",
 )
+@click.option(
+    "--database",
+    "-d",
+    metavar="FILE",
+    type=click.Path(dir_okay=False, path_type=pathlib.Path),
+    default=None,
+    help="Database to keep the event log in, and export it from",
+)
 @click.pass_context
 def tcboard(
     ctx: click.Context,
     very_debug: bool,
     host: str,
     port: int,
+    database: pathlib.Path | None,
 ) -> None:
     """Collect tournament data and distribute to subscribers"""
 
@@ -121,7 +134,7 @@ def tcboard(
             silence_logger(name, level=level)
 
     # the options will be used in the result_callback function down below
-    _ = host, port
+    _ = host, port, database
     itc = ITC()
 
     app = make_app()
@@ -151,6 +164,7 @@ def runit(
     very_debug: bool,
     host: str,
     port: int,
+    database: pathlib.Path | None,
 ) -> Never:
     _ = very_debug
 
@@ -165,6 +179,11 @@ def runit(
     # but handle the lifespan ourselves outside of the server process:
     async def lifespan(plugin_factories: list[PluginFactory]) -> None:
         async with AsyncExitStack() as stack:
+            if database is not None:
+                clictx.db = await stack.enter_async_context(DBManager(file=database))
+                await clictx.db.init_tables()
+                logger.info(f"Using database {database}")
+
             tasks = await setup_plugins(plugin_factories, stack=stack)
 
             try:
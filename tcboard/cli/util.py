@@ -9,10 +9,13 @@ from click_async_plugins import CliContext as _CliContext
 from fastapi import FastAPI
 from fastapi.requests import HTTPConnection
 
+from ..dbmanager import DBManager
+
 
 @dataclass
 class CliContext(_CliContext):
     api: FastAPI = field(default_factory=FastAPI)
+    db: DBManager | None = None
 
     def __post_init__(self) -> None:
         self.api.state.clictx = self
@@ -21,5 +24,5 @@ class CliContext(_CliContext):
 pass_clictx = click.make_pass_decorator(CliContext)
 
 
-def get_clictx(httpcon: HTTPConnection) -> CliContext:  # pragma: nocover
+def get_clictx(httpcon: HTTPConnection) -> CliContext:
     return cast(CliContext, httpcon.app.state.clictx)
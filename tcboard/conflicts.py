@@ -0,0 +1,80 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+import time
+from collections import Counter, deque
+from collections.abc import Hashable
+from enum import StrEnum, auto
+
+# Devices send stray packets, e.g. stale ones on reconnects, which are out of
+# line with the state of their match. Single strays are ignored, but should the
+# same conflict keep coming, it is alerted on, once, and if it still persists,
+# it is accepted, as the device evidently means it.
+#
+# Conflicts are remembered by fingerprint in a small ring, and forgotten once
+# they are older than the window, when the ring overflows, or as soon as
+# livedata in line with the match arrive. A counter alongside the ring keeps
+# the decision O(1), however many strays come in.
+
+
+class Conflict(StrEnum):
+    IGNORE = auto()
+    ALERT = auto()
+    ACCEPT = auto()
+
+
+class ConflictTracker:
+    def __init__(
+        self,
+        *,
+        alert_after: int = 2,
+        accept_after: int = 5,
+        window: float = 30.0,
+        size: int = 8,
+    ) -> None:
+        if not 0 < alert_after <= accept_after <= size:
+            raise ValueError(
+                "Conflict thresholds must satisfy 0 < alert_after <= accept_after "
+                f"<= size: {alert_after}, {accept_after}, {size}"
+            )
+
+        self._alert_after = alert_after
+        self._accept_after = accept_after
+        self._window = window
+        self._size = size
+        self._recent: deque[tuple[float, Hashable]] = deque()
+        self._counts: Counter[Hashable] = Counter()
+
+    def record(self, fingerprint: Hashable, *, now: float | None = None) -> Conflict:
+        now = time.monotonic() if now is None else now
+        recent = self._recent
+        while recent and (
+            len(recent) >= self._size or now - recent[0][0] > self._window
+        ):
+            self._forget_oldest()
+        recent.append((now, fingerprint))
+        self._counts[fingerprint] += 1
+
+        count = self._counts[fingerprint]
+        if count >= self._accept_after:
+            self.clear()
+            return Conflict.ACCEPT
+
+        elif count == self._alert_after:
+            return Conflict.ALERT
+
+        return Conflict.IGNORE
+
+    def _forget_oldest(self) -> None:
+        _, fingerprint = self._recent.popleft()
+        if (count := self._counts[fingerprint] - 1) > 0:
+            self._counts[fingerprint] = count
+        else:
+            del self._counts[fingerprint]
+
+    def clear(self) -> None:
+        self._recent.clear()
+        self._counts.clear()
+
+    def __len__(self) -> int:
+        return len(self._recent)
@@ -0,0 +1,88 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+import importlib
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import ClassVar
+
+# zlib only ever looks back 32 KiB, so a preset dictionary larger than that is wasted
+ZDICT_MAX_SIZE = 32 * 1024
+
+# Codecs that come with tcboard, and the modules that register them, which are
+# imported when one of these is first asked for, so that a database can be read
+# without whatever wrote it having imported the module first, e.g. by tcboard-db:
+_BUILTIN_CODECS: dict[str, str] = {
+    "zlib+squore1": "tcboard.ext.squore.dbcodec",
+    "zlib+squore2": "tcboard.ext.squore.dbcodec",
+}
+
+
+class Codec(ABC):
+    _registry: ClassVar[dict[str, Codec]] = {}
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    @abstractmethod
+    def encode(self, data: bytes) -> bytes: ...
+
+    @abstractmethod
+    def decode(self, data: bytes) -> bytes: ...
+
+    def register(self) -> None:
+        self._registry[self.name] = self
+
+    @classmethod
+    def get(cls, name: str) -> Codec:
+        if name not in cls._registry and (module := _BUILTIN_CODECS.get(name)):
+            importlib.import_module(module)
+
+        try:
+            return cls._registry[name]
+
+        except KeyError as exc:
+            raise ValueError(f"Storage codec not known: {name}") from exc
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(name={self.name!r})"
+
+
+class ZlibCodec(Codec):
+    def __init__(
+        self, name: str = "zlib", *, level: int = 6, zdict: bytes | None = None
+    ) -> None:
+        super().__init__(name)
+        self._level = level
+        self._zdict = zdict[-ZDICT_MAX_SIZE:] if zdict else None
+
+    @classmethod
+    def from_samples(
+        cls, name: str, samples: Iterable[bytes], *, level: int = 6
+    ) -> ZlibCodec:
+        # zlib uses a preset dictionary as if it had just compressed it, so the
+        # best dictionary consists of data like that to be compressed, with the
+        # most common strings towards the end.
+        return cls(name, level=level, zdict=b"".join(samples))
+
+    @property
+    def zdict(self) -> bytes | None:
+        return self._zdict
+
+    def encode(self, data: bytes) -> bytes:
+        if self._zdict is None:
+            return zlib.compress(data, self._level)
+
+        comp = zlib.compressobj(self._level, zdict=self._zdict)
+        return comp.compress(data) + comp.flush()
+
+    def decode(self, data: bytes) -> bytes:
+        if self._zdict is None:
+            return zlib.decompress(data)
+
+        decomp = zlib.decompressobj(zdict=self._zdict)
+        return decomp.decompress(data) + decomp.flush()
+
+
+ZlibCodec().register()
@@ -0,0 +1,133 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+import gzip
+import io
+import itertools
+import json
+import logging
+import zlib
+from collections.abc import AsyncGenerator, AsyncIterable, Iterator
+from typing import IO, Literal, Protocol, cast
+
+from .dbmanager import DBManager
+
+try:
+    import zstandard
+
+except ImportError:  # pragma: no cover — zstandard is installed for tests
+    zstandard = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# The event log is exported as newline-delimited JSON (NDJSON), one record per
+# line, with the record data embedded as a JSON object:
+#
+#   {"timestamp":"2026-01-01 10:00:00.000","type":"tournament","data":{…}}
+
+type Compression = Literal["gzip", "zstd"] | None
+
+COMPRESSIONS: dict[str, Compression] = {"gzip": "gzip", "zstd": "zstd", "none": None}
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:  # pragma: no cover — zstandard is installed for tests
+        raise RuntimeError("zstd compression needs the zstandard package installed")
+
+
+def _make_compressor(compression: Compression) -> _Compressor | None:
+    match compression:
+        case "gzip":
+            # wbits=31 selects the gzip container format
+            return zlib.compressobj(wbits=31)
+
+        case "zstd":
+            _require_zstandard()
+            return zstandard.ZstdCompressor().compressobj()
+
+        case _:
+            return None
+
+
+async def iter_ndjson(db: DBManager) -> AsyncGenerator[bytes]:
+    async for rec in db.get_all_tournament_and_livedata_records():
+        # rec["data"] is JSON already, so it is spliced in rather than re-encoded
+        yield (
+            f'{{"timestamp":{json.dumps(rec["timestamp"])},'
+            f'"type":{json.dumps(rec["type"])},"data":{rec["data"]}}}\n'
+        ).encode()
+
+
+async def iter_compressed(
+    chunks: AsyncIterable[bytes], compression: Compression
+) -> AsyncGenerator[bytes]:
+    compressor = _make_compressor(compression)
+    async for chunk in chunks:
+        if compressor is None:
+            yield chunk
+        elif data := compressor.compress(chunk):
+            yield data
+
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def iter_export(
+    db: DBManager, compression: Compression = "gzip"
+) -> AsyncGenerator[bytes]:
+    return iter_compressed(iter_ndjson(db), compression)
+
+
+def open_ndjson(fp: IO[bytes]) -> IO[bytes]:
+    # Sniff the compression from the magic bytes, so that imports need not be told
+    buffered = (
+        fp
+        if isinstance(fp, io.BufferedReader)
+        else io.BufferedReader(cast(io.RawIOBase, fp))
+    )
+    magic = buffered.peek(4)[:4]
+    if magic.startswith(_GZIP_MAGIC):
+        return cast(IO[bytes], gzip.GzipFile(fileobj=buffered, mode="rb"))
+
+    elif magic == _ZSTD_MAGIC:
+        _require_zstandard()
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(buffered))
+
+    return buffered
+
+
+def _parse_lines(fp: IO[bytes]) -> Iterator[tuple[str, str, str]]:
+    for lineno, line in enumerate(fp, 1):
+        if not line.strip():
+            continue
+
+        try:
+            rec = json.loads(line)
+            yield (
+                rec["type"],
+                rec["timestamp"],
+                json.dumps(rec["data"], ensure_ascii=False, separators=(",", ":")),
+            )
+
+        except (ValueError, KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid record on line {lineno}: {exc}") from exc
+
+
+async def import_ndjson(db: DBManager, fp: IO[bytes], *, batch_size: int = 5000) -> int:
+    count = 0
+    lines = _parse_lines(open_ndjson(fp))
+    while batch := list(itertools.islice(lines, max(1, batch_size))):
+        count += await db.insert_json_records(batch)
+        logger.debug(f"Imported {count} record(s)…")
+
+    logger.info(f"Imported {count} record(s)")
+    return count
@@ -1,16 +1,37 @@
+import asyncio
+import itertools
+import json
 import logging
 import pathlib
 import re
-from collections.abc import AsyncGenerator
-from contextlib import AbstractAsyncContextManager, AsyncExitStack
-from typing import Any, Never, Self
+import sqlite3
+import time
+from collections import ChainMap
+from collections.abc import AsyncGenerator, Callable, Coroutine, Iterable
+from contextlib import (
+    AbstractAsyncContextManager,
+    AsyncExitStack,
+    asynccontextmanager,
+)
+from dataclasses import dataclass, fields
+from datetime import UTC, datetime
+from typing import Any, NamedTuple, Never, Self
 
 from aiosqlite import Connection, Cursor, Row, connect
 from aiosqlite.context import Result
 from pydantic import BaseModel
 from tptools import Tournament
 
+from .board import Board
+from .boardsnapshot import BoardSnapshot
+from .dbcodec import Codec
+from .exceptions import TCBoardException
+from .interning import load_json
+from .jsonpatch import apply_patch, make_patch
 from .livedata import LiveData
+from .livestatus import LiveStatus
+from .matchstate import MatchState
+from .offload import OffloadService
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +42,7 @@ _TABLE_SQL = re.sub(
     create table if not exists {table} (
         id integer primary key,
         timestamp timestamp not null default(strftime('%F %H:%M:%f')),
-        data json not null check (like('{{%}}', data))
+        data json not null check (like('{{%}}', data)){columns}
     );
 """.strip(),
     count=0,
@@ -30,12 +51,285 @@ _TABLE_SQL = re.sub(
 
 TABLENAMES = ["squorelivedata", "tournament", "board"]
 
+# With a storage codec, the record is stored encoded in payload, and data only holds
+# the fields needed for lookups (see _HEADER_FIELDS), so that the generated columns
+# and indexes keep working:
+_COLUMNS: dict[str, str] = {
+    "codec": "text",
+    "payload": "blob",
+    "delta": "integer",
+}
+_HEADER_FIELDS = {"court"}
+
+# With delta encoding, livedata records are stored as a JSON patch against the
+# previous record of the same match, in payload (encoded with the codec, if any). The
+# delta column counts the patches since the last full record (a "keyframe"), which
+# has delta 0. Records stored without delta encoding have delta null.
+_DELTA_CHAIN_SQL = """
+    select id, delta, data, codec, payload from squorelivedata
+     where matchid = :matchid and id < :id
+     order by id desc limit :count
+"""
+
+# Stored generated columns extract the fields we query by from the JSON once, at
+# insert time, so that they can be indexed and need not be re-parsed by queries:
+_GENERATED_COLUMNS: dict[str, dict[str, str]] = {
+    "squorelivedata": {
+        "matchid": "text generated always as (data->>'_matchid') stored",
+        "court": "integer generated always as (data->>'court') stored",
+        "deviceid": "text generated always as (data->>'_deviceid') stored",
+        "status": "text generated always as (data->>'_status') stored",
+    },
+}
+
+# Each index includes the rowid (id), so lookups of the latest record for a key
+# are answered from the index alone:
+_INDEXES: dict[str, dict[str, str]] = {
+    "squorelivedata": {
+        "matchid": "matchid, id",
+        "court": "court, id",
+        "deviceid": "deviceid, id",
+        "status": "status, matchid",
+        "timestamp": "timestamp, id",
+    },
+    "tournament": {
+        "timestamp": "timestamp, id",
+    },
+}
+
+# Walk the distinct match IDs via the index (a "skip scan"), and pick the highest ID
+# for each, so that cost grows with the number of matches, not of records:
+_LATEST_LIVEDATA_SQL = """
+    with recursive matches(matchid) as (
+      select min(matchid) from squorelivedata
+      union all
+      select (
+        select min(matchid) from squorelivedata s
+         where s.matchid > matches.matchid
+      ) from matches where matchid is not null
+    )
+    select l.id, l.timestamp, l.matchid, l.court, l.data, l.codec, l.payload, l.delta
+      from matches m
+      join squorelivedata l on l.id = (
+        select max(id) from squorelivedata s where s.matchid = m.matchid
+      )
+     order by l.timestamp
+"""
+
+# With both tables indexed by (timestamp, id), SQLite merges two index scans rather
+# than sorting all rows, so the full event log streams in constant memory:
+_ALL_RECORDS_SQL = """
+    select id, timestamp, 'tournament' as type, null as matchid,
+           data, codec, payload, delta
+      from tournament
+    union all
+    select id, timestamp, 'squorelivedata' as type, matchid,
+           data, codec, payload, delta
+      from squorelivedata
+     order by timestamp, id
+"""
+
+# SQLite limits the number of host parameters per statement (32766 since 3.32),
+# so large batches are split into several multi-row inserts of this size:
+_MAX_ROWS_PER_INSERT = 500
+
+# Livedata replayed onto a restored board are validated this many at a time:
+_REPLAY_BATCH_SIZE = 1000
+
+
+def _sqlite_timestamp(when: datetime | None = None) -> str:
+    # Same format as the column default: strftime('%F %H:%M:%f'), which is UTC.
+    # Naive datetimes are taken to be UTC already.
+    when = when or datetime.now(UTC)
+    if when.tzinfo is not None:
+        when = when.astimezone(UTC)
+    return when.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def _history_sql(
+    where: str, keys: tuple[str, ...], *, keyset: bool, newest_first: bool
+) -> str:
+    # Keyset pagination: each page continues after the sort key of the last row of
+    # the previous page, so that, unlike with offsets, pages cost the same however
+    # deep into the history they are, and the index provides the order:
+    conds = [where]
+    if keyset:
+        op = "<" if newest_first else ">"
+        conds.append(
+            f"({', '.join(keys)}) {op} ({', '.join(f':after_{k}' for k in keys)})"
+        )
+    order = ", ".join(f"{k} {'desc' if newest_first else 'asc'}" for k in keys)
+    return (
+        f"select * from squorelivedata where {' and '.join(conds)} "
+        f"order by {order} limit :page_size"
+    )
+
+
+class _DeltaRecord(NamedTuple):
+    # A livedata record to be delta-encoded, which is only done when it is
+    # written, see _encode_delta
+    matchid: str
+    doc: Any
+    header: str
+
+
+type _Columns = dict[str, Any] | _DeltaRecord
+
+# maps match IDs to the ID, delta, and document of the last record read
+type _Docs = dict[str, tuple[int, int, Any]]
+
+# maps match IDs to the delta and document of the last record written
+type _DeltaBases = ChainMap[str, tuple[int, Any]]
+
+
+class _QueuedRecord(NamedTuple):
+    table: str
+    columns: _Columns
+    timestamp: str
+    future: asyncio.Future[int]
+
+
+@dataclass
+class WriteQueueStats:
+    flushes: int = 0
+    records: int = 0
+    last_flush_size: int = 0
+    last_flush_latency: float = 0.0
+    max_flush_latency: float = 0.0
+
+    def record_flush(self, size: int, latency: float) -> None:
+        self.flushes += 1
+        self.records += size
+        self.last_flush_size = size
+        self.last_flush_latency = latency
+        self.max_flush_latency = max(self.max_flush_latency, latency)
+
+
+@dataclass(frozen=True)
+class DBProfile:
+    # None means to leave SQLite's default in place
+    journal_mode: str | None = None
+    synchronous: str | None = None
+    mmap_size: int | None = None
+    cache_size: int | None = None
+    temp_store: str | None = None
+    checkpoint_interval: float | None = None
+
+    def pragmas(self) -> dict[str, str | int]:
+        return {
+            f.name: value
+            for f in fields(self)
+            if f.name != "checkpoint_interval"
+            and (value := getattr(self, f.name)) is not None
+        }
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    # Only matches whose latest record is FINISHED, and older than min_age seconds,
+    # are compacted. Their last record is always kept, and optionally the first,
+    # and the first of each run of the same status, e.g. one per game (the first
+    # BETWEENGAMES record has the final score of the game before).
+    keep_first: bool = True
+    keep_status_changes: bool = True
+    min_age: float = 3600.0
+    # Rows deleted per transaction, so that compaction never blocks ingest for long:
+    batch_size: int = 500
+    # Free pages returned to the file system per incremental vacuum step:
+    vacuum_pages: int = 1000
+
+    def select(self, rows: list[Row]) -> set[int]:
+        # returns the IDs of the rows to keep, given (id, status) rows in ID order
+        keep = {rows[-1]["id"]}
+        if self.keep_first:
+            keep.add(rows[0]["id"])
+        if self.keep_status_changes:
+            keep.update(
+                cur["id"]
+                for prev, cur in itertools.pairwise(rows)
+                if cur["status"] != prev["status"]
+            )
+        return keep
+
+
+_COMPACTABLE_MATCHES_SQL = """
+    select l.matchid from squorelivedata l
+     where l.status = :status and l.timestamp < :cutoff
+       and l.id = (select max(id) from squorelivedata s where s.matchid = l.matchid)
+"""
+
+PROFILES: dict[str, DBProfile] = {
+    "default": DBProfile(),
+    # WAL with synchronous=NORMAL only syncs at checkpoints, not on every commit.
+    # A power loss may thus lose the last transactions, but never corrupts the DB.
+    "performance": DBProfile(
+        journal_mode="wal",
+        synchronous="normal",
+        mmap_size=256 * 1024 * 1024,
+        cache_size=-64 * 1024,  # negative: KiB, i.e. 64 MiB
+        temp_store="memory",
+        checkpoint_interval=60.0,
+    ),
+}
+
 
 class DBManager(AbstractAsyncContextManager["DBManager"]):
-    def __init__(self, *, file: pathlib.Path | None) -> None:
+    def __init__(
+        self,
+        *,
+        file: pathlib.Path | None,
+        write_behind: bool = False,
+        batch_size: int = 100,
+        batch_latency: float = 0.005,
+        queue_size: int = 0,
+        profile: str | DBProfile = "default",
+        read_pool_size: int = 0,
+        codec: str | None = None,
+        delta_keyframe_interval: int | None = None,
+        compaction_interval: float | None = None,
+        retention: RetentionPolicy | None = None,
+        offload: OffloadService | None = None,
+    ) -> None:
         self._file = file or ":memory:"
+        if isinstance(profile, str):
+            try:
+                profile = PROFILES[profile]
+
+            except KeyError as exc:
+                raise ValueError(f"Unknown database profile: {profile}") from exc
+
+        self._profile = profile
+        self._settings: dict[str, Any] = {}
+        self._compaction_interval = compaction_interval
+        self._retention = retention or RetentionPolicy()
+        # matches already compacted, which need not be looked at again
+        self._compacted: set[str] = set()
+        # SQLite transactions do not nest, but the writer, bulk inserts, and
+        # compaction share the connection, so only one may be open at a time:
+        self._tx_lock = asyncio.Lock()
+        self._read_pool_size = read_pool_size
+        self._readers: asyncio.Queue[Connection] | None = None
+        self._codec = Codec.get(codec) if codec is not None else None
+        if delta_keyframe_interval is not None and delta_keyframe_interval < 1:
+            raise ValueError(
+                f"Delta keyframe interval must be positive: {delta_keyframe_interval}"
+            )
+        self._keyframe_interval = delta_keyframe_interval
+        # dumping large models, e.g. the tournament, can be offloaded from the loop
+        self._offload = offload or OffloadService(max_workers=0)
+        # maps match IDs to the delta and document of the last record committed
+        self._delta_bases: dict[str, tuple[int, Any]] = {}
+        self._last_livedata_id = 0
         self._connection: None | Connection = None
         self._stack: AsyncExitStack = AsyncExitStack()
+        self._write_behind = write_behind
+        self._batch_size = max(1, batch_size)
+        self._batch_latency = batch_latency
+        self._write_queue: asyncio.Queue[_QueuedRecord | None] = asyncio.Queue(
+            maxsize=queue_size
+        )
+        self._writer: asyncio.Task[None] | None = None
+        self._write_stats = WriteQueueStats()
 
     @staticmethod
     def _sqlite_dict_factory(cursor: Cursor, row: Row) -> dict[str, Any]:
@@ -51,8 +345,141 @@ class DBManager(AbstractAsyncContextManager["DBManager"]):
         self._connection = await self._stack.enter_async_context(_conn_awaitable)
         self._connection.row_factory = self._sqlite_dict_factory  # type: ignore[assignment]
         logger.info(f"Connected to SQLite database {self._file}")
+
+        await self._apply_profile()
+
+        if self._read_pool_size > 0:
+            await self._open_readers()
+
+        if self._compaction_interval is not None:
+            self._start_task(
+                self._run_compaction(self._compaction_interval),
+                name=f"Compaction of {self._file}",
+            )
+
+        if self._write_behind:
+            self._writer = asyncio.create_task(
+                self._run_writer(), name=f"DB writer for {self._file}"
+            )
+            self._stack.push_async_callback(self._stop_writer)
+            logger.info(
+                f"Write-behind enabled for {self._file} "
+                f"(batch size {self._batch_size}, latency {self._batch_latency}s)"
+            )
+
         return self
 
+    async def _apply_profile(self) -> None:
+        pragmas = self._profile.pragmas()
+        for pragma, value in pragmas.items():
+            # some pragmas return a row, and the statement stays active until the
+            # cursor is closed, so always close it:
+            async with self.execute(f"pragma {pragma} = {value}"):
+                pass
+
+        self._settings = {}
+        for pragma in pragmas or ("journal_mode", "synchronous"):
+            async with self.execute(f"pragma {pragma}") as cursor:
+                if (row := await cursor.fetchone()) is not None:
+                    self._settings[pragma] = row[pragma]
+
+        logger.info(
+            f"SQLite settings for {self._file}: "
+            + ", ".join(f"{k}={v}" for k, v in self._settings.items())
+        )
+
+        if (interval := self._profile.checkpoint_interval) is not None:
+            self._start_task(
+                self._run_checkpoints(interval),
+                name=f"WAL checkpoints for {self._file}",
+            )
+
+    def _start_task(self, coro: Coroutine[Any, Any, None], *, name: str) -> None:
+        task = asyncio.create_task(coro, name=name)
+        self._stack.push_async_callback(self._cancel_task, task)
+
+    @staticmethod
+    async def _cancel_task(task: asyncio.Task[None]) -> None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _open_readers(self) -> None:
+        if self._file == ":memory:":
+            logger.warning(
+                "In-memory databases cannot be shared, not using a read pool"
+            )
+            return
+
+        if self._settings.get("journal_mode") != "wal":
+            logger.warning(
+                f"Database {self._file} is not in WAL mode, "
+                "so readers and the writer will block each other"
+            )
+
+        self._readers = asyncio.Queue()
+        uri = f"{pathlib.Path(self._file).absolute().as_uri()}?mode=ro"
+        for _ in range(self._read_pool_size):
+            # See __aenter__ for the reason for the daemon hack
+            _conn_awaitable = connect(uri, uri=True, isolation_level=None)
+            _conn_awaitable.daemon = True  # type: ignore[attr-defined]
+            conn = await self._stack.enter_async_context(_conn_awaitable)
+            conn.row_factory = self._sqlite_dict_factory  # type: ignore[assignment]
+            for pragma in ("mmap_size", "cache_size", "temp_store"):
+                if (value := getattr(self._profile, pragma)) is not None:
+                    async with conn.execute(f"pragma {pragma} = {value}"):
+                        pass
+            self._readers.put_nowait(conn)
+
+        logger.info(
+            f"Opened {self._read_pool_size} read-only connection(s) to {self._file}"
+        )
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncGenerator[Connection]:
+        if self._connection is None:
+            raise RuntimeError(f"Database is not connected: {self._file}")
+
+        if self._readers is None:
+            yield self._connection
+            return
+
+        conn = await self._readers.get()
+        try:
+            yield conn
+
+        finally:
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def query(
+        self, sql: str, params: dict[str, Any] | None = None
+    ) -> AsyncGenerator[Cursor]:
+        # Run a read-only query, on a connection from the read pool if there is one
+        async with self._reader() as conn, conn.execute(sql, params) as cursor:
+            yield cursor
+
+    async def _run_checkpoints(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with self.execute("pragma wal_checkpoint(passive)") as cursor:
+                    row = await cursor.fetchone()
+
+            except sqlite3.OperationalError as exc:
+                # e.g. while a statement is active on the write connection, in
+                # which case we'll just try again next time:
+                logger.debug(f"WAL checkpoint of {self._file} skipped: {exc}")
+
+            else:
+                logger.debug(f"WAL checkpoint of {self._file}: {row}")
+
+    @property
+    def settings(self) -> dict[str, Any]:
+        return self._settings
+
     async def __aexit__(self, *_: Any) -> bool:
         logger.debug(f"Disconnecting from SQLite database {self._file}…")
         await self._stack.aclose()
@@ -68,28 +495,392 @@ class DBManager(AbstractAsyncContextManager["DBManager"]):
 
         return self._connection.execute(sql, params)
 
+    @staticmethod
+    def _table_columns(table: str) -> dict[str, str]:
+        return _COLUMNS | _GENERATED_COLUMNS.get(table, {})
+
+    @classmethod
+    def _table_sql(cls, table: str, *, name: str | None = None) -> str:
+        columns = "".join(
+            f", {col} {spec}" for col, spec in cls._table_columns(table).items()
+        )
+        return _TABLE_SQL.format(table=name or table, columns=columns)
+
+    async def _get_columns(self, table: str) -> dict[str, bool]:
+        # maps column names to whether they are generated (hidden > 1)
+        cursor = await self.execute(f"pragma table_xinfo({table})")
+        return {row["name"]: row["hidden"] > 1 for row in await cursor.fetchall()}
+
+    async def _migrate_table(self, table: str) -> None:
+        # SQLite cannot add stored generated columns to an existing table, so the
+        # table is rebuilt with the current schema, keeping all plain columns that
+        # exist in both:
+        oldcols = await self._get_columns(table)
+        tmpname = f"{table}_migration"
+        await self.execute("begin")
+        try:
+            await self.execute(self._table_sql(table, name=tmpname))
+            newcols = await self._get_columns(tmpname)
+            cols = ", ".join(
+                c for c, gen in newcols.items() if not gen and c in oldcols
+            )
+            await self.execute(
+                f"insert into {tmpname} ({cols}) select {cols} from {table}"
+            )
+            await self.execute(f"drop table {table}")
+            await self.execute(f"alter table {tmpname} rename to {table}")
+            await self.execute("commit")
+
+        except Exception:  # pragma: no cover — don't know how to test for this
+            await self.execute("rollback")
+            raise
+
+        logger.info(f"Migrated table '{table}' to current schema")
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncGenerator[None]:
+        async with self._tx_lock:
+            await self.execute("begin")
+            try:
+                yield
+
+            except BaseException:
+                if self._connection is not None and self._connection.in_transaction:
+                    await self.execute("rollback")
+                raise
+
+            await self.execute("commit")
+
     async def init_tables(self, *, drop_tables: bool = False) -> None:
+        # Only takes effect for new databases (or after a vacuum), but allows the
+        # space freed by compaction to be returned in small steps:
+        await self.execute("pragma auto_vacuum = incremental")
         for table in TABLENAMES:
             if drop_tables:
                 logger.debug(f"Dropping existing table '{table}'")
                 await self.execute(f"drop table if exists {table}")
-            await self.execute(_TABLE_SQL.format(table=table))
+            await self.execute(self._table_sql(table))
+
+            columns = await self._get_columns(table)
+            if any(col not in columns for col in self._table_columns(table)):
+                await self._migrate_table(table)
+
+            for name, spec in _INDEXES.get(table, {}).items():
+                await self.execute(
+                    f"create index if not exists {table}_{name}_idx on {table} ({spec})"
+                )
+
             logger.debug(
                 f"Initialised table '{table}' (or made sure it already exists)"
             )
 
-    async def insert_json_record(self, table: str, model: BaseModel) -> int | Never:
-        json = model.model_dump_json(round_trip=True)
+    @property
+    def write_queue_depth(self) -> int:
+        return self._write_queue.qsize()
+
+    @property
+    def write_stats(self) -> WriteQueueStats:
+        return self._write_stats
+
+    async def _stop_writer(self) -> None:
+        if self._writer is None:  # pragma: no cover — only pushed if started
+            return
+
+        logger.debug(f"Flushing {self.write_queue_depth} queued record(s)…")
+        await self._write_queue.put(None)
+        await self._writer
+        self._writer = None
+
+    async def _next_batch(self) -> tuple[list[_QueuedRecord], bool]:
+        loop = asyncio.get_running_loop()
+        first = await self._write_queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = loop.time() + self._batch_latency
+        while len(batch) < self._batch_size:
+            try:
+                rec = self._write_queue.get_nowait()
+
+            except asyncio.QueueEmpty:
+                if (timeout := deadline - loop.time()) <= 0:
+                    break
+                try:
+                    rec = await asyncio.wait_for(self._write_queue.get(), timeout)
+                except TimeoutError:
+                    break
+
+            if rec is None:
+                return batch, True
+
+            batch.append(rec)
+
+        return batch, False
+
+    async def _run_writer(self) -> None:
+        done = False
+        while not done:
+            batch, done = await self._next_batch()
+            if batch:
+                await self._flush(batch)
+
+    async def _insert_many(
+        self, table: str, rows: list[tuple[str, dict[str, Any]]]
+    ) -> list[int]:
+        # rows are pairs of timestamp and columns (as returned by _encode_record)
+        values = ", ".join(
+            f"(:ts{i}, :data{i}, :codec{i}, :payload{i}, :delta{i})"
+            for i in range(len(rows))
+        )
+        params: dict[str, Any] = {}
+        for i, (timestamp, columns) in enumerate(rows):
+            params[f"ts{i}"] = timestamp
+            params |= {f"{col}{i}": value for col, value in columns.items()}
+
         cursor = await self.execute(
-            f"insert into {table} (data) values (:json) returning id", {"json": json}
+            f"insert into {table} (timestamp, data, codec, payload, delta) "
+            f"values {values} returning id",
+            params,
         )
-        ret = await cursor.fetchone()
+        # RETURNING yields rows in arbitrary order, but within this transaction we
+        # are the only writer, so IDs increase in insertion order:
+        return sorted(int(row["id"]) for row in await cursor.fetchall())
+
+    async def _flush(self, batch: list[_QueuedRecord]) -> None:
+        started = time.perf_counter()
+        results: list[tuple[asyncio.Future[int], int]] = []
+        bases = self._pending_delta_bases()
+        try:
+            async with self._transaction():
+                for table, group in itertools.groupby(
+                    sorted(batch, key=lambda r: r.table), key=lambda r: r.table
+                ):
+                    records = list(group)
+                    for i in range(0, len(records), _MAX_ROWS_PER_INSERT):
+                        chunk = records[i : i + _MAX_ROWS_PER_INSERT]
+                        ids = await self._insert_many(
+                            table,
+                            [
+                                (r.timestamp, self._encode_columns(r.columns, bases))
+                                for r in chunk
+                            ],
+                        )
+                        results.extend(zip((r.future for r in chunk), ids, strict=True))
+
+        except Exception as exc:
+            logger.exception(f"Failed to write batch of {len(batch)} record(s)")
+            # Records still queued are encoded when they are written, but the
+            # failure may have left the database in any state, so to be safe, new
+            # records start over with a keyframe:
+            self._delta_bases.clear()
+            for rec in batch:
+                if not rec.future.done():
+                    rec.future.set_exception(exc)
+            return
+
+        self._commit_delta_bases(bases)
+        latency = time.perf_counter() - started
+        self._write_stats.record_flush(len(batch), latency)
+        logger.debug(
+            f"Wrote batch of {len(batch)} record(s) in {latency * 1000:.1f}ms, "
+            f"{self.write_queue_depth} record(s) still queued"
+        )
+        for future, rowid in results:
+            if not future.done():
+                future.set_result(rowid)
+
+    @staticmethod
+    def _dump_json(doc: Any) -> str:
+        return json.dumps(doc, ensure_ascii=False, separators=(",", ":"))
+
+    def _encode_record(
+        self, model: BaseModel, *, dump: str | None = None
+    ) -> dict[str, Any]:
+        dump = dump or model.model_dump_json(round_trip=True)
+        if self._codec is None:
+            return {"data": dump, "codec": None, "payload": None, "delta": None}
+
+        header = model.model_dump_json(round_trip=True, include=_HEADER_FIELDS)
+        return {
+            "data": header,
+            "codec": self._codec.name,
+            "payload": self._codec.encode(dump.encode()),
+            "delta": None,
+        }
+
+    def _encode_livedata(self, livedata: LiveData) -> _Columns:
+        if self._keyframe_interval is None:
+            return self._encode_record(livedata)
+
+        # The delta is only encoded when the record is written, against the last
+        # record committed, so that records queued behind one whose write fails
+        # are not based on it
+        return _DeltaRecord(
+            matchid=livedata.matchid,
+            doc=livedata.model_dump(mode="json", round_trip=True),
+            header=livedata.model_dump_json(round_trip=True, include=_HEADER_FIELDS),
+        )
+
+    def _pending_delta_bases(self) -> _DeltaBases:
+        # Bases of the records of a transaction, which only become the bases of
+        # later records with _commit_delta_bases, once it has been committed
+        return ChainMap({}, self._delta_bases)
+
+    def _commit_delta_bases(self, bases: _DeltaBases) -> None:
+        self._delta_bases.update(bases.maps[0])
+
+    def _encode_columns(self, columns: _Columns, bases: _DeltaBases) -> dict[str, Any]:
+        if isinstance(columns, _DeltaRecord):
+            return self._encode_delta(columns, bases)
+
+        return columns
+
+    def _encode_delta(self, rec: _DeltaRecord, bases: _DeltaBases) -> dict[str, Any]:
+        assert self._keyframe_interval is not None
+        codec = self._codec
+        base = bases.get(rec.matchid)
+        if base is None or base[0] + 1 >= self._keyframe_interval:
+            bases[rec.matchid] = (0, rec.doc)
+            dump = self._dump_json(rec.doc)
+            if codec is None:
+                return {"data": dump, "codec": None, "payload": None, "delta": 0}
+
+            return {
+                "data": rec.header,
+                "codec": codec.name,
+                "payload": codec.encode(dump.encode()),
+                "delta": 0,
+            }
+
+        delta, basedoc = base
+        bases[rec.matchid] = (delta + 1, rec.doc)
+        patch = self._dump_json(make_patch(basedoc, rec.doc)).encode()
+        return {
+            "data": rec.header,
+            "codec": codec and codec.name,
+            "payload": codec.encode(patch) if codec else patch,
+            "delta": delta + 1,
+        }
+
+    @staticmethod
+    def _decode_payload(rec: Row) -> bytes:
+        if (codec := rec["codec"]) is None:
+            return bytes(rec["payload"])
+
+        return Codec.get(codec).decode(rec["payload"])
+
+    @classmethod
+    def _decode_record(cls, rec: Row) -> str:
+        # Delta records cannot be decoded on their own, see _resolve_record
+        if rec["payload"] is None:
+            return str(rec["data"])
+
+        return cls._decode_payload(rec).decode()
+
+    async def _resolve_record(self, conn: Connection, rec: Row) -> Any:
+        # Rebuild the document of a delta record from the preceding keyframe, and
+        # all the patches since
+        delta = rec["delta"]
+        params = {"matchid": rec["matchid"], "id": rec["id"], "count": delta}
+        async with conn.execute(_DELTA_CHAIN_SQL, params) as cursor:
+            chain = list(await cursor.fetchall())[::-1]
+
+        if [r["delta"] for r in chain] != list(range(delta)):
+            raise RuntimeError(
+                f"Broken delta chain for livedata record {rec['id']} "
+                f"of match {rec['matchid']}"
+            )
+
+        doc = json.loads(self._decode_record(chain[0]))
+        for r in [*chain[1:], rec]:
+            apply_patch(doc, json.loads(self._decode_payload(r)), inplace=True)
+        return doc
+
+    async def _livedata_json(self, conn: Connection, rec: Row) -> str:
+        if not rec["delta"]:
+            return self._decode_record(rec)
+
+        return self._dump_json(await self._resolve_record(conn, rec))
+
+    async def _livedata_json_in_sequence(
+        self, conn: Connection, rec: Row, docs: _Docs
+    ) -> str:
+        # When reading all records of each match in order of their IDs, docs holds
+        # the ID, delta, and document of the last record of each match, which is
+        # then the base of the next, so that successive delta records need not
+        # each be rebuilt from their keyframe. Callers reading records in another
+        # order, or only some of each match, must use _livedata_json instead.
+        if (delta := rec["delta"]) is None:
+            return self._decode_record(rec)
+
+        matchid = rec["matchid"]
+        if delta == 0:
+            doc = json.loads(self._decode_record(rec))
+        elif (
+            (prev := docs.get(matchid)) and prev[0] < rec["id"] and prev[1] == delta - 1
+        ):
+            patch = json.loads(self._decode_payload(rec))
+            doc = apply_patch(prev[2], patch, inplace=True)
+        else:
+            doc = await self._resolve_record(conn, rec)
+        docs[matchid] = (rec["id"], delta, doc)
+        return self._dump_json(doc)
+
+    async def insert_json_record(self, table: str, model: BaseModel) -> int | Never:
+        dump = await self._offload.dump_json(model, round_trip=True)
+        return await self._insert_record(table, self._encode_record(model, dump=dump))
+
+    async def _insert_record(self, table: str, columns: _Columns) -> int | Never:
+        if self._writer is not None:
+            future: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+            await self._write_queue.put(
+                _QueuedRecord(table, columns, _sqlite_timestamp(), future)
+            )
+            return await future
+
+        # not inside another coroutine's transaction, which might be rolled back:
+        async with self._tx_lock:
+            bases = self._pending_delta_bases()
+            try:
+                cursor = await self.execute(
+                    f"insert into {table} (data, codec, payload, delta) "
+                    "values (:data, :codec, :payload, :delta) returning id",
+                    self._encode_columns(columns, bases),
+                )
+
+            except sqlite3.Error:
+                # the base of the next delta may be lost, so start over with keyframes
+                self._delta_bases.clear()
+                raise
+
+            ret = await cursor.fetchone()
+            self._commit_delta_bases(bases)
         if ret is None:  # pragma no cover — don't know how to test for this
             raise RuntimeError(
-                f"Insert record into table '{table}' returned no ID: {model}"
+                f"Insert record into table '{table}' returned no ID: {columns}"
             )
         return int(ret["id"])
 
+    async def insert_json_records(self, records: Iterable[tuple[str, str, str]]) -> int:
+        # Bulk-insert (table, timestamp, JSON) triples in a single transaction, e.g.
+        # from an export. The JSON is stored as is, without codec or delta encoding.
+        count = 0
+        async with self._transaction():
+            for table, group in itertools.groupby(records, key=lambda r: r[0]):
+                if table not in TABLENAMES:
+                    raise ValueError(f"Unknown table: {table}")
+
+                rows = [
+                    (ts, {"data": data, "codec": None, "payload": None, "delta": None})
+                    for _, ts, data in group
+                ]
+                for i in range(0, len(rows), _MAX_ROWS_PER_INSERT):
+                    await self._insert_many(table, rows[i : i + _MAX_ROWS_PER_INSERT])
+                count += len(rows)
+
+        return count
+
     async def record_tournament(self, tournament: Tournament) -> int | None:
         try:
             ret = await self.insert_json_record("tournament", tournament)
@@ -104,8 +895,13 @@ class DBManager(AbstractAsyncContextManager["DBManager"]):
             return None
 
     async def record_livedata(self, livedata: LiveData) -> int | None:
+        # Unlike the tournament, livedata are dumped on the loop, and not by the
+        # offload service, as pickling them for the pool takes longer than that
         try:
-            ret = await self.insert_json_record("squorelivedata", livedata)
+            ret = await self._insert_record(
+                "squorelivedata", self._encode_livedata(livedata)
+            )
+            self._last_livedata_id = max(self._last_livedata_id, ret)
             logger.debug(f"Recording live data in DB with ID {ret}: {livedata}")
             return ret
 
@@ -119,7 +915,7 @@ class DBManager(AbstractAsyncContextManager["DBManager"]):
         return None
 
     async def get_latest_tournament_json(self) -> str | None:
-        async with self.execute(
+        async with self.query(
             "select * from tournament order by id desc limit 1"
         ) as cursor:
             ret = await cursor.fetchone()
@@ -130,38 +926,405 @@ class DBManager(AbstractAsyncContextManager["DBManager"]):
                 "Read from database latest tournament with ID "
                 f"{ret['id']} (timestamp: {ret['timestamp']})"
             )
-            return str(ret["data"])
+            return self._decode_record(ret)
+
+    async def get_livedata_json(self, rowid: int) -> str | None:
+        async with (
+            self._reader() as conn,
+            conn.execute(
+                "select * from squorelivedata where id = :id", {"id": rowid}
+            ) as cursor,
+        ):
+            if (rec := await cursor.fetchone()) is None:
+                return None
+
+            return await self._livedata_json(conn, rec)
 
     async def get_latest_livedata_json_for_each_match(
         self,
     ) -> AsyncGenerator[str]:
-        async with self.execute("""
-            select m.matchid, data->>"court" as court, l.* from squorelivedata l
-              join json_each(l.data, "$._matchid") j
-              join (
-                select data->>"_matchid" as matchid,
-                       max(id) as highest_id
-                  from squorelivedata group by matchid
-              ) as m
-              on (m.matchid = j.value and m.highest_id = l.id)
-              order by l.timestamp;
-        """) as cursor:
-            async for rec in cursor:
+        # All are read and decoded in one go, so that the connection is returned
+        # to the pool before the caller, who may well query again, gets them:
+        ldjsons: list[str] = []
+        async with self._reader() as conn:
+            async with conn.execute(_LATEST_LIVEDATA_SQL) as cursor:
+                recs = await cursor.fetchall()
+
+            for rec in recs:
+                try:
+                    ldjsons.append(await self._livedata_json(conn, rec))
+
+                except (RuntimeError, ValueError):
+                    # e.g. a broken delta chain, which must not keep the other
+                    # matches from being read
+                    logger.exception(
+                        f"Failed to read latest livedata for match {rec['matchid']}"
+                    )
+                    continue
+
                 logger.info(
                     "Read from database latest livedata for match "
                     f"{rec['matchid']} on {rec['court']} "
                     f"(timestamp: {rec['timestamp']})"
                 )
-                yield rec["data"]
+
+        for ldjson in ldjsons:
+            yield ldjson
 
     async def get_all_tournament_and_livedata_records(
         self,
     ) -> AsyncGenerator[dict[str, Any]]:
-        async with self.execute(  # TODO:
-            "select timestamp, 'tournament' as type, data from tournament "
-            "union "
-            "select timestamp, 'squorelivedata' as type, data from squorelivedata "
-            "order by timestamp"
-        ) as cursor:
+        # This streams the records from the cursor, and so holds a connection of
+        # the read pool until exhausted or closed, so do not query the database
+        # while iterating over it, unless there are other connections in the pool
+        docs: _Docs = {}
+        async with (
+            self._reader() as conn,
+            conn.execute(_ALL_RECORDS_SQL) as cursor,
+        ):
+            # Records are ordered by timestamp, which follows their IDs, unless
+            # timestamps have been changed by hand:
+            async for rec in cursor:
+                yield {
+                    "timestamp": rec["timestamp"],
+                    "type": rec["type"],
+                    "data": await self._livedata_json_in_sequence(conn, rec, docs),
+                }
+
+    async def get_livedata_json_since(self, rowid: int) -> AsyncGenerator[str]:
+        # Streams from the cursor, and holds a reader, like the above
+        docs: _Docs = {}
+        async with (
+            self._reader() as conn,
+            conn.execute(
+                "select * from squorelivedata where id > :id order by id",
+                {"id": rowid},
+            ) as cursor,
+        ):
             async for rec in cursor:
-                yield dict(rec)
+                yield await self._livedata_json_in_sequence(conn, rec, docs)
+
+    async def record_board_snapshot(
+        self, matchstates: Iterable[MatchState[Any]], *, keep: int = 3
+    ) -> int:
+        # Taken before the match states are dumped: records written since may or
+        # may not be reflected in them, and will be replayed on restore.
+        snapshot = BoardSnapshot[Any](
+            matchstates=list(matchstates), livedata_id=self._last_livedata_id
+        )
+        ret = await self._insert_record(
+            "board", self._encode_record(snapshot, dump=snapshot.dump_json())
+        )
+        # Only the latest snapshot is ever restored, keep a few just in case:
+        async with self._transaction():
+            await self.execute(
+                "delete from board where id <= :id", {"id": ret - max(1, keep)}
+            )
+        logger.debug(
+            f"Recorded board snapshot in DB with ID {ret}: "
+            f"{len(snapshot.matchstates)} match(es), "
+            f"up to livedata ID {snapshot.livedata_id}"
+        )
+        return ret
+
+    async def snapshot_board_periodically(
+        self,
+        get_matchstates: Callable[[], Iterable[MatchState[Any]]],
+        *,
+        interval: float,
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.record_board_snapshot(get_matchstates())
+
+            except sqlite3.Error:
+                logger.exception(f"Failed to record board snapshot in {self._file}")
+
+    async def get_latest_board_snapshot_json(self) -> str | None:
+        async with self.query("select * from board order by id desc limit 1") as cursor:
+            ret = await cursor.fetchone()
+            if ret is None:
+                return None
+
+            logger.info(
+                "Read from database latest board snapshot with ID "
+                f"{ret['id']} (timestamp: {ret['timestamp']})"
+            )
+            return self._decode_record(ret)
+
+    @staticmethod
+    def _replay_livedata(board: Board[LiveData], batch: list[str]) -> int:
+        # one pydantic-core call validates the whole batch
+        for livedata in LiveData.make_model_instances_ndjson(batch):
+            try:
+                board.receive_livedata(livedata)
+
+            except TCBoardException as exc:
+                # the live system will have refused this livedata just the same
+                logger.debug(f"Not replaying livedata {livedata}: {exc}")
+
+        return len(batch)
+
+    async def restore_board_snapshot(self) -> Board[LiveData] | None:
+        dump = await self.get_latest_board_snapshot_json()
+        if dump is None:
+            return None
+
+        # The match states are put on a board straight away, and newer livedata
+        # replayed through it, such that its indexes follow, and the board can
+        # be used as is:
+        snapshot = BoardSnapshot[LiveData].model_validate(load_json(dump))
+        board = Board[LiveData](snapshot.matchstates)
+        count = 0
+        batch: list[str] = []
+        async for ldjson in self.get_livedata_json_since(snapshot.livedata_id):
+            batch.append(ldjson)
+            if len(batch) >= _REPLAY_BATCH_SIZE:
+                count += self._replay_livedata(board, batch)
+                batch = []
+        count += self._replay_livedata(board, batch)
+
+        async with self.query("select max(id) as id from squorelivedata") as cursor:
+            row = await cursor.fetchone()
+            assert row is not None  # aggregate queries always return a row
+            livedata_id = row["id"] or snapshot.livedata_id
+        self._last_livedata_id = max(self._last_livedata_id, livedata_id)
+
+        logger.info(
+            f"Restored board of {len(board)} match(es), "
+            f"replaying {count} newer livedata record(s)"
+        )
+        return board
+
+    async def _get_livedata_history(
+        self,
+        where: str,
+        params: dict[str, Any],
+        *,
+        keys: tuple[str, ...] = ("id",),
+        after: tuple[Any, ...] | None,
+        newest_first: bool,
+        page_size: int,
+        contiguous: bool = False,
+    ) -> AsyncGenerator[dict[str, Any]]:
+        # Only if the query yields all records of each match, oldest first, can
+        # delta records be decoded incrementally, else each is rebuilt from its
+        # keyframe, see _livedata_json_in_sequence
+        contiguous = contiguous and not newest_first
+        docs: _Docs = {}
+        params = params | {"page_size": max(1, page_size)}
+        while True:
+            sql = _history_sql(
+                where, keys, keyset=after is not None, newest_first=newest_first
+            )
+            if after is not None:
+                params |= {f"after_{k}": v for k, v in zip(keys, after, strict=True)}
+
+            # Each page is read and decoded in one go, so that the connection is
+            # not held while the caller consumes the records:
+            async with self._reader() as conn:
+                async with conn.execute(sql, params) as cursor:
+                    recs = await cursor.fetchall()
+
+                page = [
+                    {
+                        "id": rec["id"],
+                        "timestamp": rec["timestamp"],
+                        "data": (
+                            await self._livedata_json_in_sequence(conn, rec, docs)
+                            if contiguous
+                            else await self._livedata_json(conn, rec)
+                        ),
+                    }
+                    for rec in recs
+                ]
+
+            for rec in page:
+                yield rec
+
+            if len(page) < params["page_size"]:
+                return
+
+            after = tuple(page[-1][k] for k in keys)
+
+    def get_livedata_for_match(
+        self,
+        matchid: str,
+        *,
+        after: int | None = None,
+        newest_first: bool = False,
+        page_size: int = 100,
+    ) -> AsyncGenerator[dict[str, Any]]:
+        return self._get_livedata_history(
+            "matchid = :matchid",
+            {"matchid": matchid},
+            after=None if after is None else (after,),
+            newest_first=newest_first,
+            page_size=page_size,
+            contiguous=True,
+        )
+
+    def get_livedata_for_device(
+        self,
+        deviceid: str,
+        *,
+        after: int | None = None,
+        newest_first: bool = False,
+        page_size: int = 100,
+    ) -> AsyncGenerator[dict[str, Any]]:
+        return self._get_livedata_history(
+            "deviceid = :deviceid",
+            {"deviceid": deviceid},
+            after=None if after is None else (after,),
+            newest_first=newest_first,
+            page_size=page_size,
+        )
+
+    def get_livedata_for_court(
+        self,
+        court: int,
+        *,
+        after: int | None = None,
+        newest_first: bool = False,
+        page_size: int = 100,
+    ) -> AsyncGenerator[dict[str, Any]]:
+        return self._get_livedata_history(
+            "court = :court",
+            {"court": court},
+            after=None if after is None else (after,),
+            newest_first=newest_first,
+            page_size=page_size,
+        )
+
+    def get_livedata_between(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        after: tuple[str, int] | None = None,
+        newest_first: bool = False,
+        page_size: int = 100,
+    ) -> AsyncGenerator[dict[str, Any]]:
+        # Records are ordered by (timestamp, id), and that is also the key to pass
+        # as after to resume from a given record
+        return self._get_livedata_history(
+            "timestamp >= :start and timestamp < :end",
+            {"start": _sqlite_timestamp(start), "end": _sqlite_timestamp(end)},
+            keys=("timestamp", "id"),
+            after=after,
+            newest_first=newest_first,
+            page_size=page_size,
+        )
+
+    async def _run_compaction(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.compact()
+
+            except sqlite3.Error:
+                logger.exception(f"Compaction of {self._file} failed")
+
+    async def _compactable_matches(self, policy: RetentionPolicy) -> list[str]:
+        cutoff = _sqlite_timestamp(
+            datetime.fromtimestamp(time.time() - policy.min_age, UTC)
+        )
+        params = {"status": str(LiveStatus.FINISHED), "cutoff": cutoff}
+        async with self.query(_COMPACTABLE_MATCHES_SQL, params) as cursor:
+            return [
+                row["matchid"]
+                for row in await cursor.fetchall()
+                if row["matchid"] not in self._compacted
+            ]
+
+    async def _compact_match(self, matchid: str, policy: RetentionPolicy) -> int:
+        async with self.query(
+            "select * from squorelivedata where matchid = :matchid order by id",
+            {"matchid": matchid},
+        ) as cursor:
+            rows = list(await cursor.fetchall())
+        keep = policy.select(rows)
+
+        # Kept delta records lose the records they are based on, so they are
+        # rewritten as keyframes first:
+        rekey: list[dict[str, Any]] = []
+        docs: _Docs = {}
+        async with self._reader() as conn:
+            for row in rows:
+                if row["delta"] is None:
+                    continue
+                dump = await self._livedata_json_in_sequence(conn, row, docs)
+                if row["id"] in keep and row["delta"] > 0:
+                    codec = row["codec"] and Codec.get(row["codec"])
+                    rekey.append(
+                        {
+                            "id": row["id"],
+                            "data": dump if codec is None else row["data"],
+                            "payload": codec and codec.encode(dump.encode()),
+                        }
+                    )
+
+        if rekey:
+            async with self._transaction():
+                for params in rekey:
+                    await self.execute(
+                        "update squorelivedata set data = :data, payload = :payload, "
+                        "delta = 0 where id = :id",
+                        params,
+                    )
+        # the next delta for this match would be based on a rewritten record:
+        self._delta_bases.pop(matchid, None)
+
+        # Deleting from the newest, the delta chains of the records still left
+        # remain intact, in case they are read before compaction completes:
+        drop = sorted((r["id"] for r in rows if r["id"] not in keep), reverse=True)
+        for i in range(0, len(drop), max(1, policy.batch_size)):
+            chunk = drop[i : i + max(1, policy.batch_size)]
+            async with self._transaction():
+                await self.execute(
+                    "delete from squorelivedata "
+                    f"where id in ({', '.join(str(i) for i in chunk)})"
+                )
+            await asyncio.sleep(0)  # let ingest in between batches
+
+        self._compacted.add(matchid)
+        logger.debug(
+            f"Compacted match {matchid}: kept {len(keep)} of {len(rows)} record(s)"
+        )
+        return len(drop)
+
+    async def _incremental_vacuum(self, pages: int) -> None:
+        async with self.execute("pragma auto_vacuum") as cursor:
+            row = await cursor.fetchone()
+        if row is None or row["auto_vacuum"] != 2:  # 2 means incremental
+            logger.info(
+                f"Database {self._file} predates incremental auto-vacuum, so space "
+                "freed by compaction is reused, but not returned until a VACUUM"
+            )
+            return
+
+        while True:
+            async with self.execute("pragma freelist_count") as cursor:
+                row = await cursor.fetchone()
+            if row is None or row["freelist_count"] == 0:
+                return
+
+            async with self.execute(f"pragma incremental_vacuum({pages})") as cursor:
+                # The pragma frees one page per step of the statement, each of which
+                # yields a row without columns, which the dict factory cannot handle
+                cursor.row_factory = None
+                await cursor.fetchall()
+            await asyncio.sleep(0)
+
+    async def compact(self, policy: RetentionPolicy | None = None) -> int:
+        policy = policy or self._retention
+        deleted = 0
+        for matchid in await self._compactable_matches(policy):
+            deleted += await self._compact_match(matchid, policy)
+
+        if deleted:
+            await self._incremental_vacuum(max(1, policy.vacuum_pages))
+            logger.info(f"Compaction removed {deleted} livedata record(s)")
+
+        return deleted
@@ -0,0 +1,65 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+
+from .livedata import LiveData
+
+logger = logging.getLogger(__name__)
+
+# Devices resend identical packets on reconnects, on retries, and on timer ticks
+# where nothing changed. These are recognised from the raw bytes, so that they
+# are dropped before validation, and never make it to the board or database.
+#
+# Packets are told apart per match and device, using the values of these keys,
+# wherever they are in the packet:
+_KEY_PATTERN = re.compile(
+    rb'"(?:_?matchid|_?deviceid|sourceID|liveScoreDeviceId)"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+# and timestamps record arrival, not content, so they are left out of the
+# fingerprints:
+_TIMESTAMP_PATTERN = re.compile(rb'"timestamp"\s*:\s*("(?:[^"\\]|\\.)*"|null)')
+
+
+class DuplicateFilter:
+    def __init__(self, *, max_keys: int = 1024) -> None:
+        self._max_keys = max_keys
+        self._fingerprints: OrderedDict[bytes, bytes] = OrderedDict()
+        self.suppressed = 0
+
+    @staticmethod
+    def _key(raw: bytes) -> bytes:
+        return b"\0".join(_KEY_PATTERN.findall(raw))
+
+    @staticmethod
+    def _fingerprint(raw: bytes) -> bytes:
+        return hashlib.blake2b(
+            _TIMESTAMP_PATTERN.sub(b"", raw), digest_size=16
+        ).digest()
+
+    def is_duplicate(self, raw: bytes | str) -> bool:
+        data = raw.encode() if isinstance(raw, str) else raw
+        key, fingerprint = self._key(data), self._fingerprint(data)
+
+        if self._fingerprints.get(key) == fingerprint:
+            self.suppressed += 1
+            logger.debug(
+                f"Suppressed duplicate packet ({self.suppressed} so far): "
+                f"{key.decode(errors='replace')}"
+            )
+            return True
+
+        self._fingerprints[key] = fingerprint
+        self._fingerprints.move_to_end(key)
+        if len(self._fingerprints) > self._max_keys:
+            self._fingerprints.popitem(last=False)
+        return False
+
+    def ingest_json(self, raw: bytes | str) -> LiveData | None:
+        if self.is_duplicate(raw):
+            return None
+
+        return LiveData.ingest_json(raw)
@@ -1,7 +1,9 @@
+from .dbcodec import SQUORE_CODEC
 from .devinfo import SquoreDeviceInfo
 from .livedata import SquoreMatchLiveData
 
 __all__ = [
+    "SQUORE_CODEC",
     "SquoreDeviceInfo",
     "SquoreMatchLiveData",
 ]
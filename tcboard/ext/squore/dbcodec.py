@@ -0,0 +1,46 @@
+import importlib.resources
+
+from ...dbcodec import ZlibCodec
+
+# Records compressed with a preset dictionary can only be decompressed with the
+# very same dictionary, so these must never change. Add a new codec with a new
+# version suffix instead, and to tcboard.dbcodec._BUILTIN_CODECS.
+#
+# The first was written by hand, after a typical Squore livedata record, and is
+# only kept to read records stored with it:
+_ZDICT_V1 = b"".join(
+    (
+        b'"court":3,"timestamp":"2026-01-01T10:00:00.000000","appName":"Squore",',
+        b'"appPackage":"com.doubleyellow.scoreboard","clubs":{"A":"","B":""},',
+        b'"colors":{"A":"#FF0000","B":"#0000FF"},"countries":{"A":"","B":""},',
+        b'"event":{"name":"","division":""},"format":{"numberOfPointsToWinGame":11,',
+        b'"numberOfGamesToWinMatch":3,"useHandInHandOutScoring":false},',
+        b'"gamescores":"11-9,4-6","isGameBall":false,"isHandOut":true,',
+        b'"isMatchBall":false,"isVictoryFor":null,"isUndo":false,"lastScorer":null,',
+        b'"liveScoreDeviceId":"","lockState":"Unlocked","maxNrOfPowerPlays":null,',
+        b'"metadata":{"sourceID":"","device":{"deviceid":null,"timestamp":"2026-',
+        b'"batteryCharging":true,"batteryPercentage":50,',
+        b'"_modelid":"tcboard.ext.squore.devinfo.SquoreDeviceInfo"},"source":"",',
+        b'"version":1,"language":null,"wifi":{"ipaddress":"10.0.0.1"},',
+        b'"shareURL":null,"sourceFeedbackState":null,"sourcePostResultUrl":null},',
+        b'"players":{"A":"","B":""},"result":"1-0","score":[["R1--","--L1","-2R-",',
+        b'"L2--","R--1","-1L-"]],"server":"A","serveSide":"R","start":"2026-',
+        b'"timerInfo":null,"timing":[{"start":"2026-01-01T10:00:00","end":"2026-',
+        b'"offsets":[10,25,40]}],"when":{"date":"2026-01-01","time":"10:00"},',
+        b'"_modelid":"tcboard.ext.squore.livedata.SquoreMatchLiveData",',
+        b'"_matchid":"","_deviceid":"","_status":"ONGOING"}',
+    )
+)
+
+SQUORE_CODEC_V1 = ZlibCodec("zlib+squore1", zdict=_ZDICT_V1)
+SQUORE_CODEC_V1.register()
+
+# The second was built by ZlibCodec.from_samples() from sample records, see
+# benchmarks/train_zdict.py:
+SQUORE_CODEC = ZlibCodec(
+    "zlib+squore2",
+    zdict=(
+        importlib.resources.files("tcboard.ext.squore") / "assets" / "zdict-squore2.bin"
+    ).read_bytes(),
+)
+SQUORE_CODEC.register()
@@ -1,17 +1,33 @@
 import itertools
+from collections.abc import Mapping, Sequence
 from datetime import datetime
-from typing import Literal, Never
-
-from pydantic import BaseModel, Field, computed_field, field_validator
+from typing import Any, ClassVar, Literal, NamedTuple, Never
+
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    computed_field,
+    field_validator,
+    model_validator,
+)
 from tptools.util import ScoresType
 
 from ...alert import Alert
 from ...exceptions import TCBoardException
 from ...game import Game
-from ...livedata import LiveData
+from ...interning import SharedModels
+from ...livedata import LiveData, memoized
 from ...livestatus import LiveStatus
+from ...scoreline import Scoreline
 from .devinfo import SquoreDeviceInfo
-from .point import PlayerLetter, Point, ServerSide, make_point_from_squore_line
+from .point import (
+    PlayerLetter,
+    Point,
+    ServerSide,
+    get_point_fields_from_squore_line,
+    make_point_from_squore_line,
+)
 
 type ServerType = PlayerLetter
 type LockStateType = (
@@ -94,6 +110,27 @@ class TimerInfo(BaseModel, extra="forbid"):
     totalSeconds: int
 
 
+# Sub-models which rarely change during a match, and which are rarely read, are
+# shared between packets, rather than validated afresh for each. Not metadata
+# though, as its device info is stamped with the time of receipt.
+SHARED_SUBMODELS = SharedModels()
+_SHARED_FIELDS: dict[str, type[BaseModel]] = {
+    "clubs": Clubs,
+    "colors": Colors,
+    "countries": Countries,
+    "event": Event,
+    "format": Format,
+    "players": Players,
+    "when": When,
+}
+
+
+class _ParsedGame(NamedTuple):
+    tokens: list[str]
+    offsets: list[int] | None
+    game: Game
+
+
 class SquoreMatchLiveData(LiveData, extra="forbid"):
     appName: Literal["Squore"]
     appPackage: Literal["com.doubleyellow.scoreboard"]
@@ -123,12 +160,28 @@ class SquoreMatchLiveData(LiveData, extra="forbid"):
     timing: list[Timing] = Field(default_factory=list[Timing])
     when: When
 
+    __ingest_marker__ = b'"com.doubleyellow.scoreboard"'
+
+    # Parse the rallies of games into compact Scorelines, rather than lists of
+    # Points, which takes a fraction of the memory, and dumps faster:
+    compact_scorelines: ClassVar[bool] = False
+
+    # Share unchanged sub-models between packets, rather than keeping a copy
+    # for each:
+    share_values: ClassVar[bool] = True
+
+    # Every packet carries the entire match history, so the games parsed for the
+    # previous packet are kept, and only the rallies since are parsed:
+    _parsed: list[_ParsedGame] = PrivateAttr(default_factory=list)
+    _previous: list[_ParsedGame] = PrivateAttr(default_factory=list)
+
     @property
     def matchid(self) -> str:
         return self.metadata.sourceID
 
     @computed_field  # type: ignore[prop-decorator]
     @property
+    @memoized
     def status(self) -> LiveStatus:
         if self.timerInfo:
             if self.timerInfo.type == "Warmup":
@@ -162,6 +215,18 @@ class SquoreMatchLiveData(LiveData, extra="forbid"):
 
         return super().can_come_after(other)
 
+    def share_submodels(self) -> None:
+        if self.share_values:
+            SHARED_SUBMODELS.share_instances(self, _SHARED_FIELDS)
+
+    def continue_from(self, previous: LiveData) -> None:
+        if self.isUndo or not isinstance(previous, SquoreMatchLiveData):
+            return
+
+        # If the previous livedata were never asked for their games, take what
+        # they would have taken over, which is still (most likely) a prefix
+        self._previous = previous._parsed or previous._previous
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def deviceid(self) -> str:
@@ -182,6 +247,7 @@ class SquoreMatchLiveData(LiveData, extra="forbid"):
 
     @computed_field  # type: ignore[prop-decorator]
     @property
+    @memoized
     def endtime(self) -> datetime | None:
         if self.status == LiveStatus.FINISHED:
             return datetime.fromisoformat(self.timing[-1].end)
@@ -192,6 +258,7 @@ class SquoreMatchLiveData(LiveData, extra="forbid"):
 
     @computed_field  # type: ignore[prop-decorator]
     @property
+    @memoized
     def scores(self) -> ScoresType:
         if self.gamescores is None:
             return []
@@ -202,24 +269,59 @@ class SquoreMatchLiveData(LiveData, extra="forbid"):
         return ret
 
     def _get_scoreline(
-        self, scores: list[str], offsets: list[int] | None
-    ) -> list[Point]:
-        ret: list[Point] = []
+        self,
+        scores: list[str],
+        offsets: list[int] | None,
+        previous: _ParsedGame | None = None,
+    ) -> Sequence[Point]:
+        ret: list[Point] | Scoreline = Scoreline() if self.compact_scorelines else []
 
         prev_offset = 0
+        if (
+            previous is not None
+            and scores[: (n := len(previous.tokens))] == previous.tokens
+            and (offsets or [])[:n] == (previous.offsets or [])
+        ):
+            ret.extend(previous.game.scoreline)
+            scores, offsets = scores[n:], (offsets or [])[n:]
+            prev_offset = previous.offsets[-1] if previous.offsets else 0
+
         for point, offset in itertools.zip_longest(scores, offsets or []):
-            ret.append(
-                make_point_from_squore_line(point, duration=offset - prev_offset)
-            )
+            duration = offset - prev_offset
+            if isinstance(ret, Scoreline):
+                ret.add(*get_point_fields_from_squore_line(point), duration)
+            else:
+                ret.append(make_point_from_squore_line(point, duration=duration))
             prev_offset = offset
 
         return ret
 
+    def _get_game(
+        self,
+        points: list[str],
+        offsets: list[int] | None,
+        previous: _ParsedGame | None,
+        **kwargs: Any,
+    ) -> Game:
+        if (
+            previous is not None
+            and previous.tokens == points
+            and previous.offsets == offsets
+            and all(getattr(previous.game, k) == v for k, v in kwargs.items())
+        ):
+            return previous.game
+
+        scoreline = self._get_scoreline(points, offsets, previous)
+        return Game(scoreline=scoreline, **kwargs)
+
     @computed_field  # type: ignore[prop-decorator]
     @property
+    @memoized
     def games(self) -> list[Game]:
         nr_games_played = self.nr_games_played()
         ret = []
+        # reparsing after a field was assigned can build on the last parse, too
+        previous, self._parsed = self._previous or self._parsed, []
 
         is_cur = False
         for i, ((a, b), points, timings) in enumerate(
@@ -230,18 +332,18 @@ class SquoreMatchLiveData(LiveData, extra="forbid"):
                 strict=True,
             )
         ):
-            scoreline = self._get_scoreline(points, timings.offsets)
-
             is_cur = i == nr_games_played
-            ret.append(
-                Game(
-                    score=(a, b),
-                    starttime=datetime.fromisoformat(timings.start),
-                    endtime=None if is_cur else datetime.fromisoformat(timings.end),
-                    winner=None if is_cur else int(a < b),
-                    scoreline=scoreline,
-                )
+            game = self._get_game(
+                points,
+                timings.offsets,
+                previous[i] if i < len(previous) else None,
+                score=(a, b),
+                starttime=datetime.fromisoformat(timings.start),
+                endtime=None if is_cur else datetime.fromisoformat(timings.end),
+                winner=None if is_cur else int(a < b),
             )
+            self._parsed.append(_ParsedGame(points, timings.offsets, game))
+            ret.append(game)
 
         if (
             not is_cur
@@ -253,6 +355,8 @@ class SquoreMatchLiveData(LiveData, extra="forbid"):
             and self.score == []
         ):
             ret.append(Game(score=(0, 0)))
+
+        self._previous = []
         return ret
 
     @computed_field  # type: ignore[prop-decorator]
@@ -280,6 +384,14 @@ class SquoreMatchLiveData(LiveData, extra="forbid"):
         else:
             return super().debug_repr()
 
+    @model_validator(mode="before")
+    @classmethod
+    def _share_unchanged_submodels(cls, data: Any) -> Any:
+        if cls.share_values and isinstance(data, Mapping):
+            return SHARED_SUBMODELS.share_fields(data, _SHARED_FIELDS)
+
+        return data
+
     @field_validator("court", mode="before")
     @classmethod
     def handle_no_court_as_string(
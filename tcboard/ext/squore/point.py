@@ -1,3 +1,4 @@
+import itertools
 import re
 
 from pydantic import TypeAdapter, ValidationError
@@ -6,6 +7,8 @@ from ...point import AppealType, PlayerIndex, PlayerLetter, Point, ServerSide
 
 __all__ = ["AppealType", "PlayerIndex", "PlayerLetter", "Point", "ServerSide"]
 
+_setattr = object.__setattr__
+
 PATTERN = re.compile(
     r"(?P<AX>(?P<AS>[-RL])(?P<AP>\d+|-)|ST|[YN]L)"
     r"(?P<BX>(?P<BS>[-RL])(?P<BP>\d+|-)|ST|[YN]L)",
@@ -18,7 +21,12 @@ PlayerLetterValidator: TypeAdapter[PlayerLetter] = TypeAdapter(PlayerLetter)
 ServerSideValidator: TypeAdapter[ServerSide] = TypeAdapter(ServerSide)
 
 
-def make_point_from_squore_line(squore: str, *, duration: int | None = None) -> Point:
+type _PointFields = tuple[
+    PlayerIndex | None, ServerSide | None, PlayerIndex, PointDataType
+]
+
+
+def _parse_squore_line(squore: str) -> _PointFields:
     m = re.fullmatch(PATTERN, squore)
 
     if m is None:
@@ -56,10 +64,75 @@ def make_point_from_squore_line(squore: str, *, duration: int | None = None) ->
             except ValidationError as err:
                 raise ValueError(f"Not a Squore line I can parse: {squore}") from err
 
-    return Point(
-        server=server,
-        serveside=side,
-        data=data,
-        player=1 if winner else 0,
-        duration=duration,
+    return server, side, 1 if winner else 0, data
+
+
+def _make_token_table(max_points: int) -> dict[str, _PointFields]:
+    # The Squore grammar is tiny: one player scored, and one player served, from
+    # the left or the right. Enumerating all tokens up to max_points means that
+    # scorelines can be parsed by lookup, without regular expressions or
+    # validation, which is what _parse_squore_line does for all other tokens.
+    ret: dict[str, _PointFields] = {}
+    sides: tuple[ServerSide, ...] = ("L", "R")
+    for side, points in itertools.product(sides, range(max_points + 1)):
+        ret[f"{side}{points}--"] = (0, side, 0, points)
+        ret[f"-{points}{side}-"] = (1, side, 0, points)
+        ret[f"{side}--{points}"] = (0, side, 1, points)
+        ret[f"--{side}{points}"] = (1, side, 1, points)
+
+    appeals: tuple[tuple[str, AppealType], ...] = (
+        ("ST", "S"),
+        ("YL", "L"),
+        ("NL", "N"),
     )
+    for token, appeal in appeals:
+        ret[f"{token}--"] = (None, None, 0, appeal)
+        ret[f"--{token}"] = (None, None, 1, appeal)
+
+    return ret
+
+
+_TOKENS = _make_token_table(99)
+
+
+_FIELDS_SET = frozenset(Point.model_fields)
+
+
+def _construct_point(
+    server: PlayerIndex | None,
+    serveside: ServerSide | None,
+    player: PlayerIndex,
+    data: PointDataType,
+    duration: int | None,
+) -> Point:
+    # This does what Point.model_construct() does, minus the generality that makes
+    # model_construct() slower than actually validating the fields.
+    ret = Point.__new__(Point)
+    _setattr(
+        ret,
+        "__dict__",
+        {
+            "server": server,
+            "serveside": serveside,
+            "player": player,
+            "data": data,
+            "duration": duration,
+        },
+    )
+    _setattr(ret, "__pydantic_fields_set__", set(_FIELDS_SET))
+    _setattr(ret, "__pydantic_extra__", None)
+    _setattr(ret, "__pydantic_private__", None)
+    return ret
+
+
+def get_point_fields_from_squore_line(squore: str) -> _PointFields:
+    try:
+        return _TOKENS[squore]
+
+    except KeyError:
+        return _parse_squore_line(squore)
+
+
+def make_point_from_squore_line(squore: str, *, duration: int | None = None) -> Point:
+    # the grammar guarantees validity, so there is no need to validate again
+    return _construct_point(*get_point_fields_from_squore_line(squore), duration)
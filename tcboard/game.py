@@ -1,9 +1,18 @@
+from collections.abc import Sequence
 from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel, field_serializer
+from pydantic import (
+    BaseModel,
+    SerializerFunctionWrapHandler,
+    ValidatorFunctionWrapHandler,
+    field_serializer,
+    field_validator,
+)
 from tptools.util import ScoreType
 
 from .point import Point
+from .scoreline import Scoreline
 
 # type Result = tuple[int, int]
 type Result = list[int]
@@ -17,7 +26,9 @@ class Game(BaseModel):
     # Winner seems a redundant field, but it is not. A game could be live, i.e. ongoing,
     # and then None means there is no winner. We could of course compute this too, but
     # then we'd need to know the match format here. Let's keep it simple for now.
-    scoreline: list[Point] = []
+    # A Scoreline may be used in place of a list of Points to save memory; it
+    # serializes the same, and thus has the same schema.
+    scoreline: Sequence[Point] = []
 
     @field_serializer("score", mode="plain")
     def _score_as_list(self, value: ScoreType) -> Result:
@@ -31,3 +42,23 @@ class Game(BaseModel):
         #
         # and thus loses the typing.
         return list(value)
+
+    @field_validator("scoreline", mode="wrap")
+    @classmethod
+    def _keep_compact_scoreline(
+        cls, value: Any, handler: ValidatorFunctionWrapHandler
+    ) -> Sequence[Point]:
+        if isinstance(value, Scoreline):
+            return value
+
+        ret: Sequence[Point] = handler(value)
+        return ret
+
+    @field_serializer("scoreline", mode="wrap")
+    def _dump_compact_scoreline(
+        self, value: Sequence[Point], handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        if isinstance(value, Scoreline):
+            return value.dump()
+
+        return handler(value)
@@ -0,0 +1,168 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple, Self, cast
+
+from .board import Board
+from .dedup import DuplicateFilter
+from .exceptions import TCBoardException
+from .livedata import LiveData
+from .offload import OffloadService
+
+logger = logging.getLogger(__name__)
+
+# Livedata are ingested in shards, one per court, so that a slow validation, or
+# database write, for one court does not hold up the packets for other courts.
+# Each shard has a queue, and a worker, which handles the packets in order of
+# arrival, and as a match stays on its court, its MatchState receives livedata
+# in order. Packets without a court are sharded by device instead. Repeated
+# packets are dropped before they are even queued.
+#
+# The shard is told from the raw bytes, before validation:
+_COURT_PATTERN = re.compile(rb'"court"\s*:\s*(-?\d+)')
+_DEVICE_PATTERN = re.compile(
+    rb'"(?:_?deviceid|liveScoreDeviceId)"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+
+type ShardKey = int | str | None
+type LiveDataSink = Callable[[LiveData], Awaitable[Any]]
+
+
+def get_shard_key(raw: bytes) -> ShardKey:
+    if match := _COURT_PATTERN.search(raw):
+        return int(match[1])
+
+    elif match := _DEVICE_PATTERN.search(raw):
+        return match[1].decode(errors="replace")
+
+    return None
+
+
+class ShardLag(NamedTuple):
+    # packets received, but not yet handled, including the one being handled
+    queued: int
+    # how long the oldest of those has been waiting, in seconds
+    delay: float
+    handled: int
+
+
+class _Shard:
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self.arrivals: deque[float] = deque()
+        self.handled = 0
+        self.worker: asyncio.Task[None] | None = None
+
+    def lag(self, now: float) -> ShardLag:
+        return ShardLag(
+            queued=len(self.arrivals),
+            delay=now - self.arrivals[0] if self.arrivals else 0.0,
+            handled=self.handled,
+        )
+
+
+class ShardedIngest[LiveDataT: LiveData]:
+    def __init__(
+        self,
+        board: Board[LiveDataT],
+        *,
+        sink: LiveDataSink | None = None,
+        offload: OffloadService | None = None,
+        dedup: DuplicateFilter | None = None,
+    ) -> None:
+        # Validation is CPU-bound, and can be offloaded to a process pool, while
+        # the board, and the sink (e.g. recording the livedata in the database)
+        # are left to the event loop.
+        self._board = board
+        self._sink = sink
+        self._offload = offload or OffloadService(max_workers=0)
+        self._dedup = dedup or DuplicateFilter()
+        self._shards: dict[ShardKey, _Shard] = {}
+        self._running = False
+
+    async def __aenter__(self) -> Self:
+        self._running = True
+        return self
+
+    async def __aexit__(self, *_: Any) -> bool:
+        # finish with what has been received, and then stop the workers
+        self._running = False
+        await self.join()
+        for shard in self._shards.values():
+            assert shard.worker is not None
+            shard.worker.cancel()
+        await asyncio.gather(
+            *(shard.worker for shard in self._shards.values() if shard.worker),
+            return_exceptions=True,
+        )
+        self._shards.clear()
+        return False
+
+    def submit(self, raw: bytes | str) -> ShardKey:
+        if not self._running:
+            raise RuntimeError("Ingest is not running")
+
+        data = raw.encode() if isinstance(raw, str) else raw
+        key = get_shard_key(data)
+        if self._dedup.is_duplicate(data):
+            return key
+
+        if (shard := self._shards.get(key)) is None:
+            shard = self._shards[key] = _Shard()
+            shard.worker = asyncio.create_task(
+                self._work(shard), name=f"ingest shard {key}"
+            )
+            logger.debug(f"Started ingest shard for {key}")
+
+        shard.arrivals.append(time.monotonic())
+        shard.queue.put_nowait(data)
+        return key
+
+    def lag(self) -> dict[ShardKey, ShardLag]:
+        now = time.monotonic()
+        return {key: shard.lag(now) for key, shard in self._shards.items()}
+
+    async def join(self) -> None:
+        for shard in list(self._shards.values()):
+            await shard.queue.join()
+
+    async def _work(self, shard: _Shard) -> None:
+        while True:
+            raw = await shard.queue.get()
+            try:
+                await self._handle(raw)
+
+            except Exception:
+                # nothing must stop the shard
+                logger.exception(f"Failed to ingest livedata: {raw[:64]!r}…")
+
+            finally:
+                shard.arrivals.popleft()
+                shard.handled += 1
+                shard.queue.task_done()
+
+    async def _handle(self, raw: bytes) -> None:
+        try:
+            livedata = cast(LiveDataT, await self._offload.ingest_livedata(raw))
+
+        except ValueError as exc:
+            # includes pydantic's ValidationError
+            logger.warning(f"Dropping invalid livedata: {exc}")
+            return
+
+        try:
+            self._board.receive_livedata(livedata)
+
+        except TCBoardException as exc:
+            logger.warning(f"Board refused livedata {livedata}: {exc}")
+
+        # livedata are recorded even if refused, just like the board would have
+        # refused them on replay
+        if self._sink is not None:
+            await self._sink(livedata)
@@ -0,0 +1,101 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json
+
+# Livedata packets repeat most of their content from one packet to the next, and
+# much of it across matches, e.g. the event, and the match format. Sub-models
+# validated from the same input are shared, rather than validated afresh, and
+# the strings decoded from JSON are interned, so that there is only one of each.
+
+
+def load_json(raw: bytes | str) -> Any:
+    # pydantic-core's string cache interns the (short) strings of JSON documents,
+    # but model_validate_json() only uses it if the models have no validators in
+    # Python, and LiveData does. So decode first, then validate, which is faster.
+    return from_json(raw, cache_strings=True)
+
+
+class SharedModels:
+    def __init__(self, *, max_size: int = 4096) -> None:
+        self._max_size = max_size
+        self._models: OrderedDict[tuple[type[BaseModel], str], BaseModel] = (
+            OrderedDict()
+        )
+        self.hits = self.misses = 0
+
+    def get[M: BaseModel](self, model: type[M], data: dict[str, Any]) -> M | None:
+        # repr() is a cheap key for JSON-like data, which also tells apart values
+        # that compare equal, but may validate differently, e.g. True and 1
+        key = (model, repr(data))
+        try:
+            ret = self._models[key]
+
+        except KeyError:
+            try:
+                ret = self._models[key] = model.model_validate(data)
+
+            except ValidationError:
+                # leave it to the caller's validation to report
+                return None
+
+            self.misses += 1
+            if len(self._models) > self._max_size:
+                self._models.popitem(last=False)
+
+        else:
+            self.hits += 1
+            self._models.move_to_end(key)
+
+        return ret  # type: ignore[return-value]
+
+    def share[M: BaseModel](self, instance: M) -> M:
+        # For instances not validated here, e.g. unpickled from another process,
+        # which are looked up by their values instead of their input
+        key = (type(instance), repr(instance.__dict__))
+        try:
+            ret = self._models[key]
+
+        except KeyError:
+            ret = self._models[key] = instance
+            self.misses += 1
+            if len(self._models) > self._max_size:
+                self._models.popitem(last=False)
+
+        else:
+            self.hits += 1
+            self._models.move_to_end(key)
+
+        return ret  # type: ignore[return-value]
+
+    def share_instances(self, instance: BaseModel, fields: Iterable[str]) -> None:
+        # Replace the sub-models of instance with shared ones, in place, but
+        # bypassing validation, as they are equal
+        for name in fields:
+            if isinstance(value := instance.__dict__.get(name), BaseModel):
+                instance.__dict__[name] = self.share(value)
+
+    def share_fields(
+        self, data: Mapping[str, Any], fields: dict[str, type[BaseModel]]
+    ) -> dict[str, Any]:
+        # Replace the dicts in data with shared model instances, which pydantic
+        # does not validate again
+        ret = dict(data)
+        for name, model in fields.items():
+            if isinstance(value := data.get(name), dict) and (
+                shared := self.get(model, value)
+            ):
+                ret[name] = shared
+        return ret
+
+    def clear(self) -> None:
+        self._models.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._models)
@@ -0,0 +1,107 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+import copy
+from collections.abc import Callable
+from typing import Any
+
+# A subset of RFC 6902 (JSON Patch): only "add", "remove", and "replace" are ever
+# generated, which is all that's needed to turn one JSON document into another.
+
+type JSONPatch = list[dict[str, Any]]
+
+
+def _escape(token: str | int) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    if "~" not in token:
+        return token
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(old: Any, new: Any) -> bool:
+    # in JSON, true is not 1, and 1 is not 1.0
+    return type(old) is type(new) and old == new
+
+
+def _diff(old: Any, new: Any, path: str, ops: JSONPatch) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old.keys() - new.keys():
+            ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            keypath = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": keypath, "value": value})
+            else:
+                _diff(old[key], value, keypath, ops)
+
+    elif isinstance(old, list) and isinstance(new, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            _diff(old[i], new[i], f"{path}/{i}", ops)
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for value in new[common:]:
+            ops.append({"op": "add", "path": f"{path}/-", "value": value})
+
+    elif not _same(old, new):
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def make_patch(old: Any, new: Any) -> JSONPatch:
+    ops: JSONPatch = []
+    _diff(old, new, "", ops)
+    return ops
+
+
+def _resolve(doc: Any, path: str) -> tuple[Any, str]:
+    tokens = [_unescape(t) for t in path.split("/")[1:]]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def apply_patch(doc: Any, patch: JSONPatch, *, inplace: bool = False) -> Any:
+    # With inplace=True, neither doc nor the values in patch are copied, which is
+    # faster, but doc is modified, and values from the patch end up in it.
+    _copy: Callable[[Any], Any] = _identity if inplace else copy.deepcopy
+    doc = _copy(doc)
+    for op in patch:
+        if op["path"] == "":
+            if op["op"] != "replace":
+                raise ValueError(f"Cannot {op['op']} the document root")
+            doc = _copy(op["value"])
+            continue
+
+        parent, token = _resolve(doc, op["path"])
+        match op["op"], parent:
+            case "add", list():
+                value = _copy(op["value"])
+                if token == "-":
+                    parent.append(value)
+                else:
+                    parent.insert(int(token), value)
+
+            case "remove", list():
+                del parent[int(token)]
+
+            case "replace", list():
+                parent[int(token)] = _copy(op["value"])
+
+            case "add" | "replace", dict():
+                parent[token] = _copy(op["value"])
+
+            case "remove", dict():
+                del parent[token]
+
+            case _:
+                raise ValueError(f"Unsupported JSON patch operation: {op}")
+
+    return doc
@@ -1,12 +1,14 @@
 # needed < 3.14 so that annotations aren't evaluated
 from __future__ import annotations
 
+import functools
 from abc import abstractmethod
-from collections.abc import MutableMapping
+from collections.abc import Callable, Mapping, MutableMapping
 from datetime import datetime
-from typing import Any, Never
+from typing import Any, ClassVar, Never, Self, cast
 
 from pydantic import (
+    PrivateAttr,
     SerializerFunctionWrapHandler,
     computed_field,
     field_serializer,
@@ -17,35 +19,112 @@ from tptools.util import ScoresType
 
 from .devinfo import DeviceInfo
 from .game import Game, Result
+from .interning import load_json
 from .livestatus import LiveStatus
 from .modelabc import ModelABC
 
 
+def memoized[M: LiveData, T](func: Callable[[M], T]) -> Callable[[M], T]:
+    # Livedata are effectively immutable once received, yet their derived fields
+    # are read over and over, by MatchState when sorting, and on every dump. So
+    # compute them once per instance. The cache is dropped whenever a field is
+    # assigned (see LiveData.__setattr__), but not if a nested model is mutated.
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self: M) -> T:
+        memo = self._memo
+        try:
+            return cast(T, memo[name])
+
+        except KeyError:
+            ret = memo[name] = func(self)
+            return ret
+
+    return wrapper
+
+
 class LiveData(ModelABC):
     court: int | None
     timestamp: datetime | None = None
 
+    _memo: dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    # Subclasses set this to bytes found in all of their raw packets, and in
+    # no others, so that ingest_json() can tell which class to validate into
+    __ingest_marker__: ClassVar[bytes | None] = None
+    _ingest_markers: ClassVar[dict[bytes, type[LiveData]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if (marker := cls.__dict__.get("__ingest_marker__")) is not None:
+            LiveData._ingest_markers[marker] = cls
+
+    @classmethod
+    def ingest_json(cls, raw: bytes | str) -> LiveData:
+        # Raw packets are validated straight into the class whose marker they
+        # contain, without going through the registry.
+        data = raw.encode() if isinstance(raw, str) else raw
+        for marker, model in cls._ingest_markers.items():
+            if marker in data:
+                return model.model_validate(load_json(data))
+
+        if b'"_modelid"' in data:
+            return LiveData.model_validate(load_json(data))
+
+        raise ValueError(f"Cannot tell which kind of livedata this is: {raw[:64]!r}…")
+
     def model_post_init(self, ctx: Any) -> None:
         if self.timestamp is None:
             self.timestamp = (ctx or {}).get("timestamp") or datetime.now()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._memo.clear()
+
+    def __eq__(self, other: object) -> bool:
+        # unlike BaseModel.__eq__, ignore private attributes, as they only hold
+        # derived data, which one of two otherwise equal instances may have cached
+        if not isinstance(other, LiveData):
+            return NotImplemented
+
+        return type(self) is type(other) and self.__dict__ == other.__dict__
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        ret = super().model_copy(update=update, deep=deep)
+        # Private attributes only hold derived data, which a shallow copy would
+        # share, and which updates would render stale, so start afresh:
+        for name, attr in self.__private_attributes__.items():
+            setattr(ret, name, attr.get_default(call_default_factory=True))
+        return ret
+
     @property
     @abstractmethod
     def matchid(self) -> str: ...
 
     @model_serializer(mode="wrap")
-    def _add_matchid(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
+    def _add_lookup_keys(
+        self, handler: SerializerFunctionWrapHandler
+    ) -> dict[str, Any]:
         # must call super()'s model_serializer, unfortunately.
         # See https://github.com/pydantic/pydantic/discussions/12664
         ret: dict[str, Any] = super()._add_modelid(handler)
+        # These are also included in round-trip dumps (which leave out computed
+        # fields), so that the database can index records by them:
         ret["_matchid"] = self.matchid
+        ret["_deviceid"] = self.deviceid
+        ret["_status"] = str(self.status)
         return ret
 
     @model_validator(mode="before")
     @classmethod
-    def _remove_matchid_from_data(cls, data: Any) -> Any:
-        if isinstance(data, MutableMapping):
-            data.pop("_matchid", None)
+    def _remove_lookup_keys_from_data(cls, data: Any) -> Any:
+        if isinstance(data, dict | MutableMapping):
+            for key in ("_matchid", "_deviceid", "_status"):
+                data.pop(key, None)
 
         return data
 
@@ -61,6 +140,17 @@ class LiveData(ModelABC):
     def can_come_after(self, other: LiveData) -> bool:
         return self.status.can_come_after(other.status)
 
+    def continue_from(self, previous: LiveData) -> None:
+        # Called when this livedata replaces previous for the same match, so that
+        # subclasses can carry over whatever work need not be done again.
+        _ = previous
+
+    def share_submodels(self) -> None:
+        # Called for livedata that were not validated in this process, e.g. in
+        # the process pool, so that subclasses can share what they would have
+        # shared on validation, see interning.
+        pass
+
     @property
     @abstractmethod
     def deviceid(self) -> str: ...
@@ -91,6 +181,7 @@ class LiveData(ModelABC):
 
     @computed_field  # type: ignore[prop-decorator]
     @property
+    @memoized
     def matchscore(self) -> Result:
         ret = [0, 0]
         for game in self.games:
@@ -1,7 +1,21 @@
 # needed < 3.14 so that annotations aren't evaluated
 from __future__ import annotations
 
+import functools
+from collections.abc import Iterable
 from enum import IntEnum, auto
+from typing import TYPE_CHECKING, Any
+
+try:
+    import numpy
+
+except ImportError:  # pragma: no cover — numpy is installed for tests
+    numpy = None  # type: ignore[assignment]
+
+_HAVE_NUMPY: bool = numpy is not None
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
 
 
 class LiveStatus(IntEnum):
@@ -22,21 +36,13 @@ class LiveStatus(IntEnum):
 
     @property
     def short(self) -> str:
-        return {
-            self.UNKNOWN: "???",
-            self.WARMUP: "WUP",
-            self.PREPARE: "PRE",
-            self.READY: "RDY",
-            self.ONGOING: "ONG",
-            self.GAMEBALL: "GBL",
-            self.BETWEENGAMES: "PAU",
-            self.FIFTEENSECONDS: "15s",
-            self.MATCHBALL: "MBL",
-            self.FINISHED: "FIN",
-            self.EXTERNAL: "EXT",
-        }[self]
+        return _SHORT[self]
 
     def can_come_after(self, other: LiveStatus) -> bool:
+        return TRANSITIONS[self][other]
+
+    def _follows_rules(self, other: LiveStatus) -> bool:
+        # The rules, from which TRANSITIONS is compiled. Do not call directly.
         if self == self.UNKNOWN:
             return False
 
@@ -55,3 +61,48 @@ class LiveStatus(IntEnum):
             return True
 
         return self >= other
+
+
+_SHORT: dict[LiveStatus, str] = {
+    LiveStatus.UNKNOWN: "???",
+    LiveStatus.WARMUP: "WUP",
+    LiveStatus.PREPARE: "PRE",
+    LiveStatus.READY: "RDY",
+    LiveStatus.ONGOING: "ONG",
+    LiveStatus.GAMEBALL: "GBL",
+    LiveStatus.BETWEENGAMES: "PAU",
+    LiveStatus.FIFTEENSECONDS: "15s",
+    LiveStatus.MATCHBALL: "MBL",
+    LiveStatus.FINISHED: "FIN",
+    LiveStatus.EXTERNAL: "EXT",
+}
+
+# TRANSITIONS[cur][prev] tells whether status cur can come after status prev:
+TRANSITIONS: tuple[tuple[bool, ...], ...] = tuple(
+    tuple(cur._follows_rules(prev) for prev in LiveStatus) for cur in LiveStatus
+)
+
+
+def _require_numpy() -> None:
+    if numpy is None:  # pragma: no cover — numpy is installed for tests
+        raise RuntimeError("This needs the numpy package installed")
+
+
+@functools.cache
+def get_transition_array() -> NDArray[numpy.bool_]:
+    _require_numpy()
+    ret = numpy.array(TRANSITIONS, dtype=bool)
+    ret.flags.writeable = False
+    return ret
+
+
+def find_invalid_transitions(statuses: Iterable[LiveStatus | int]) -> list[int]:
+    # Returns the indices of the statuses that cannot come after their
+    # predecessors, checking an entire recorded sequence in one go
+    seq: Any = list(statuses)
+    if not _HAVE_NUMPY:
+        return [i for i in range(1, len(seq)) if not TRANSITIONS[seq[i]][seq[i - 1]]]
+
+    seq = numpy.asarray(seq, dtype=numpy.intp)
+    valid = get_transition_array()[seq[1:], seq[:-1]]
+    return [int(i) + 1 for i in numpy.flatnonzero(~valid)]
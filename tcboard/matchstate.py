@@ -2,17 +2,20 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Any, Never, cast
+from typing import Any, Never, Self, cast
 
 from pydantic import (
     BaseModel,
+    PrivateAttr,
     computed_field,
 )
 from tptools import Court, Draw, Entry, Tournament
 from tptools.mixins import ComparableMixin, ReprMixin
 
 from .alert import Alert
+from .conflicts import Conflict, ConflictTracker
 from .exceptions import (
     CourtMismatchError,
     MatchStateConflict,
@@ -41,12 +44,50 @@ class MatchState[LiveDataT: LiveData](
     locked: bool = False
     acked: bool = False
 
+    _conflicts: ConflictTracker = PrivateAttr(default_factory=ConflictTracker)
+
+    # Every change to a field bumps the version, and drops the JSON cached by
+    # cached_json(), such that clients polling the board are served the same
+    # bytes until the match state actually changes. Note that changes within
+    # the match or livedata are not seen, but these are replaced, not changed.
+    _version: int = PrivateAttr(default=0)
+    _json: dict[str, bytes] = PrivateAttr(default_factory=dict)
+
     def model_post_init(self, _: Any) -> None:
         if self.timestamp is None:
             self.timestamp = (
                 self.livedata.timestamp if self.livedata is not None else datetime.now()
             )
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._version += 1
+            self._json = {}
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        ret = super().model_copy(update=update, deep=deep)
+        # Updates do not go through __setattr__, and a shallow copy would share
+        # the cache and the conflicts, so the copy starts afresh, as a new version:
+        ret._json = {}
+        ret._conflicts = ConflictTracker()
+        ret._version = self._version + 1
+        return ret
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def cached_json(self, **kwargs: Any) -> bytes:
+        # kwargs are passed to model_dump_json(), and the JSON is cached for
+        # each combination thereof
+        key = repr(sorted(kwargs.items()))
+        if (ret := self._json.get(key)) is None:
+            ret = self._json[key] = self.model_dump_json(**kwargs).encode()
+        return ret
+
     # @model_serializer(mode="wrap")
     # def _model_serializer(  # type: ignore[no-untyped-def]
     #     self, handler: SerializerFunctionWrapHandler
@@ -94,6 +135,7 @@ class MatchState[LiveDataT: LiveData](
 
     def reset(self) -> None:
         self.livedata = None
+        self._conflicts.clear()
 
     def lock(self) -> None:
         self.locked = True
@@ -151,29 +193,45 @@ class MatchState[LiveDataT: LiveData](
             )
 
         if not data.can_come_after(self.livedata):
-            raise MatchStateConflict(
-                Alert(
-                    text=(
-                        "Livedata out of line with existing data "
-                        f"@ {self.livedata.status}"
-                    ),
-                    detail=repr(data),
-                    matchid=self.match.id,
-                    deviceid=data.deviceid,
-                )
-            )
-            # TODO: asses what we should do here. We do not want e.g. a new match to
-            # replace an ongoing match, but this check also cannot be too tight, as
-            # there *will* be stray packets.
-            #
-            # One consideration: keep a counter, and ignore until a repeated number of
-            # times this has happened…
+            # There *will* be stray packets, which are ignored, but a conflict
+            # that keeps coming is alerted on, and eventually accepted. The
+            # Alert is only built when it is raised, as it is costly.
+            match self._conflicts.record((self.livedata.status, data.status)):
+                case Conflict.IGNORE:
+                    logger.debug(
+                        f"Ignoring livedata with status {data.status} for match "
+                        f"{self.match.id} @ {self.livedata.status}"
+                    )
+                    return None
+
+                case Conflict.ALERT:
+                    raise MatchStateConflict(
+                        Alert(
+                            text=(
+                                "Livedata out of line with existing data "
+                                f"@ {self.livedata.status}"
+                            ),
+                            detail=repr(data),
+                            matchid=self.match.id,
+                            deviceid=data.deviceid,
+                        )
+                    )
+
+                case Conflict.ACCEPT:
+                    logger.info(
+                        f"Accepting livedata with status {data.status} for match "
+                        f"{self.match.id} @ {self.livedata.status}, as it persists"
+                    )
+
+        elif self._conflicts:
+            self._conflicts.clear()
 
         logger.debug(
             f"New data with status {data.status} for match {self.livedata.matchid} "
             f"from device {data.deviceid} "
             f"replaces livedata at status {self.livedata.status}: {data!r}"
         )
+        data.continue_from(self.livedata)
         self.livedata = data
         self.timestamp = data.timestamp
 
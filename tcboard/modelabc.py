@@ -1,20 +1,40 @@
 # needed < 3.14 so that annotations aren't evaluated
 from __future__ import annotations
 
-from collections.abc import MutableMapping
-from typing import Any, ClassVar, Self, cast
+import inspect
+from collections.abc import Iterable, Mapping, MutableMapping
+from typing import Annotated, Any, ClassVar, Self, Union, cast
 
 from pydantic import (
     BaseModel,
+    Discriminator,
     SerializerFunctionWrapHandler,
+    Tag,
+    TypeAdapter,
     ValidatorFunctionWrapHandler,
     model_serializer,
     model_validator,
 )
 
+from .interning import load_json
+
+
+def _get_modelid(data: Any) -> str | None:
+    # dicts first: this is called for every item validated, and they are the norm
+    if isinstance(data, dict | Mapping):
+        return cast(str | None, data.get("_modelid"))
+
+    elif isinstance(data, ModelABC):
+        return data.modelid
+
+    return None
+
 
 class ModelABC(BaseModel):
     _registry: ClassVar[dict[str, type[ModelABC]]] = {}
+    # TypeAdapters validating lists of any of the registered specialisations of a
+    # class, built on first use, and dropped whenever another class registers:
+    _adapters: ClassVar[dict[type[ModelABC], TypeAdapter[list[Any]]]] = {}
 
     @classmethod
     def _model_name(cls) -> str:
@@ -24,6 +44,7 @@ class ModelABC(BaseModel):
         super().__init_subclass__(**kwargs)
         name = cls._model_name()
         cls._registry[name] = cls
+        cls._adapters.clear()
 
     @property
     def modelid(self) -> str:
@@ -40,10 +61,12 @@ class ModelABC(BaseModel):
     def _make_from_modelid_if_present(
         cls, data: dict[str, Any], handler: ValidatorFunctionWrapHandler
     ) -> Self:
-        if isinstance(data, MutableMapping):
+        if isinstance(data, dict | MutableMapping):
             modelid = data.pop("_modelid", None)
 
-            if modelid is not None:
+            # Only dispatch if the data are for another class, as validating
+            # through the registry means validating once more
+            if modelid is not None and modelid != cls._model_name():
                 return cls.make_model_instance(data, modelid=modelid)
 
         return cast(Self, handler(data))
@@ -63,4 +86,44 @@ class ModelABC(BaseModel):
 
     @classmethod
     def make_model_instance_json(cls, json: str, *, modelid: str | None = None) -> Self:
-        return cls._get_model_class(modelid=modelid).model_validate_json(json)
+        return cls._get_model_class(modelid=modelid).model_validate(load_json(json))
+
+    @classmethod
+    def _get_list_adapter(cls) -> TypeAdapter[list[Self]]:
+        if (adapter := cls._adapters.get(cls)) is None:
+            choices = [
+                Annotated[model, Tag(modelid)]
+                for modelid, model in cls._registry.items()
+                if issubclass(model, cls) and not inspect.isabstract(model)
+            ]
+            if not choices:
+                raise TypeError(f"No model specialisations known: {cls._model_name()}")
+
+            # A union tagged by _modelid has pydantic-core pick the class for
+            # each item, rather than the registry lookup in Python
+            item: Any = Annotated[
+                Union[tuple(choices)],
+                Discriminator(_get_modelid),
+            ]
+            adapter = cls._adapters[cls] = TypeAdapter(list[item])
+
+        return cast(TypeAdapter[list[Self]], adapter)
+
+    @classmethod
+    def make_model_instances(cls, data: Iterable[Any]) -> list[Self]:
+        return cls._get_list_adapter().validate_python(list(data))
+
+    @classmethod
+    def make_model_instances_json(cls, json: str | bytes) -> list[Self]:
+        # json is an array of objects, each with a _modelid
+        return cls._get_list_adapter().validate_python(load_json(json))
+
+    @classmethod
+    def make_model_instances_ndjson(cls, lines: Iterable[str | bytes]) -> list[Self]:
+        # Splice the lines into one JSON array, to be validated in one go
+        array = b",".join(
+            line.encode() if isinstance(line, str) else line
+            for line in lines
+            if line.strip()
+        )
+        return cls.make_model_instances_json(b"[" + array + b"]")
@@ -0,0 +1,134 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+import asyncio
+import importlib
+import io
+import logging
+import multiprocessing
+import pickle
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Self, cast
+
+from pydantic import BaseModel
+
+from .interning import load_json
+from .livedata import LiveData
+
+logger = logging.getLogger(__name__)
+
+# Validating livedata, and dumping large models such as the tournament, are
+# CPU-bound, and would stall the event loop, and hence all HTTP clients, for
+# as long as they take. OffloadService does both in a pool of processes, such
+# that the loop only pickles, which is an order of magnitude faster.
+#
+# The pool only exists while the service is entered, and outside of that, or
+# with max_workers=0, everything is done inline, on the loop.
+
+
+def _get_class(origin: type[BaseModel], args: tuple[Any, ...]) -> type[BaseModel]:
+    return cast(type[BaseModel], origin[args])  # type: ignore[index]
+
+
+class _Pickler(pickle.Pickler):
+    # Parametrised generic models, e.g. TCTournament, or MatchState[LiveData],
+    # cannot be pickled, as their classes cannot be looked up by name, so they
+    # are pickled as their origin and arguments instead
+    def reducer_override(self, obj: Any) -> Any:
+        if (
+            isinstance(obj, type)
+            and issubclass(obj, BaseModel)
+            and (meta := obj.__pydantic_generic_metadata__)["origin"]
+        ):
+            return _get_class, (meta["origin"], meta["args"])
+
+        return NotImplemented
+
+
+def _dumps(obj: Any) -> bytes:
+    buf = io.BytesIO()
+    _Pickler(buf, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buf.getvalue()
+
+
+def _import_modules(modules: tuple[str, ...]) -> None:
+    # The pool's processes need to import the modules of all models known to
+    # ModelABC, e.g. the LiveData classes, so that these can be told apart
+    for module in modules:
+        importlib.import_module(module)
+
+
+# These run in the pool, and take and return models pickled with _dumps():
+
+
+def _ingest_livedata(raw: bytes | str) -> bytes:
+    return _dumps(LiveData.ingest_json(raw))
+
+
+def _validate_json(model: bytes, raw: bytes | str) -> bytes:
+    return _dumps(pickle.loads(model).model_validate(load_json(raw)))
+
+
+def _dump_json(model: bytes, kwargs: dict[str, Any]) -> str:
+    return cast(str, pickle.loads(model).model_dump_json(**kwargs))
+
+
+class OffloadService:
+    def __init__(self, *, max_workers: int | None = None) -> None:
+        # max_workers=None uses as many processes as there are CPUs
+        if max_workers is not None and max_workers < 0:
+            raise ValueError(f"Number of workers cannot be negative: {max_workers}")
+
+        self._max_workers = max_workers
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def __aenter__(self) -> Self:
+        if self._max_workers != 0:
+            modules = tuple({model.__module__ for model in LiveData._registry.values()})
+            # not forked, as the loop process has threads, e.g. of aiosqlite
+            self._pool = ProcessPoolExecutor(
+                self._max_workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_import_modules,
+                initargs=(modules,),
+            )
+            logger.info("Started process pool for offloading")
+        return self
+
+    async def __aexit__(self, *_: Any) -> bool:
+        if (pool := self._pool) is not None:
+            self._pool = None
+            await asyncio.to_thread(pool.shutdown)
+        return False
+
+    async def _submit[T](self, func: Callable[..., T], *args: Any) -> T:
+        assert self._pool is not None
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+
+    async def ingest_livedata(self, raw: bytes | str) -> LiveData:
+        if self._pool is None:
+            return LiveData.ingest_json(raw)
+
+        livedata = cast(
+            LiveData, pickle.loads(await self._submit(_ingest_livedata, raw))
+        )
+        # Unpickled, the livedata share neither sub-models nor strings with those
+        # before, as they would have if validated here. The former are shared
+        # again, but the strings of the rest, e.g. the scores, are not interned,
+        # which is the memory traded for keeping validation off the loop.
+        livedata.share_submodels()
+        return livedata
+
+    async def validate_json[M: BaseModel](self, model: type[M], raw: bytes | str) -> M:
+        if self._pool is None:
+            return model.model_validate(load_json(raw))
+
+        ret = await self._submit(_validate_json, _dumps(model), raw)
+        return cast(M, pickle.loads(ret))
+
+    async def dump_json(self, model: BaseModel, **kwargs: Any) -> str:
+        if self._pool is None:
+            return model.model_dump_json(**kwargs)
+
+        return await self._submit(_dump_json, _dumps(model), kwargs)
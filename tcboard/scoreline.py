@@ -0,0 +1,146 @@
+# needed < 3.14 so that annotations aren't evaluated
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any, overload
+
+from .point import AppealType, PlayerIndex, Point, ServerSide
+
+# A scoreline as a structure of arrays, i.e. one array per Point field, at a few
+# bytes per rally, rather than a list of Point models, at a few hundred bytes per
+# rally. It dumps to exactly what the list of Points would dump to.
+#
+# Points are only created when the scoreline is indexed or iterated, so those
+# building or dumping scorelines should use add() and dump() instead.
+
+_NONE = -1
+_NO_DURATION = -(2**31)
+_SIDES: tuple[ServerSide, ServerSide] = ("L", "R")
+_APPEALS: tuple[AppealType, AppealType, AppealType] = ("S", "L", "N")
+_SIDE_CODES = {"L": 0, "R": 1, None: _NONE}
+# Rally data are points scored, which cannot be negative, so appeals are:
+_APPEAL_CODES = {"S": -1, "L": -2, "N": -3}
+
+
+class Scoreline(Sequence[Point]):
+    __slots__ = ("_data", "_duration", "_player", "_server", "_serveside")
+
+    def __init__(self, points: Iterable[Point] = ()) -> None:
+        self._server = array("b")
+        self._serveside = array("b")
+        self._player = array("b")
+        self._data = array("i")
+        self._duration = array("i")
+        self.extend(points)
+
+    def add(
+        self,
+        server: PlayerIndex | None,
+        serveside: ServerSide | None,
+        player: PlayerIndex,
+        data: int | AppealType,
+        duration: int | None = None,
+    ) -> None:
+        self._server.append(_NONE if server is None else server)
+        self._serveside.append(_SIDE_CODES[serveside])
+        self._player.append(player)
+        self._data.append(data if isinstance(data, int) else _APPEAL_CODES[data])
+        self._duration.append(_NO_DURATION if duration is None else duration)
+
+    def append(self, point: Point) -> None:
+        self.add(
+            point.server, point.serveside, point.player, point.data, point.duration
+        )
+
+    def extend(self, points: Iterable[Point]) -> None:
+        if isinstance(points, Scoreline):
+            self._server.extend(points._server)
+            self._serveside.extend(points._serveside)
+            self._player.extend(points._player)
+            self._data.extend(points._data)
+            self._duration.extend(points._duration)
+
+        else:
+            for point in points:
+                self.append(point)
+
+    @staticmethod
+    def _point(
+        server: int, serveside: int, player: int, data: int, duration: int
+    ) -> dict[str, Any]:
+        return {
+            "server": None if server == _NONE else server,
+            "serveside": None if serveside == _NONE else _SIDES[serveside],
+            "player": player,
+            "data": data if data >= 0 else _APPEALS[-data - 1],
+            "duration": None if duration == _NO_DURATION else duration,
+        }
+
+    def dump(self) -> list[dict[str, Any]]:
+        point = self._point
+        return [
+            point(*fields)
+            for fields in zip(
+                self._server,
+                self._serveside,
+                self._player,
+                self._data,
+                self._duration,
+                strict=True,
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self._player)
+
+    @overload
+    def __getitem__(self, index: int) -> Point: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Scoreline: ...
+
+    def __getitem__(self, index: int | slice) -> Point | Scoreline:
+        if isinstance(index, slice):
+            ret = Scoreline()
+            ret._server = self._server[index]
+            ret._serveside = self._serveside[index]
+            ret._player = self._player[index]
+            ret._data = self._data[index]
+            ret._duration = self._duration[index]
+            return ret
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Scoreline index out of range")
+
+        return Point.model_validate(
+            self._point(
+                self._server[index],
+                self._serveside[index],
+                self._player[index],
+                self._data[index],
+                self._duration[index],
+            )
+        )
+
+    def __iter__(self) -> Iterator[Point]:
+        for fields in self.dump():
+            yield Point.model_validate(fields)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Scoreline):
+            return self.dump() == other.dump()
+
+        elif isinstance(other, Sequence):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other, strict=True)
+            )
+
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Scoreline({list(self)!r})"
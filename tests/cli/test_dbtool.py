@@ -0,0 +1,70 @@
+import asyncio
+import pathlib
+
+import pytest
+from click.testing import CliRunner
+from tptools import Tournament
+
+from tcboard.cli.dbtool import tcboard_db
+from tcboard.dbmanager import DBManager
+
+
+async def _make_db(file: pathlib.Path, *names: str) -> None:
+    async with DBManager(file=file) as db:
+        await db.init_tables()
+        for name in names:
+            await db.record_tournament(Tournament(name=name))
+
+
+async def _names(file: pathlib.Path) -> list[str | None]:
+    async with DBManager(file=file) as db:
+        ret = [
+            Tournament.model_validate_json(r["data"]).name
+            async for r in db.get_all_tournament_and_livedata_records()
+        ]
+    return ret
+
+
+@pytest.fixture
+def dbfile(tmp_path: pathlib.Path) -> pathlib.Path:
+    file = tmp_path / "db.sqlite"
+    asyncio.run(_make_db(file, "one", "two"))
+    return file
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd", "none"])
+def test_export_import(
+    dbfile: pathlib.Path, tmp_path: pathlib.Path, compression: str
+) -> None:
+    runner = CliRunner()
+    dump = tmp_path / "dump"
+    result = runner.invoke(
+        tcboard_db, ["export", "-c", compression, str(dbfile), str(dump)]
+    )
+    assert result.exit_code == 0, result.output
+
+    newdb = tmp_path / "new.sqlite"
+    result = runner.invoke(tcboard_db, ["import", str(newdb), str(dump)])
+    assert result.exit_code == 0, result.output
+    assert "Imported 2 record(s)" in result.output
+    assert asyncio.run(_names(newdb)) == ["one", "two"]
+
+
+def test_export_stdout(dbfile: pathlib.Path) -> None:
+    result = CliRunner().invoke(tcboard_db, ["export", "-c", "none", str(dbfile)])
+    assert result.exit_code == 0
+    assert result.stdout.count("\n") == 2
+
+
+@pytest.mark.parametrize("force, exit_code", [(False, 1), (True, 0)])
+def test_import_into_used_database(
+    dbfile: pathlib.Path, tmp_path: pathlib.Path, force: bool, exit_code: int
+) -> None:
+    runner = CliRunner()
+    dump = tmp_path / "dump"
+    runner.invoke(tcboard_db, ["export", str(dbfile), str(dump)])
+    result = runner.invoke(
+        tcboard_db, ["import", str(dbfile), str(dump)] + (["--force"] if force else [])
+    )
+    assert result.exit_code == exit_code
+    assert len(asyncio.run(_names(dbfile))) == (4 if force else 2)
@@ -0,0 +1,58 @@
+import gzip
+from collections.abc import AsyncGenerator
+
+import httpx
+import pytest
+import pytest_asyncio
+from click_async_plugins import ITC
+from fastapi import FastAPI
+from tptools import Tournament
+
+from tcboard.cli.dbtool import export_endpoint
+from tcboard.cli.util import CliContext
+from tcboard.dbmanager import DBManager
+
+
+@pytest_asyncio.fixture
+async def client(itc: ITC) -> AsyncGenerator[tuple[httpx.AsyncClient, FastAPI]]:
+    app = FastAPI()
+    app.get("/export")(export_endpoint)
+    CliContext(api=app, itc=itc)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c, app
+
+
+@pytest.mark.asyncio
+async def test_export_without_db(client: tuple[httpx.AsyncClient, FastAPI]) -> None:
+    c, _ = client
+    assert (await c.get("/export")).status_code == 503
+
+
+@pytest.mark.parametrize(
+    "compression, media_type, filename",
+    [
+        ("gzip", "application/gzip", "tcboard.ndjson.gz"),
+        ("zstd", "application/zstd", "tcboard.ndjson.zst"),
+        ("none", "application/x-ndjson", "tcboard.ndjson"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_export(
+    client: tuple[httpx.AsyncClient, FastAPI],
+    compression: str,
+    media_type: str,
+    filename: str,
+) -> None:
+    c, app = client
+    async with DBManager(file=None) as db:
+        await db.init_tables()
+        await db.record_tournament(Tournament(name="one"))
+        app.state.clictx.db = db
+        resp = await c.get("/export", params={"compression": compression})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == media_type
+    assert filename in resp.headers["content-disposition"]
+    if compression == "gzip":
+        assert b'"name":"one"' in gzip.decompress(resp.content)
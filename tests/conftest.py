@@ -54,7 +54,8 @@ class FakeLiveData(LiveData):
     @computed_field  # type: ignore[prop-decorator]
     @property
     def status(self) -> LiveStatus:
-        return cast(LiveStatus, self.fakedata.get("status", LiveStatus.UNKNOWN))
+        # after a JSON round-trip, fakedata holds the value, not the enum member
+        return LiveStatus(self.fakedata.get("status", LiveStatus.UNKNOWN))
 
     @property
     def deviceid(self) -> str:
@@ -0,0 +1,22 @@
+import pytest
+
+from tcboard.dbcodec import Codec, ZlibCodec
+from tcboard.ext.squore import SQUORE_CODEC
+from tcboard.ext.squore.dbcodec import SQUORE_CODEC_V1
+from tcboard.ext.squore.livedata import SquoreMatchLiveData
+
+
+def test_registered() -> None:
+    assert Codec.get("zlib+squore1") is SQUORE_CODEC_V1
+    assert Codec.get("zlib+squore2") is SQUORE_CODEC
+
+
+@pytest.mark.parametrize("codec", [SQUORE_CODEC_V1, SQUORE_CODEC])
+def test_compresses_better_than_plain_zlib(
+    codec: Codec,
+    match_ongoing: SquoreMatchLiveData,
+) -> None:
+    data = match_ongoing.model_dump_json(round_trip=True).encode()
+    encoded = codec.encode(data)
+    assert codec.decode(encoded) == data
+    assert len(encoded) < len(ZlibCodec().encode(data))
@@ -1,8 +1,10 @@
+import pickle
 import warnings
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
+from pydantic import ValidationError
 
 from tcboard.ext.squore.devinfo import SquoreDeviceInfo
 from tcboard.ext.squore.livedata import (
@@ -13,8 +15,10 @@ from tcboard.ext.squore.livedata import (
     Timing,
 )
 from tcboard.game import Game
+from tcboard.livedata import LiveData
 from tcboard.livestatus import LiveStatus
 from tcboard.point import PlayerIndex
+from tcboard.scoreline import Scoreline
 
 from ...conftest import FakeLiveDataFactoryType
 from .conftest import LiveDataFactoryType
@@ -263,3 +267,165 @@ def test_validate_squore_bug_120(
     )
     with pytest.raises(InconsistentStateBug120):
         match_finished.validate_livedata()
+
+
+def test_derived_fields_memoized(match_ongoing: SquoreMatchLiveData) -> None:
+    assert match_ongoing.games is match_ongoing.games
+    assert match_ongoing.scores is match_ongoing.scores
+
+
+def test_derived_fields_memo_cleared_on_assignment(
+    match_ongoing: SquoreMatchLiveData, timerinfo_warmup: TimerInfo
+) -> None:
+    statuses = [match_ongoing.status]
+    match_ongoing.timerInfo = timerinfo_warmup
+    statuses.append(match_ongoing.status)
+    assert statuses == [LiveStatus.ONGOING, LiveStatus.WARMUP]
+
+
+def test_derived_fields_memo_not_shared_by_copy(
+    match_ongoing: SquoreMatchLiveData,
+) -> None:
+    assert match_ongoing.status == LiveStatus.ONGOING
+    copy = match_ongoing.model_copy(update={"isGameBall": True})
+    assert copy.status == LiveStatus.GAMEBALL
+    assert match_ongoing.status == LiveStatus.ONGOING
+
+
+def _next_rally(ld: SquoreMatchLiveData, token: str) -> SquoreMatchLiveData:
+    score = [list(tokens) for tokens in ld.score]
+    score[-1].append(token)
+    timing = [t.model_copy(deep=True) for t in ld.timing]
+    offsets = timing[-1].offsets or []
+    timing[-1].offsets = [*offsets, (offsets[-1] if offsets else 0) + 5]
+    return ld.model_copy(update={"score": score, "timing": timing})
+
+
+def test_continue_from_reuses_parsed_games(
+    match_ongoing: SquoreMatchLiveData,
+) -> None:
+    previous = match_ongoing.games
+    livedata = _next_rally(match_ongoing, "L5--")
+    livedata.continue_from(match_ongoing)
+    games = livedata.games
+    assert games[:2] == previous[:2]
+    assert all(g is p for g, p in zip(games[:2], previous[:2], strict=True))
+    assert all(
+        p is q for p, q in zip(games[2].scoreline, previous[2].scoreline, strict=False)
+    )
+    assert games == _next_rally(match_ongoing, "L5--").games
+    assert games[2].scoreline[-1].duration == 5
+
+
+def test_continue_from_previous_never_parsed(
+    match_ongoing: SquoreMatchLiveData,
+) -> None:
+    first = match_ongoing.games
+    second = _next_rally(match_ongoing, "L5--")
+    second.continue_from(match_ongoing)
+    third = _next_rally(second, "L6--")
+    third.continue_from(second)
+    assert third.games[0] is first[0]
+
+
+def test_continue_from_diverged(match_ongoing: SquoreMatchLiveData) -> None:
+    previous = match_ongoing.games
+    livedata = _next_rally(match_ongoing, "L5--")
+    assert livedata.score[-1][0] == "L1--"
+    livedata.score[-1][0] = "R1--"
+    livedata.continue_from(match_ongoing)
+    assert livedata.games[2].scoreline[1] is not previous[2].scoreline[1]
+    assert livedata.games[2].scoreline[0].serveside == "R"
+
+
+def test_continue_from_undo(match_ongoing: SquoreMatchLiveData) -> None:
+    previous = match_ongoing.games
+    livedata = match_ongoing.model_copy(update={"isUndo": True})
+    livedata.continue_from(match_ongoing)
+    assert livedata.games == previous
+    assert livedata.games[0] is not previous[0]
+
+
+def test_continue_from_other_livedata(
+    match_ongoing: SquoreMatchLiveData, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    match_ongoing.continue_from(FakeLiveDataFactory())
+    assert match_ongoing.games
+
+
+def test_reparse_after_assignment_reuses_games(
+    match_ongoing: SquoreMatchLiveData,
+) -> None:
+    previous = match_ongoing.games
+    match_ongoing.isGameBall = True
+    assert match_ongoing.games[0] is previous[0]
+
+
+def test_compact_scorelines(
+    match_ongoing: SquoreMatchLiveData, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expected = _next_rally(match_ongoing, "L5--")
+    assert not isinstance(expected.games[-1].scoreline, Scoreline)
+    monkeypatch.setattr(SquoreMatchLiveData, "compact_scorelines", True)
+    _ = match_ongoing.games
+    livedata = _next_rally(match_ongoing, "L5--")
+    livedata.continue_from(match_ongoing)
+    assert all(isinstance(g.scoreline, Scoreline) for g in livedata.games)
+    assert livedata.games == expected.games
+    assert livedata.model_dump_json() == expected.model_dump_json()
+
+
+@pytest.mark.parametrize("round_trip", [False, True])
+def test_ingest_json(match_ongoing: SquoreMatchLiveData, round_trip: bool) -> None:
+    raw = match_ongoing.model_dump_json(
+        round_trip=round_trip, exclude_computed_fields=True
+    )
+    ingested = LiveData.ingest_json(raw)
+    assert isinstance(ingested, SquoreMatchLiveData)
+    assert ingested == match_ongoing
+
+
+def test_unchanged_submodels_shared(match_ongoing: SquoreMatchLiveData) -> None:
+    raw = match_ongoing.model_dump_json(exclude_computed_fields=True)
+    a = SquoreMatchLiveData.model_validate_json(raw)
+    b = SquoreMatchLiveData.model_validate_json(raw)
+    assert a == b == match_ongoing
+    assert a.event is b.event
+    assert a.format is b.format
+    assert a.metadata is not b.metadata
+    assert SquoreMatchLiveData.model_validate(a) is a
+    with pytest.raises(ValidationError):
+        SquoreMatchLiveData.model_validate("not a mapping")
+
+
+def test_ingested_strings_shared(match_ongoing: SquoreMatchLiveData) -> None:
+    raw = match_ongoing.model_dump_json(exclude_computed_fields=True)
+    a, b = LiveData.ingest_json(raw), LiveData.ingest_json(raw)
+    assert isinstance(a, SquoreMatchLiveData)
+    assert isinstance(b, SquoreMatchLiveData)
+    assert a.score[0][0] is b.score[0][0]
+    assert a.liveScoreDeviceId is b.liveScoreDeviceId
+
+
+@pytest.mark.parametrize("share", [True, False])
+def test_unpickled_submodels_shared(
+    match_ongoing: SquoreMatchLiveData, monkeypatch: pytest.MonkeyPatch, share: bool
+) -> None:
+    monkeypatch.setattr(SquoreMatchLiveData, "share_values", share)
+    a, b = (pickle.loads(pickle.dumps(match_ongoing)) for _ in range(2))
+    for livedata in (a, b):
+        livedata.share_submodels()
+    assert a == b == match_ongoing
+    assert (a.event is b.event) is share
+    assert a.metadata is not b.metadata
+
+
+def test_submodels_not_shared(
+    match_ongoing: SquoreMatchLiveData, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(SquoreMatchLiveData, "share_values", False)
+    raw = match_ongoing.model_dump_json(exclude_computed_fields=True)
+    a = SquoreMatchLiveData.model_validate_json(raw)
+    b = SquoreMatchLiveData.model_validate_json(raw)
+    assert a == b
+    assert a.event is not b.event
@@ -5,10 +5,12 @@ from typing import ContextManager
 import pytest
 
 from tcboard.ext.squore.point import (
+    _TOKENS,
     AppealType,
     PlayerIndex,
     Point,
     ServerSide,
+    _parse_squore_line,
     make_point_from_squore_line,
 )
 
@@ -60,3 +62,26 @@ def test_squore_line_to_point(input: str, exp: ContextManager[Point]) -> None:
 
 def test_squore_line_to_point_with_duration() -> None:
     assert make_point_from_squore_line("R1--", duration=42).duration == 42
+
+
+def test_squore_token_table_agrees_with_parser() -> None:
+    for token, fields in _TOKENS.items():
+        assert _parse_squore_line(token) == fields
+
+
+@pytest.mark.parametrize("input", ["R100--", "--L100", "R01--", "STR1"])
+def test_squore_line_not_in_token_table(input: str) -> None:
+    assert input not in _TOKENS
+    server, side, player, data = _parse_squore_line(input)
+    assert make_point_from_squore_line(input) == Point(
+        server=server, serveside=side, player=player, data=data
+    )
+
+
+def test_squore_line_point_behaves_like_validated_point() -> None:
+    point = make_point_from_squore_line("--L3", duration=42)
+    exp = Point(server=1, serveside="L", player=1, data=3, duration=42)
+    assert point.model_dump_json() == exp.model_dump_json()
+    assert point.model_fields_set == exp.model_fields_set
+    point.duration = 7
+    assert point.model_copy() == exp.model_copy(update={"duration": 7})
@@ -0,0 +1,241 @@
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+
+from tcboard.board import Board
+from tcboard.exceptions import CourtMismatchError
+from tcboard.livestatus import LiveStatus
+from tcboard.matchslot import MatchSlot
+from tcboard.matchstate import MatchState
+
+from .conftest import FakeLiveData, FakeLiveDataFactoryType, MatchFactoryType
+
+type StateFactoryType = Callable[..., MatchState[FakeLiveData]]
+
+
+@pytest.fixture
+def StateFactory(
+    MatchFactory: MatchFactoryType, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> StateFactoryType:
+    def factory(
+        matchid: str, *, time: datetime | None = None, **livedataargs: Any
+    ) -> MatchState[FakeLiveData]:
+        match = MatchFactory(id=matchid, **({"time": time} if time else {}))
+        livedata = (
+            FakeLiveDataFactory(matchid=matchid, **livedataargs)
+            if livedataargs
+            else None
+        )
+        return MatchState(match=match, livedata=livedata)
+
+    return factory
+
+
+@pytest.fixture
+def board(StateFactory: StateFactoryType, now: datetime) -> Board[FakeLiveData]:
+    return Board[FakeLiveData](
+        [
+            StateFactory("1-1", time=now + timedelta(hours=1)),
+            StateFactory("1-2", time=now),
+            StateFactory(
+                "1-3",
+                court=7,
+                deviceid="dev7",
+                status=LiveStatus.ONGOING,
+                starttime=now,
+            ),
+            StateFactory(
+                "1-4",
+                court=8,
+                deviceid="dev8",
+                status=LiveStatus.FINISHED,
+                endtime=now + timedelta(minutes=5),
+            ),
+            StateFactory(
+                "1-5",
+                court=7,
+                deviceid="dev5",
+                status=LiveStatus.FINISHED,
+                endtime=now,
+            ),
+        ]
+    )
+
+
+def _ids(matchstates: list[MatchState[FakeLiveData]]) -> list[str]:
+    return [m.match.id for m in matchstates]
+
+
+def test_lookup_by_match(board: Board[FakeLiveData]) -> None:
+    assert len(board) == 5
+    assert "1-3" in board
+    assert "2-1" not in board
+    assert (matchstate := board.get("1-3")) is not None
+    assert matchstate.match.id == "1-3"
+    assert board.get("2-1") is None
+    assert _ids(list(board)) == ["1-1", "1-2", "1-3", "1-4", "1-5"]
+
+
+def test_lookup_by_court(board: Board[FakeLiveData]) -> None:
+    assert _ids(board.on_court(7)) == ["1-3", "1-5"]
+    assert _ids(board.on_court(1)) == ["1-1", "1-2"]
+    assert board.on_court(9) == []
+    assert (current := board.current_on_court(7)) is not None
+    assert current.match.id == "1-3"
+    assert board.current_on_court(8) is None
+
+
+def test_lookup_by_device(board: Board[FakeLiveData]) -> None:
+    assert (matchstate := board.scored_by("dev8")) is not None
+    assert matchstate.match.id == "1-4"
+    assert board.scored_by("dev9") is None
+
+
+def test_sorted_slots(board: Board[FakeLiveData]) -> None:
+    assert _ids(board.in_slot(MatchSlot.PENDING)) == ["1-2", "1-1"]
+    assert _ids(board.in_slot(MatchSlot.CURRENT)) == ["1-3"]
+    assert _ids(board.in_slot(MatchSlot.FINISHED)) == ["1-5", "1-4"]
+    assert board.in_slot(MatchSlot.HIDDEN) == []
+
+
+def test_sorted_slot_none_last(StateFactory: StateFactoryType) -> None:
+    board = Board[FakeLiveData](
+        [StateFactory(f"1-{i}", status=LiveStatus.ONGOING) for i in (2, 1)]
+        + [StateFactory("1-3", status=LiveStatus.ONGOING, starttime=datetime.now())]
+    )
+    assert _ids(board.in_slot(MatchSlot.CURRENT)) == ["1-3", "1-1", "1-2"]
+
+
+def test_receive_livedata_moves_slot(
+    board: Board[FakeLiveData],
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    now: datetime,
+) -> None:
+    livedata = FakeLiveDataFactory(
+        court=7,
+        matchid="1-3",
+        deviceid="dev7",
+        status=LiveStatus.FINISHED,
+        endtime=now + timedelta(minutes=1),
+    )
+    assert (matchstate := board.receive_livedata(livedata)) is not None
+    assert matchstate.livedata is livedata
+    assert board.in_slot(MatchSlot.CURRENT) == []
+    assert _ids(board.in_slot(MatchSlot.FINISHED)) == ["1-5", "1-3", "1-4"]
+    assert board.current_on_court(7) is None
+    assert board.scored_by("dev7") is matchstate
+
+
+def test_receive_livedata_starts_match(
+    board: Board[FakeLiveData], FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    livedata = FakeLiveDataFactory(
+        court=3, matchid="1-2", deviceid="dev3", status=LiveStatus.WARMUP
+    )
+    matchstate = board.receive_livedata(livedata)
+    assert _ids(board.in_slot(MatchSlot.PENDING)) == ["1-1"]
+    assert _ids(board.in_slot(MatchSlot.CURRENT)) == ["1-3", "1-2"]
+    assert _ids(board.on_court(1)) == ["1-1"]
+    assert board.current_on_court(3) is matchstate
+    assert board.scored_by("dev3") is matchstate
+
+
+def test_receive_livedata_unchanged_index(
+    board: Board[FakeLiveData],
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    now: datetime,
+) -> None:
+    livedata = FakeLiveDataFactory(
+        court=7,
+        matchid="1-3",
+        deviceid="dev7",
+        status=LiveStatus.GAMEBALL,
+        starttime=now,
+    )
+    assert board.receive_livedata(livedata) is board.current_on_court(7)
+    assert _ids(board.in_slot(MatchSlot.CURRENT)) == ["1-3"]
+
+
+def test_receive_livedata_refused(
+    board: Board[FakeLiveData], FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    livedata = FakeLiveDataFactory(
+        court=8, matchid="1-3", deviceid="dev7", status=LiveStatus.FINISHED
+    )
+    with pytest.raises(CourtMismatchError):
+        board.receive_livedata(livedata)
+    assert _ids(board.in_slot(MatchSlot.CURRENT)) == ["1-3"]
+    assert _ids(board.on_court(7)) == ["1-3", "1-5"]
+
+
+def test_receive_livedata_unknown_match(
+    board: Board[FakeLiveData],
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    assert board.receive_livedata(FakeLiveDataFactory(matchid="2-1")) is None
+    assert "not on the board" in caplog.text
+
+
+def test_update_after_direct_change(board: Board[FakeLiveData]) -> None:
+    matchstate = board.get("1-4")
+    assert matchstate is not None
+    matchstate.reset()
+    board.update(matchstate)
+    assert _ids(board.in_slot(MatchSlot.PENDING)) == ["1-2", "1-4", "1-1"]
+    assert _ids(board.in_slot(MatchSlot.FINISHED)) == ["1-5"]
+    assert _ids(board.on_court(1)) == ["1-1", "1-2", "1-4"]
+    assert board.on_court(8) == []
+    assert board.scored_by("dev8") is None
+
+
+def test_second_current_on_court_takes_over(
+    board: Board[FakeLiveData], StateFactory: StateFactoryType
+) -> None:
+    other = StateFactory("1-6", court=7, deviceid="dev6", status=LiveStatus.WARMUP)
+    board.add(other)
+    assert board.current_on_court(7) is other
+    board.remove("1-6")
+    assert (current := board.current_on_court(7)) is not None
+    assert current.match.id == "1-3"
+
+
+def test_add_replaces(
+    board: Board[FakeLiveData], StateFactory: StateFactoryType
+) -> None:
+    replacement = StateFactory("1-4")
+    board.add(replacement)
+    assert len(board) == 5
+    assert board.get("1-4") is replacement
+    assert board.scored_by("dev8") is None
+    assert _ids(board.in_slot(MatchSlot.FINISHED)) == ["1-5"]
+
+
+def test_remove(board: Board[FakeLiveData]) -> None:
+    matchstate = board.remove("1-3")
+    assert matchstate.match.id == "1-3"
+    assert "1-3" not in board
+    assert board.current_on_court(7) is None
+    assert board.scored_by("dev7") is None
+    assert board.in_slot(MatchSlot.CURRENT) == []
+    with pytest.raises(KeyError):
+        board.remove("1-3")
+
+
+def test_match_without_court(MatchFactory: MatchFactoryType) -> None:
+    matchstate = MatchState[FakeLiveData](match=MatchFactory(court=None))
+    board = Board[FakeLiveData]([matchstate])
+    assert board.on_court(None) == [matchstate]
+
+
+def test_dump_json(board: Board[FakeLiveData]) -> None:
+    dump = json.loads(board.dump_json())
+    assert [ms["match"]["id"] for ms in dump] == [ms.match.id for ms in board]
+
+
+def test_dump_json_slot(board: Board[FakeLiveData]) -> None:
+    dump = json.loads(board.dump_json(MatchSlot.FINISHED, include={"match"}))
+    assert [ms["match"]["id"] for ms in dump] == ["1-5", "1-4"]
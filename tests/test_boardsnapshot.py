@@ -0,0 +1,28 @@
+import pytest
+
+from tcboard.boardsnapshot import BoardSnapshot
+from tcboard.livestatus import LiveStatus
+
+from .conftest import (
+    FakeLiveData,
+    MatchStateFactoryType,
+)
+
+
+@pytest.fixture
+def snapshot(
+    MatchStateFactory: MatchStateFactoryType,
+) -> BoardSnapshot[FakeLiveData]:
+    matchstate = MatchStateFactory(court=1, matchid="42-1", status=LiveStatus.WARMUP)
+    matchstate.lock()
+    return BoardSnapshot[FakeLiveData](matchstates=[matchstate], livedata_id=42)
+
+
+def test_timestamp_default() -> None:
+    assert BoardSnapshot[FakeLiveData]().timestamp is not None
+
+
+def test_roundtrip_json(snapshot: BoardSnapshot[FakeLiveData]) -> None:
+    restored = BoardSnapshot[FakeLiveData].model_validate_json(snapshot.dump_json())
+    assert restored == snapshot
+    assert restored.matchstates[0].locked
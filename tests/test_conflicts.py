@@ -0,0 +1,67 @@
+import pytest
+
+from tcboard.conflicts import Conflict, ConflictTracker
+
+
+def test_single_conflict_ignored() -> None:
+    assert ConflictTracker().record("stray", now=0) == Conflict.IGNORE
+
+
+def test_repeated_conflict_alerts_once_then_accepted() -> None:
+    tracker = ConflictTracker(alert_after=2, accept_after=4)
+    decisions = [tracker.record("stray", now=t) for t in range(5)]
+    assert decisions == [
+        Conflict.IGNORE,
+        Conflict.ALERT,
+        Conflict.IGNORE,
+        Conflict.ACCEPT,
+        Conflict.IGNORE,
+    ]
+
+
+def test_conflicts_counted_by_fingerprint() -> None:
+    tracker = ConflictTracker(alert_after=2)
+    assert tracker.record("one", now=0) == Conflict.IGNORE
+    assert tracker.record("two", now=1) == Conflict.IGNORE
+    assert tracker.record("one", now=2) == Conflict.ALERT
+    assert len(tracker) == 3
+
+
+def test_conflicts_decay() -> None:
+    tracker = ConflictTracker(alert_after=2, window=10)
+    assert tracker.record("stray", now=0) == Conflict.IGNORE
+    assert tracker.record("stray", now=11) == Conflict.IGNORE
+    assert len(tracker) == 1
+
+
+def test_ring_bounded() -> None:
+    tracker = ConflictTracker(alert_after=2, accept_after=3, size=3)
+    for n, fingerprint in enumerate(("stray", "a", "b", "c", "stray")):
+        assert tracker.record(fingerprint, now=n) == Conflict.IGNORE
+    assert len(tracker) == 3
+
+
+def test_clear() -> None:
+    tracker = ConflictTracker(alert_after=2)
+    tracker.record("stray")
+    tracker.clear()
+    assert len(tracker) == 0
+    assert tracker.record("stray") == Conflict.IGNORE
+
+
+@pytest.mark.parametrize(
+    "alert_after, accept_after, size",
+    [(0, 1, 1), (3, 2, 4), (2, 5, 4)],
+)
+def test_invalid_thresholds(alert_after: int, accept_after: int, size: int) -> None:
+    with pytest.raises(ValueError, match="thresholds"):
+        ConflictTracker(alert_after=alert_after, accept_after=accept_after, size=size)
+
+
+def test_conflicts_decay_one_by_one() -> None:
+    tracker = ConflictTracker(alert_after=2, accept_after=3, window=10)
+    assert tracker.record("stray", now=0) == Conflict.IGNORE
+    assert tracker.record("stray", now=5) == Conflict.ALERT
+    # the first has decayed, so this one does not make for acceptance
+    assert tracker.record("stray", now=12) == Conflict.ALERT
+    assert len(tracker) == 2
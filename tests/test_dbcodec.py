@@ -0,0 +1,61 @@
+import sys
+
+import pytest
+
+from tcboard.dbcodec import ZDICT_MAX_SIZE, Codec, ZlibCodec
+
+DATA = b'{"score":[["R1--","--L1","-2R-","L2--"]],"result":"0-0"}' * 10
+
+
+def test_get_registered() -> None:
+    assert isinstance(Codec.get("zlib"), ZlibCodec)
+
+
+def test_get_unknown() -> None:
+    with pytest.raises(ValueError, match="Storage codec not known"):
+        Codec.get("nosuchcodec")
+
+
+@pytest.mark.parametrize("name", ["zlib+squore1", "zlib+squore2"])
+def test_get_builtin_not_yet_imported(
+    name: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(Codec, "_registry", {})
+    monkeypatch.delitem(sys.modules, "tcboard.ext.squore.dbcodec", raising=False)
+    assert Codec.get(name).name == name
+
+
+def test_register() -> None:
+    codec = ZlibCodec("zlib+test")
+    codec.register()
+    assert Codec.get("zlib+test") is codec
+
+
+@pytest.mark.parametrize(
+    "codec",
+    [
+        ZlibCodec(),
+        ZlibCodec(level=1),
+        ZlibCodec(zdict=DATA),
+        ZlibCodec.from_samples("zlib+samples", [DATA, DATA]),
+    ],
+)
+def test_roundtrip(codec: Codec) -> None:
+    encoded = codec.encode(DATA)
+    assert len(encoded) < len(DATA)
+    assert codec.decode(encoded) == DATA
+
+
+def test_zdict_helps() -> None:
+    assert len(ZlibCodec(zdict=DATA).encode(DATA)) < len(ZlibCodec().encode(DATA))
+
+
+def test_zdict() -> None:
+    assert ZlibCodec().zdict is None
+    assert ZlibCodec(zdict=DATA).zdict == DATA
+
+
+def test_zdict_truncated() -> None:
+    codec = ZlibCodec(zdict=b"x" * (2 * ZDICT_MAX_SIZE) + DATA)
+    assert codec.decode(codec.encode(DATA)) == DATA
+    assert len(codec.encode(DATA)) < len(ZlibCodec().encode(DATA))
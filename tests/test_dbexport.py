@@ -0,0 +1,107 @@
+import gzip
+import io
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+import zstandard
+from tptools import Tournament
+
+from tcboard.dbexport import (
+    Compression,
+    import_ndjson,
+    iter_export,
+    iter_ndjson,
+    open_ndjson,
+)
+from tcboard.dbmanager import DBManager
+
+from .conftest import FakeLiveDataFactoryType
+
+
+@pytest_asyncio.fixture
+async def populated(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> AsyncGenerator[DBManager]:
+    async with DBManager(file=None, codec="zlib", delta_keyframe_interval=2) as db:
+        await db.init_tables()
+        await db.record_tournament(Tournament(name="Ünïcode Open"))
+        for i in range(5):
+            await db.record_livedata(
+                FakeLiveDataFactory(court=1, matchid="42-1", seq=i)
+            )
+        yield db
+
+
+async def _export(db: DBManager, compression: Compression) -> bytes:
+    return b"".join([chunk async for chunk in iter_export(db, compression)])
+
+
+async def _all_records(db: DBManager) -> list[tuple[str, str]]:
+    return [
+        (r["type"], r["data"])
+        async for r in db.get_all_tournament_and_livedata_records()
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_lines(populated: DBManager) -> None:
+    lines = [line async for line in iter_ndjson(populated)]
+    assert len(lines) == 6
+    assert all(line.endswith(b"\n") and line.count(b"\n") == 1 for line in lines)
+    assert lines[0].startswith(b'{"timestamp":"')
+
+
+@pytest.mark.parametrize(
+    "compression, decompress",
+    [
+        ("gzip", gzip.decompress),
+        ("zstd", lambda d: zstandard.ZstdDecompressor().decompressobj().decompress(d)),
+        (None, lambda d: d),
+    ],
+)
+@pytest.mark.asyncio
+async def test_export_compression(
+    populated: DBManager, compression: Compression, decompress: object
+) -> None:
+    plain = b"".join([line async for line in iter_ndjson(populated)])
+    assert decompress(await _export(populated, compression)) == plain  # type: ignore[operator]
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd", None])
+@pytest.mark.asyncio
+async def test_roundtrip(populated: DBManager, compression: Compression) -> None:
+    dump = await _export(populated, compression)
+    async with DBManager(file=None) as db:
+        await db.init_tables()
+        assert await import_ndjson(db, io.BytesIO(dump), batch_size=4) == 6
+        assert await _all_records(db) == await _all_records(populated)
+
+
+@pytest.mark.asyncio
+async def test_open_ndjson_buffered(populated: DBManager) -> None:
+    dump = await _export(populated, None)
+    buffered = io.BufferedReader(io.BytesIO(dump))
+    assert open_ndjson(buffered) is buffered
+
+
+@pytest.mark.asyncio
+async def test_import_skips_blank_lines(dbmanager_inited: DBManager) -> None:
+    dump = b'\n{"timestamp":"2026-01-01 10:00:00.000","type":"board","data":{}}\n\n'
+    assert await import_ndjson(dbmanager_inited, io.BytesIO(dump)) == 1
+
+
+@pytest.mark.parametrize(
+    "line, match",
+    [
+        (b"not json", "line 1"),
+        (b'{"timestamp":"2026-01-01 10:00:00.000","data":{}}', "line 1"),
+        (b'{"timestamp":"2026-01-01","type":"nosuchtable","data":{}}', "Unknown"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_import_invalid(
+    dbmanager_inited: DBManager, line: bytes, match: str
+) -> None:
+    with pytest.raises(ValueError, match=match):
+        await import_ndjson(dbmanager_inited, io.BytesIO(line))
@@ -1,14 +1,37 @@
+import asyncio
+import logging
+import pathlib
+import sqlite3
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime, timedelta, timezone
+from typing import Any, cast
+
 import pytest
+import pytest_asyncio
 from pydantic import BaseModel
-from tptools import Tournament
+from tptools import Court, Draw, Entry, Tournament
 
-from tcboard.dbmanager import TABLENAMES, DBManager
+from tcboard.boardsnapshot import BoardSnapshot
+from tcboard.dbmanager import (
+    _ALL_RECORDS_SQL,
+    _LATEST_LIVEDATA_SQL,
+    PROFILES,
+    TABLENAMES,
+    DBManager,
+    DBProfile,
+    RetentionPolicy,
+    _history_sql,
+)
 from tcboard.livedata import LiveData
 from tcboard.livestatus import LiveStatus
+from tcboard.match import TCMatch
+from tcboard.matchslot import MatchSlot
+from tcboard.offload import OffloadService
 
 from .conftest import (
     FakeLiveData,
     FakeLiveDataFactoryType,
+    MatchStateFactoryType,
 )
 
 
@@ -53,6 +76,65 @@ async def test_init_tables_idempotent(
         raise AssertionError(f"Query of table {tablename} returned no results")
 
 
+@pytest.mark.asyncio
+async def test_generated_columns(
+    dbmanager_inited: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    await dbmanager_inited.record_livedata(
+        FakeLiveDataFactory(
+            court=7, matchid="one", deviceid="dev", status=LiveStatus.ONGOING
+        )
+    )
+    curs = await dbmanager_inited.execute(
+        "select matchid, court, deviceid, status from squorelivedata"
+    )
+    assert [dict(r) for r in await curs.fetchall()] == [
+        {"matchid": "one", "court": 7, "deviceid": "dev", "status": "ONGOING"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_indexes(dbmanager_inited: DBManager) -> None:
+    curs = await dbmanager_inited.execute(
+        "select name from sqlite_master where type = 'index'"
+    )
+    names = {row["name"] for row in await curs.fetchall()}
+    for col in ("matchid", "court", "deviceid", "status"):
+        assert f"squorelivedata_{col}_idx" in names
+
+
+@pytest.mark.asyncio
+async def test_migrate_table_without_generated_columns(
+    dbmanager: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    await dbmanager.execute(
+        "create table squorelivedata ("
+        "id integer primary key, "
+        "timestamp timestamp not null default(strftime('%F %H:%M:%f')), "
+        "data json not null check (like('{%}', data)))"
+    )
+    json = FakeLiveDataFactory(matchid="one").model_dump_json(round_trip=True)
+    await dbmanager.execute(
+        "insert into squorelivedata (id, data) values (42, :json)", {"json": json}
+    )
+
+    await dbmanager.init_tables()
+
+    curs = await dbmanager.execute("select id, matchid, data from squorelivedata")
+    assert [dict(r) for r in await curs.fetchall()] == [
+        {"id": 42, "matchid": "one", "data": json}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_last_livedata_uses_index(dbmanager_inited: DBManager) -> None:
+    curs = await dbmanager_inited.execute(f"explain query plan {_LATEST_LIVEDATA_SQL}")
+    plan = [row["detail"] for row in await curs.fetchall()]
+    # the only full scans are of the recursive CTE, i.e. one row per match:
+    assert not [p for p in plan if p.startswith(("SCAN l", "SCAN s", "SCAN sq"))]
+    assert any("squorelivedata_matchid_idx" in p for p in plan)
+
+
 @pytest.mark.parametrize("tablename", TABLENAMES)
 @pytest.mark.asyncio
 async def test_insert_json_record(tablename: str, dbmanager_inited: DBManager) -> None:
@@ -73,6 +155,22 @@ async def test_record_livedata(
     assert await dbmanager_inited.record_livedata(FakeLiveDataFactory()) == 1
 
 
+@pytest.mark.asyncio
+async def test_record_tournament_offloaded(match: TCMatch) -> None:
+    tournament = Tournament[Entry, Draw, Court, TCMatch](
+        name="offloaded", matches={match.id: match}
+    )
+    async with (
+        OffloadService(max_workers=1) as offload,
+        DBManager(file=None, offload=offload) as db,
+    ):
+        await db.init_tables()
+        assert await db.insert_json_record("tournament", tournament) == 1
+        assert await db.get_latest_tournament_json() == tournament.model_dump_json(
+            round_trip=True
+        )
+
+
 @pytest.mark.asyncio
 async def test_get_last_tournament_empty(dbmanager_inited: DBManager) -> None:
     tourn = await dbmanager_inited.get_latest_tournament_json()
@@ -127,3 +225,982 @@ async def test_get_all_tournament_and_livedata_records(
 
     assert len([r for r in ret if r["type"] == "squorelivedata"]) == 2 * 3
     assert len([r for r in ret if r["type"] == "tournament"]) == 2
+
+
+@pytest_asyncio.fixture
+async def dbmanager_writebehind() -> AsyncGenerator[DBManager]:
+    async with DBManager(
+        file=None, write_behind=True, batch_size=100, batch_latency=0.001
+    ) as db:
+        await db.init_tables()
+        yield db
+
+
+@pytest.mark.asyncio
+async def test_write_behind_returns_ids_in_order(
+    dbmanager_writebehind: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    ids = await asyncio.gather(
+        *(
+            dbmanager_writebehind.record_livedata(FakeLiveDataFactory(matchid=str(i)))
+            for i in range(250)
+        )
+    )
+    assert ids == list(range(1, 251))
+
+    curs = await dbmanager_writebehind.execute(
+        "select id, data->>'_matchid' as matchid from squorelivedata"
+    )
+    assert {r["id"]: r["matchid"] for r in await curs.fetchall()} == {
+        i + 1: str(i) for i in range(250)
+    }
+
+
+@pytest.mark.asyncio
+async def test_write_behind_batches(
+    dbmanager_writebehind: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    await asyncio.gather(
+        *(
+            dbmanager_writebehind.record_livedata(FakeLiveDataFactory())
+            for _ in range(250)
+        ),
+        dbmanager_writebehind.record_tournament(Tournament()),
+    )
+    stats = dbmanager_writebehind.write_stats
+    assert stats.records == 251
+    assert 3 <= stats.flushes < 251
+    assert stats.max_flush_latency >= stats.last_flush_latency > 0
+    assert dbmanager_writebehind.write_queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_write_behind_waits_for_latency_window(
+    dbmanager_writebehind: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    assert await dbmanager_writebehind.record_livedata(FakeLiveDataFactory()) == 1
+    assert dbmanager_writebehind.write_stats.last_flush_size == 1
+
+
+@pytest.mark.asyncio
+async def test_write_behind_failure_propagates(
+    dbmanager_writebehind: DBManager,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    class EmptyModel(BaseModel): ...
+
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        await dbmanager_writebehind.insert_json_record("nosuchtable", EmptyModel())
+
+    assert await dbmanager_writebehind.record_livedata(FakeLiveDataFactory()) == 1
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_on_exit(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    async with DBManager(file=None, write_behind=True, batch_latency=1) as db:
+        await db.init_tables()
+        tasks = [
+            asyncio.create_task(db.record_livedata(FakeLiveDataFactory()))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+
+    assert [t.result() for t in tasks] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_without_latency_window(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    async with DBManager(file=None, write_behind=True, batch_latency=0) as db:
+        await db.init_tables()
+        assert await db.record_livedata(FakeLiveDataFactory()) == 1
+        assert db.write_stats.flushes == 1
+
+
+def test_unknown_profile() -> None:
+    with pytest.raises(ValueError, match="Unknown database profile"):
+        DBManager(file=None, profile="nosuchprofile")
+
+
+@pytest.mark.asyncio
+async def test_default_profile_settings(dbmanager: DBManager) -> None:
+    assert dbmanager.settings == {"journal_mode": "memory", "synchronous": 2}
+
+
+@pytest.mark.asyncio
+async def test_performance_profile(tmp_path: pathlib.Path) -> None:
+    async with DBManager(file=tmp_path / "db.sqlite", profile="performance") as db:
+        assert db.settings == {
+            "journal_mode": "wal",
+            "synchronous": 1,
+            "mmap_size": PROFILES["performance"].mmap_size,
+            "cache_size": PROFILES["performance"].cache_size,
+            "temp_store": 2,
+        }
+
+
+@pytest.mark.asyncio
+async def test_profile_checkpoints(
+    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    profile = DBProfile(journal_mode="wal", checkpoint_interval=0.001)
+    with caplog.at_level(logging.DEBUG, logger="tcboard.dbmanager"):
+        async with DBManager(file=tmp_path / "db.sqlite", profile=profile) as db:
+            await db.init_tables()
+            await asyncio.sleep(0.05)
+
+    assert "WAL checkpoint of" in caplog.text
+
+
+@pytest_asyncio.fixture
+async def dbmanager_pooled(tmp_path: pathlib.Path) -> AsyncGenerator[DBManager]:
+    async with DBManager(
+        file=tmp_path / "db.sqlite", profile="performance", read_pool_size=2
+    ) as db:
+        await db.init_tables()
+        yield db
+
+
+@pytest.mark.asyncio
+async def test_query_not_connected() -> None:
+    dbmanager = DBManager(file=None)
+    with pytest.raises(RuntimeError, match="Database is not connected"):
+        async with dbmanager.query("select 1"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_read_pool_is_read_only(dbmanager_pooled: DBManager) -> None:
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        async with dbmanager_pooled.query("insert into board (data) values ('{}')"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_read_pool_sees_writes(
+    dbmanager_pooled: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    await dbmanager_pooled.record_tournament(Tournament(name="one"))
+    assert await dbmanager_pooled.get_latest_tournament_json() is not None
+
+
+@pytest.mark.asyncio
+async def test_read_pool_does_not_block_writes(
+    dbmanager_pooled: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    for matchid in ("one", "two", "three"):
+        await dbmanager_pooled.record_livedata(FakeLiveDataFactory(matchid=matchid))
+
+    replay = dbmanager_pooled.get_all_tournament_and_livedata_records()
+    first = await anext(replay)
+    # while the replay holds a reader, writes and other readers proceed:
+    assert await dbmanager_pooled.record_livedata(FakeLiveDataFactory()) == 4
+    latest = [
+        j async for j in dbmanager_pooled.get_latest_livedata_json_for_each_match()
+    ]
+    assert len(latest) == 4
+    rest = [r async for r in replay]
+    assert len([first, *rest]) == 3
+
+
+@pytest.mark.asyncio
+async def test_latest_livedata_releases_reader(
+    tmp_path: pathlib.Path, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    async with DBManager(
+        file=tmp_path / "db.sqlite", profile="performance", read_pool_size=1
+    ) as db:
+        await db.init_tables()
+        await db.record_tournament(Tournament(name="one"))
+        for matchid in ("one", "two"):
+            await db.record_livedata(FakeLiveDataFactory(matchid=matchid))
+
+        async def consume() -> int:
+            count = 0
+            async for _ in db.get_latest_livedata_json_for_each_match():
+                # with the only reader held by the iterator, this would hang:
+                assert await db.get_latest_tournament_json() is not None
+                count += 1
+            return count
+
+        assert await asyncio.wait_for(consume(), timeout=5) == 2
+
+
+@pytest.mark.asyncio
+async def test_read_pool_in_memory_falls_back(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    async with DBManager(file=None, read_pool_size=2) as db:
+        await db.init_tables()
+        assert await db.get_latest_tournament_json() is None
+
+    assert "not using a read pool" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_read_pool_warns_without_wal(
+    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    async with DBManager(file=tmp_path / "db.sqlite", read_pool_size=1):
+        pass
+
+    assert "not in WAL mode" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_profile_checkpoint_skipped_while_statement_active(
+    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    profile = DBProfile(journal_mode="wal", checkpoint_interval=0.001)
+    with caplog.at_level(logging.DEBUG, logger="tcboard.dbmanager"):
+        async with DBManager(file=tmp_path / "db.sqlite", profile=profile) as db:
+            await db.init_tables()
+            for _ in range(2):
+                await db.execute("insert into board (data) values ('{}')")
+            async with db.execute("select * from board") as cursor:
+                await cursor.fetchone()
+                await asyncio.sleep(0.05)
+
+    assert "skipped" in caplog.text
+
+
+def test_unknown_codec() -> None:
+    with pytest.raises(ValueError, match="Storage codec not known"):
+        DBManager(file=None, codec="nosuchcodec")
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+@pytest.mark.asyncio
+async def test_codec_roundtrip(
+    write_behind: bool, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    livedata = FakeLiveDataFactory(court=3, matchid="one", deviceid="dev")
+    async with DBManager(file=None, codec="zlib", write_behind=write_behind) as db:
+        await db.init_tables()
+        await db.record_tournament(Tournament(name="one"))
+        await db.record_livedata(livedata)
+
+        curs = await db.execute(
+            "select matchid, court, deviceid, codec, data from squorelivedata"
+        )
+        row = await curs.fetchone()
+        assert row is not None
+        assert (row["matchid"], row["court"], row["deviceid"]) == ("one", 3, "dev")
+        assert row["codec"] == "zlib"
+        assert "fakedata" not in row["data"]
+
+        json = await db.get_latest_tournament_json()
+        assert json is not None
+        assert Tournament.model_validate_json(json).name == "one"
+
+        latest = [j async for j in db.get_latest_livedata_json_for_each_match()]
+        assert [FakeLiveData.make_model_instance_json(j) for j in latest] == [livedata]
+
+        records = [r async for r in db.get_all_tournament_and_livedata_records()]
+        assert sorted(r["data"] for r in records) == sorted(
+            [json, livedata.model_dump_json(round_trip=True)]
+        )
+
+
+@pytest.mark.asyncio
+async def test_codec_reads_plain_records(tmp_path: pathlib.Path) -> None:
+    file = tmp_path / "db.sqlite"
+    async with DBManager(file=file) as db:
+        await db.init_tables()
+        await db.record_tournament(Tournament(name="plain"))
+
+    async with DBManager(file=file, codec="zlib") as db:
+        await db.record_tournament(Tournament(name="compressed"))
+        records = [r async for r in db.get_all_tournament_and_livedata_records()]
+
+    assert {Tournament.model_validate_json(r["data"]).name for r in records} == {
+        "plain",
+        "compressed",
+    }
+
+
+def test_delta_keyframe_interval_invalid() -> None:
+    with pytest.raises(ValueError, match="must be positive"):
+        DBManager(file=None, delta_keyframe_interval=0)
+
+
+def _delta_livedata(
+    FakeLiveDataFactory: FakeLiveDataFactoryType, count: int
+) -> list[FakeLiveData]:
+    return [
+        FakeLiveDataFactory(court=1, matchid=matchid, points=list(range(i)))
+        for i in range(count)
+        for matchid in ("one", "two")
+    ]
+
+
+@pytest.mark.parametrize("codec", [None, "zlib"])
+@pytest.mark.parametrize("write_behind", [False, True])
+@pytest.mark.asyncio
+async def test_delta_roundtrip(
+    codec: str | None,
+    write_behind: bool,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    livedata = _delta_livedata(FakeLiveDataFactory, 7)
+    async with DBManager(
+        file=None, codec=codec, write_behind=write_behind, delta_keyframe_interval=3
+    ) as db:
+        await db.init_tables()
+        ids = [await db.record_livedata(ld) for ld in livedata]
+
+        curs = await db.execute(
+            "select matchid, delta from squorelivedata where matchid = 'one'"
+        )
+        assert [r["delta"] for r in await curs.fetchall()] == [0, 1, 2, 0, 1, 2, 0]
+
+        for rowid, ld in zip(ids, livedata, strict=True):
+            assert rowid is not None
+            json = await db.get_livedata_json(rowid)
+            assert json is not None
+            assert FakeLiveData.make_model_instance_json(json) == ld
+
+        latest = [j async for j in db.get_latest_livedata_json_for_each_match()]
+        assert sorted(
+            FakeLiveData.make_model_instance_json(j).matchid for j in latest
+        ) == ["one", "two"]
+        assert all(
+            FakeLiveData.make_model_instance_json(j) in livedata[-2:] for j in latest
+        )
+
+        records = [r async for r in db.get_all_tournament_and_livedata_records()]
+        assert [
+            FakeLiveData.make_model_instance_json(r["data"]) for r in records
+        ] == livedata
+
+
+@pytest.mark.asyncio
+async def test_delta_get_livedata_json_unknown_id(dbmanager_inited: DBManager) -> None:
+    assert await dbmanager_inited.get_livedata_json(42) is None
+
+
+@pytest.mark.asyncio
+async def test_delta_all_records_out_of_order(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    livedata = _delta_livedata(FakeLiveDataFactory, 3)
+    async with DBManager(file=None, delta_keyframe_interval=10) as db:
+        await db.init_tables()
+        for ld in livedata:
+            await db.record_livedata(ld)
+        # make the second delta of each match sort before its predecessor
+        await db.execute(
+            "update squorelivedata set timestamp = '2000-01-01' where delta = 2"
+        )
+        records = [r async for r in db.get_all_tournament_and_livedata_records()]
+
+    assert sorted((r["data"] for r in records), key=len) == sorted(
+        (ld.model_dump_json(round_trip=True) for ld in livedata), key=len
+    )
+    assert [
+        FakeLiveData.make_model_instance_json(r["data"]) for r in records[:2]
+    ] == livedata[-2:]
+
+
+@pytest.mark.asyncio
+async def test_delta_broken_chain(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    livedata = _delta_livedata(FakeLiveDataFactory, 3)
+    async with DBManager(file=None, delta_keyframe_interval=10) as db:
+        await db.init_tables()
+        ids = [await db.record_livedata(ld) for ld in livedata]
+        await db.execute("delete from squorelivedata where id = :id", {"id": ids[2]})
+
+        assert ids[-2] is not None
+        with pytest.raises(RuntimeError, match="Broken delta chain"):
+            await db.get_livedata_json(ids[-2])
+
+
+@pytest.mark.asyncio
+async def test_delta_broken_chain_latest_skipped(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    livedata = _delta_livedata(FakeLiveDataFactory, 3)
+    async with DBManager(file=None, delta_keyframe_interval=10) as db:
+        await db.init_tables()
+        ids = [await db.record_livedata(ld) for ld in livedata]
+        await db.execute("delete from squorelivedata where id = :id", {"id": ids[2]})
+
+        latest = [j async for j in db.get_latest_livedata_json_for_each_match()]
+
+    assert [FakeLiveData.make_model_instance_json(j) for j in latest] == [livedata[-1]]
+    assert "Failed to read latest livedata for match one" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_delta_write_behind_failure_keeps_chains_intact(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    livedata = [
+        FakeLiveDataFactory(court=1, matchid="one", points=list(range(i)))
+        for i in range(6)
+    ]
+    async with DBManager(
+        file=None, write_behind=True, batch_size=1, delta_keyframe_interval=10
+    ) as db:
+        await db.init_tables()
+        insert_many = db._insert_many
+        calls = 0
+
+        async def failing_insert_many(*args: Any) -> list[int]:
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise sqlite3.OperationalError("disk I/O error")
+            return await insert_many(*args)
+
+        monkeypatch.setattr(db, "_insert_many", failing_insert_many)
+        # all queued before the writer gets to them
+        ids = await asyncio.gather(
+            *(db.record_livedata(ld) for ld in livedata), return_exceptions=True
+        )
+        assert isinstance(ids[2], sqlite3.OperationalError)
+
+        curs = await db.execute("select delta from squorelivedata order by id")
+        assert [r["delta"] for r in await curs.fetchall()] == [0, 1, 0, 1, 2]
+
+        for rowid, ld in zip(ids, livedata, strict=True):
+            if isinstance(rowid, int):
+                json = await db.get_livedata_json(rowid)
+                assert json is not None
+                assert FakeLiveData.make_model_instance_json(json) == ld
+
+        [latest] = [j async for j in db.get_latest_livedata_json_for_each_match()]
+        assert FakeLiveData.make_model_instance_json(latest) == livedata[-1]
+
+
+@pytest.mark.asyncio
+async def test_delta_keyframe_after_failed_write(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    livedata = _delta_livedata(FakeLiveDataFactory, 3)
+    async with DBManager(file=None, delta_keyframe_interval=10) as db:
+        await db.init_tables()
+        await db.record_livedata(livedata[0])
+        await db.execute("drop table squorelivedata")
+        with pytest.raises(sqlite3.OperationalError):
+            await db.record_livedata(livedata[2])
+
+        await db.init_tables()
+        await db.record_livedata(livedata[4])
+        curs = await db.execute("select delta from squorelivedata")
+        assert [r["delta"] for r in await curs.fetchall()] == [0]
+
+
+@pytest.mark.asyncio
+async def test_board_snapshot_restore_none(dbmanager_inited: DBManager) -> None:
+    assert await dbmanager_inited.restore_board_snapshot() is None
+
+
+@pytest.mark.parametrize("replay_batch_size", [1, 1000])
+@pytest.mark.parametrize("delta", [None, 2])
+@pytest.mark.asyncio
+async def test_board_snapshot_restore(
+    delta: int | None,
+    replay_batch_size: int,
+    tmp_path: pathlib.Path,
+    MatchStateFactory: MatchStateFactoryType,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        "tcboard.dbmanager._REPLAY_BATCH_SIZE", replay_batch_size, raising=True
+    )
+
+    def ld(status: LiveStatus) -> FakeLiveData:
+        return FakeLiveDataFactory(court=1, matchid="42-1", status=status)
+
+    file = tmp_path / "db.sqlite"
+    async with DBManager(file=file, delta_keyframe_interval=delta) as db:
+        await db.init_tables()
+        matchstate = MatchStateFactory(livedata=ld(LiveStatus.WARMUP))
+        await db.record_livedata(cast(FakeLiveData, matchstate.livedata))
+        matchstate.lock()
+        await db.record_board_snapshot([matchstate])
+        for status in (LiveStatus.ONGOING, LiveStatus.GAMEBALL):
+            await db.record_livedata(ld(status))
+
+    async with DBManager(file=file, delta_keyframe_interval=delta) as db:
+        board = await db.restore_board_snapshot()
+        assert board is not None
+        [restored] = board
+        assert restored.locked
+        assert restored.livedata is not None
+        assert restored.livedata.status == LiveStatus.GAMEBALL
+        assert board.current_on_court(1) is restored
+
+        # a snapshot taken now need not replay anything
+        await db.record_board_snapshot(board)
+        dump = await db.get_latest_board_snapshot_json()
+        assert dump is not None
+        assert BoardSnapshot[FakeLiveData].model_validate_json(dump).livedata_id == 3
+
+
+@pytest.mark.asyncio
+async def test_board_snapshot_restore_skips_refused(
+    dbmanager_inited: DBManager,
+    MatchStateFactory: MatchStateFactoryType,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    db = dbmanager_inited
+    await db.record_board_snapshot(
+        [MatchStateFactory(court=1, status=LiveStatus.WARMUP)]
+    )
+    for court, matchid, status in (
+        (2, "42-1", LiveStatus.ONGOING),
+        (1, "43-1", LiveStatus.ONGOING),
+        (1, "42-1", LiveStatus.FINISHED),
+    ):
+        await db.record_livedata(
+            FakeLiveDataFactory(court=court, matchid=matchid, status=status)
+        )
+
+    caplog.set_level(logging.DEBUG, logger="tcboard.dbmanager")
+    board = await db.restore_board_snapshot()
+    assert board is not None
+    assert "Not replaying livedata" in caplog.text
+    assert "not on the board" in caplog.text
+    # the indexes of the board follow the replayed livedata
+    [matchstate] = board
+    assert board.in_slot(MatchSlot.FINISHED) == [matchstate]
+    assert board.current_on_court(1) is None
+
+
+@pytest.mark.asyncio
+async def test_board_snapshot_keep(
+    dbmanager_inited: DBManager, MatchStateFactory: MatchStateFactoryType
+) -> None:
+    for _ in range(5):
+        await dbmanager_inited.record_board_snapshot([MatchStateFactory()], keep=2)
+    curs = await dbmanager_inited.execute("select id from board")
+    assert [r["id"] for r in await curs.fetchall()] == [4, 5]
+
+
+@pytest.mark.asyncio
+async def test_board_snapshot_keep_in_transaction(
+    dbmanager_writebehind: DBManager,
+    MatchStateFactory: MatchStateFactoryType,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # the writer's transactions must not take the deletion along
+    db = dbmanager_writebehind
+    execute = db.execute
+    locked: list[bool] = []
+
+    def spy(sql: str, params: dict[str, Any] | None = None) -> Any:
+        if sql.startswith("delete from board"):
+            locked.append(db._tx_lock.locked())
+        return execute(sql, params)
+
+    monkeypatch.setattr(db, "execute", spy)
+    await db.record_board_snapshot([MatchStateFactory()], keep=1)
+    assert locked == [True]
+
+
+@pytest.mark.asyncio
+async def test_board_snapshot_periodically(
+    dbmanager_inited: DBManager,
+    MatchStateFactory: MatchStateFactoryType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    task = asyncio.create_task(
+        dbmanager_inited.snapshot_board_periodically(
+            lambda: [MatchStateFactory()], interval=0.001
+        )
+    )
+    await asyncio.sleep(0.05)
+    assert await dbmanager_inited.get_latest_board_snapshot_json() is not None
+
+    await dbmanager_inited.execute("drop table board")
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert "Failed to record board snapshot" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "where, keys, index",
+    [
+        ("matchid = :matchid", ("id",), "matchid"),
+        ("deviceid = :deviceid", ("id",), "deviceid"),
+        ("court = :court", ("id",), "court"),
+        ("timestamp >= :start and timestamp < :end", ("timestamp", "id"), "timestamp"),
+    ],
+)
+@pytest.mark.parametrize("keyset", [False, True])
+@pytest.mark.parametrize("newest_first", [False, True])
+@pytest.mark.asyncio
+async def test_history_uses_index(
+    dbmanager_inited: DBManager,
+    where: str,
+    keys: tuple[str, ...],
+    index: str,
+    keyset: bool,
+    newest_first: bool,
+) -> None:
+    sql = _history_sql(where, keys, keyset=keyset, newest_first=newest_first)
+    params = dict.fromkeys(
+        ("matchid", "deviceid", "court", "start", "end", "page_size")
+        + tuple(f"after_{k}" for k in keys)
+    )
+    curs = await dbmanager_inited.execute(f"explain query plan {sql}", params)
+    plan = [row["detail"] for row in await curs.fetchall()]
+    assert any(f"squorelivedata_{index}_idx" in p for p in plan)
+    assert not any("TEMP B-TREE" in p for p in plan)
+
+
+@pytest_asyncio.fixture
+async def history(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> AsyncGenerator[tuple[DBManager, list[FakeLiveData]]]:
+    livedata = [
+        FakeLiveDataFactory(
+            court=i % 2, matchid=f"m{i % 3}", deviceid=f"d{i % 2}", seq=i
+        )
+        for i in range(12)
+    ]
+    async with DBManager(file=None, delta_keyframe_interval=4) as db:
+        await db.init_tables()
+        for i, ld in enumerate(livedata):
+            await db.record_livedata(ld)
+            await db.execute(
+                "update squorelivedata set timestamp = :ts where id = :id",
+                {"ts": f"2026-01-01 10:{i:02d}:00.000", "id": i + 1},
+            )
+        yield db, livedata
+
+
+def _seqs(records: list[dict[str, Any]]) -> list[int]:
+    return [
+        FakeLiveData.make_model_instance_json(r["data"]).fakedata["seq"]
+        for r in records
+    ]
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 100])
+@pytest.mark.parametrize("newest_first", [False, True])
+@pytest.mark.asyncio
+async def test_history_for_match_device_court(
+    history: tuple[DBManager, list[FakeLiveData]], page_size: int, newest_first: bool
+) -> None:
+    db, _ = history
+    kwargs: dict[str, Any] = {"page_size": page_size, "newest_first": newest_first}
+
+    def exp(seqs: list[int]) -> list[int]:
+        return seqs[::-1] if newest_first else seqs
+
+    records = [r async for r in db.get_livedata_for_match("m1", **kwargs)]
+    assert _seqs(records) == exp([1, 4, 7, 10])
+    records = [r async for r in db.get_livedata_for_device("d0", **kwargs)]
+    assert _seqs(records) == exp([0, 2, 4, 6, 8, 10])
+    records = [r async for r in db.get_livedata_for_court(1, **kwargs)]
+    assert _seqs(records) == exp([1, 3, 5, 7, 9, 11])
+
+
+@pytest.mark.parametrize("page_size", [1, 100])
+@pytest.mark.parametrize("newest_first", [False, True])
+@pytest.mark.parametrize("interval", [2, 3])
+@pytest.mark.asyncio
+async def test_history_across_keyframes(
+    interval: int,
+    newest_first: bool,
+    page_size: int,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    # the match changes device midway, and back
+    livedata = [
+        FakeLiveDataFactory(court=1, matchid="m", deviceid=deviceid, seq=i)
+        for i, deviceid in enumerate("ABBBA")
+    ]
+    kwargs: dict[str, Any] = {"page_size": page_size, "newest_first": newest_first}
+    async with DBManager(file=None, delta_keyframe_interval=interval) as db:
+        await db.init_tables()
+        for ld in livedata:
+            await db.record_livedata(ld)
+
+        start, end = datetime(2000, 1, 1), datetime(2100, 1, 1)
+        for history, expected in (
+            (db.get_livedata_for_match("m", **kwargs), livedata),
+            (db.get_livedata_for_device("A", **kwargs), livedata[::4]),
+            (db.get_livedata_for_device("B", **kwargs), livedata[1:4]),
+            (db.get_livedata_for_court(1, **kwargs), livedata),
+            (db.get_livedata_between(start, end, **kwargs), livedata),
+        ):
+            records = [r async for r in history]
+            assert [
+                FakeLiveData.make_model_instance_json(r["data"]) for r in records
+            ] == (expected[::-1] if newest_first else expected)
+
+
+@pytest.mark.asyncio
+async def test_history_resume_after(
+    history: tuple[DBManager, list[FakeLiveData]],
+) -> None:
+    db, _ = history
+    records = [r async for r in db.get_livedata_for_match("m2", page_size=2)]
+    rest = [r async for r in db.get_livedata_for_match("m2", after=records[1]["id"])]
+    assert rest == records[2:]
+    older = [
+        r
+        async for r in db.get_livedata_for_match(
+            "m2", after=records[2]["id"], newest_first=True
+        )
+    ]
+    assert older == records[1::-1]
+
+
+@pytest.mark.parametrize("page_size", [1, 3, 100])
+@pytest.mark.asyncio
+async def test_history_between(
+    history: tuple[DBManager, list[FakeLiveData]], page_size: int
+) -> None:
+    db, _ = history
+    start, end = datetime(2026, 1, 1, 10, 3), datetime(2026, 1, 1, 10, 7)
+    records = [
+        r async for r in db.get_livedata_between(start, end, page_size=page_size)
+    ]
+    assert _seqs(records) == [3, 4, 5, 6]
+
+    records = [
+        r
+        async for r in db.get_livedata_between(
+            start, end, after=(records[1]["timestamp"], records[1]["id"])
+        )
+    ]
+    assert _seqs(records) == [5, 6]
+
+
+@pytest.mark.asyncio
+async def test_history_between_timezone(
+    history: tuple[DBManager, list[FakeLiveData]],
+) -> None:
+    db, _ = history
+    tz = timezone(timedelta(hours=2))
+    start = datetime(2026, 1, 1, 12, 10, tzinfo=tz)
+    end = datetime(2026, 1, 1, 10, 11, tzinfo=UTC)
+    records = [r async for r in db.get_livedata_between(start, end, newest_first=True)]
+    assert _seqs(records) == [10]
+
+
+@pytest.mark.asyncio
+async def test_all_records_query_merges_without_sorting(
+    dbmanager_inited: DBManager,
+) -> None:
+    curs = await dbmanager_inited.execute(f"explain query plan {_ALL_RECORDS_SQL}")
+    plan = [row["detail"] for row in await curs.fetchall()]
+    assert not any("TEMP B-TREE" in p for p in plan)
+
+
+@pytest.mark.asyncio
+async def test_insert_json_records(dbmanager_inited: DBManager) -> None:
+    records = [
+        ("tournament", "2026-01-01 10:00:00.000", '{"name":"one"}'),
+        ("squorelivedata", "2026-01-01 10:00:01.000", '{"_matchid":"42-1"}'),
+        ("squorelivedata", "2026-01-01 10:00:02.000", '{"_matchid":"42-1"}'),
+    ]
+    assert await dbmanager_inited.insert_json_records(records) == 3
+    curs = await dbmanager_inited.execute(
+        "select timestamp, matchid from squorelivedata"
+    )
+    assert [(r["timestamp"], r["matchid"]) for r in await curs.fetchall()] == [
+        ("2026-01-01 10:00:01.000", "42-1"),
+        ("2026-01-01 10:00:02.000", "42-1"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_insert_json_records_rolls_back(dbmanager_inited: DBManager) -> None:
+    records = [
+        ("board", "2026-01-01 10:00:00.000", "{}"),
+        ("nosuchtable", "2026-01-01 10:00:01.000", "{}"),
+    ]
+    with pytest.raises(ValueError, match="Unknown table"):
+        await dbmanager_inited.insert_json_records(records)
+    curs = await dbmanager_inited.execute("select * from board")
+    assert await curs.fetchall() == []
+
+
+@pytest.mark.asyncio
+async def test_insert_json_records_write_behind(
+    dbmanager_writebehind: DBManager, livedata: LiveData
+) -> None:
+    record = ("board", "2026-01-01 10:00:00.000", "{}")
+    _, count, _ = await asyncio.gather(
+        dbmanager_writebehind.record_livedata(livedata),
+        dbmanager_writebehind.insert_json_records([record] * 10),
+        dbmanager_writebehind.record_livedata(livedata),
+    )
+    assert count == 10
+
+
+@pytest.mark.parametrize(
+    "policy, exp",
+    [
+        (RetentionPolicy(), [1, 2, 5, 6, 8]),
+        (RetentionPolicy(keep_first=False), [2, 5, 6, 8]),
+        (RetentionPolicy(keep_status_changes=False), [1, 8]),
+        (RetentionPolicy(keep_first=False, keep_status_changes=False), [8]),
+    ],
+)
+def test_retention_policy_select(policy: RetentionPolicy, exp: list[int]) -> None:
+    statuses = ["W", "O", "O", "O", "B", "O", "O", "F"]
+    rows = [{"id": i, "status": st} for i, st in enumerate(statuses, 1)]
+    assert sorted(policy.select(rows)) == exp  # type: ignore[arg-type]
+
+
+_FINISHED_MATCH = [
+    LiveStatus.WARMUP,
+    LiveStatus.ONGOING,
+    LiveStatus.ONGOING,
+    LiveStatus.ONGOING,
+    LiveStatus.BETWEENGAMES,
+    LiveStatus.ONGOING,
+    LiveStatus.ONGOING,
+    LiveStatus.FINISHED,
+]
+
+
+async def _record_matches(
+    db: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> tuple[list[FakeLiveData], list[int]]:
+    livedata = [
+        FakeLiveDataFactory(court=1, matchid="fin", status=status, seq=i)
+        for i, status in enumerate(_FINISHED_MATCH)
+    ] + [
+        FakeLiveDataFactory(court=2, matchid="live", status=LiveStatus.ONGOING, seq=i)
+        for i in range(5)
+    ]
+    ids = [cast(int, await db.record_livedata(ld)) for ld in livedata]
+    return livedata, ids
+
+
+async def _match_ids(db: DBManager, matchid: str) -> list[int]:
+    return [r["id"] async for r in db.get_livedata_for_match(matchid)]
+
+
+async def _backdate(db: DBManager) -> None:
+    # Timestamps have millisecond precision, so records just written may not yet
+    # be older than even min_age=0
+    await db.execute(
+        "update squorelivedata set timestamp = strftime('%F %H:%M:%f', timestamp, "
+        "'-1 minute')"
+    )
+
+
+@pytest.mark.parametrize("codec", [None, "zlib"])
+@pytest.mark.parametrize("delta", [None, 3])
+@pytest.mark.asyncio
+async def test_compact(
+    codec: str | None, delta: int | None, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    async with DBManager(file=None, codec=codec, delta_keyframe_interval=delta) as db:
+        await db.init_tables()
+        livedata, ids = await _record_matches(db, FakeLiveDataFactory)
+        await _backdate(db)
+        policy = RetentionPolicy(min_age=0, batch_size=2)
+
+        assert await db.compact(policy) == 3
+        assert await _match_ids(db, "fin") == [ids[i] for i in (0, 1, 4, 5, 7)]
+        assert await _match_ids(db, "live") == ids[8:]
+        for rowid, ld in zip(ids, livedata, strict=True):
+            if (json := await db.get_livedata_json(rowid)) is not None:
+                assert FakeLiveData.make_model_instance_json(json) == ld
+
+        assert await db.compact(policy) == 0
+
+        # the next record of the compacted match does not refer to deleted ones
+        rowid = cast(int, await db.record_livedata(livedata[7]))
+        curs = await db.execute(
+            "select delta from squorelivedata where id = :id", {"id": rowid}
+        )
+        assert (await curs.fetchone()) == {"delta": None if delta is None else 0}
+
+
+@pytest.mark.asyncio
+async def test_compact_min_age(
+    dbmanager_inited: DBManager, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    await _record_matches(dbmanager_inited, FakeLiveDataFactory)
+    assert await dbmanager_inited.compact() == 0
+
+
+@pytest.mark.asyncio
+async def test_compact_incremental_vacuum(
+    tmp_path: pathlib.Path, FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    async with DBManager(file=tmp_path / "db.sqlite") as db:
+        await db.init_tables()
+        for _ in range(200):
+            await db.record_livedata(
+                FakeLiveDataFactory(
+                    court=1, matchid="fin", status=LiveStatus.ONGOING, pad="x" * 500
+                )
+            )
+        await db.record_livedata(
+            FakeLiveDataFactory(court=1, matchid="fin", status=LiveStatus.FINISHED)
+        )
+        await _backdate(db)
+        async with db.execute("pragma page_count") as curs:
+            before = await curs.fetchone()
+
+        await db.compact(RetentionPolicy(min_age=0, vacuum_pages=10))
+
+        async with db.execute("pragma freelist_count") as curs:
+            assert await curs.fetchone() == {"freelist_count": 0}
+        async with db.execute("pragma page_count") as curs:
+            after = await curs.fetchone()
+        assert before is not None and after is not None
+        assert after["page_count"] < before["page_count"]
+
+
+@pytest.mark.asyncio
+async def test_compact_without_incremental_vacuum(
+    tmp_path: pathlib.Path,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    file = tmp_path / "db.sqlite"
+    with sqlite3.connect(file) as conn:
+        conn.execute("create table unrelated (id integer primary key)")
+    conn.close()
+
+    async with DBManager(file=file) as db:
+        await db.init_tables()
+        await _record_matches(db, FakeLiveDataFactory)
+        await _backdate(db)
+        with caplog.at_level(logging.INFO, logger="tcboard.dbmanager"):
+            assert await db.compact(RetentionPolicy(min_age=0)) == 3
+
+    assert "predates incremental auto-vacuum" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_compact_periodically(
+    FakeLiveDataFactory: FakeLiveDataFactoryType, caplog: pytest.LogCaptureFixture
+) -> None:
+    async with DBManager(
+        file=None, compaction_interval=0.001, retention=RetentionPolicy(min_age=0)
+    ) as db:
+        await db.init_tables()
+        _, ids = await _record_matches(db, FakeLiveDataFactory)
+        await _backdate(db)
+        await asyncio.sleep(0.05)
+        assert len(await _match_ids(db, "fin")) == 5
+
+        await db.execute("drop table squorelivedata")
+        await asyncio.sleep(0.05)
+
+    assert "Compaction of :memory: failed" in caplog.text
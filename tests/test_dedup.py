@@ -0,0 +1,105 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from tcboard.dedup import DuplicateFilter
+
+from .conftest import FakeLiveData, FakeLiveDataFactoryType
+
+
+def _raw(FakeLiveDataFactory: FakeLiveDataFactoryType, **data: str | datetime) -> bytes:
+    return FakeLiveDataFactory(**data).model_dump_json(round_trip=True).encode()
+
+
+def test_first_packet_not_duplicate(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    dedup = DuplicateFilter()
+    assert not dedup.is_duplicate(_raw(FakeLiveDataFactory, matchid="42-1"))
+    assert dedup.suppressed == 0
+
+
+def test_repeat_is_duplicate(FakeLiveDataFactory: FakeLiveDataFactoryType) -> None:
+    dedup = DuplicateFilter()
+    raw = _raw(FakeLiveDataFactory, matchid="42-1")
+    assert not dedup.is_duplicate(raw)
+    assert dedup.is_duplicate(raw)
+    assert dedup.is_duplicate(raw.decode())
+    assert dedup.suppressed == 2
+
+
+def test_repeat_with_other_timestamp_is_duplicate(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    dedup = DuplicateFilter()
+    assert not dedup.is_duplicate(_raw(FakeLiveDataFactory, matchid="42-1"))
+    assert dedup.is_duplicate(
+        _raw(FakeLiveDataFactory, matchid="42-1", timestamp=datetime(2026, 1, 1))
+    )
+
+
+def test_changed_packet_not_duplicate(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    dedup = DuplicateFilter()
+    assert not dedup.is_duplicate(_raw(FakeLiveDataFactory, matchid="42-1"))
+    assert not dedup.is_duplicate(
+        _raw(FakeLiveDataFactory, matchid="42-1", deviceid="other")
+    )
+    assert dedup.suppressed == 0
+
+
+def test_only_consecutive_repeats_are_duplicates(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    dedup = DuplicateFilter()
+    first = _raw(FakeLiveDataFactory, matchid="42-1", deviceid="a")
+    assert not dedup.is_duplicate(first)
+    assert not dedup.is_duplicate(
+        _raw(FakeLiveDataFactory, matchid="42-1", deviceid="a", x="y")
+    )
+    assert not dedup.is_duplicate(first)
+
+
+def test_matches_tracked_separately(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    dedup = DuplicateFilter()
+    one = _raw(FakeLiveDataFactory, matchid="42-1")
+    two = _raw(FakeLiveDataFactory, matchid="42-2")
+    for raw in (one, two):
+        assert not dedup.is_duplicate(raw)
+    for raw in (one, two):
+        assert dedup.is_duplicate(raw)
+
+
+def test_max_keys(FakeLiveDataFactory: FakeLiveDataFactoryType) -> None:
+    dedup = DuplicateFilter(max_keys=1)
+    one = _raw(FakeLiveDataFactory, matchid="42-1")
+    assert not dedup.is_duplicate(one)
+    assert not dedup.is_duplicate(_raw(FakeLiveDataFactory, matchid="42-2"))
+    assert not dedup.is_duplicate(one)
+
+
+def test_ingest_json(FakeLiveDataFactory: FakeLiveDataFactoryType) -> None:
+    dedup = DuplicateFilter()
+    raw = _raw(FakeLiveDataFactory, matchid="42-1")
+    assert isinstance(dedup.ingest_json(raw), FakeLiveData)
+    assert dedup.ingest_json(raw) is None
+
+
+def test_ingest_json_invalid_packet_still_raises() -> None:
+    dedup = DuplicateFilter()
+    raw = json.dumps({"court": 1}).encode()
+    with pytest.raises(ValueError, match="Cannot tell"):
+        dedup.ingest_json(raw)
+
+
+def test_squore_keys() -> None:
+    dedup = DuplicateFilter()
+    packet = {"liveScoreDeviceId": "dev", "metadata": {"sourceID": "42-1"}}
+    other = {"liveScoreDeviceId": "dev", "metadata": {"sourceID": "42-2"}}
+    for p in (packet, other, packet):
+        dedup.is_duplicate(json.dumps(p))
+    assert dedup.suppressed == 1
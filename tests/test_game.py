@@ -1,6 +1,25 @@
 from tcboard.game import Game
+from tcboard.point import Point
+from tcboard.scoreline import Scoreline
 
 
 def test_game_score_list_not_tuple() -> None:
     score = (1, 2)
     assert Game(score=score).model_dump()["score"] == list(score)
+
+
+def test_game_compact_scoreline_kept() -> None:
+    scoreline = Scoreline([Point(server=0, serveside="R", player=0, data=1)])
+    assert Game(score=(1, 0), scoreline=scoreline).scoreline is scoreline
+
+
+def test_game_compact_scoreline_dumps_like_points() -> None:
+    points = [
+        Point(server=0, serveside="R", player=0, data=1, duration=3),
+        Point(server=None, serveside=None, player=1, data="S"),
+    ]
+    game = Game(score=(1, 0), scoreline=points)
+    compact = Game(score=(1, 0), scoreline=Scoreline(points))
+    assert compact.model_dump() == game.model_dump()
+    assert compact.model_dump_json() == game.model_dump_json()
+    assert compact == game
@@ -0,0 +1,229 @@
+import asyncio
+import json
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from tcboard.board import Board
+from tcboard.dedup import DuplicateFilter
+from tcboard.ingest import ShardedIngest, get_shard_key
+from tcboard.livedata import LiveData
+from tcboard.livestatus import LiveStatus
+from tcboard.matchstate import MatchState
+from tcboard.offload import OffloadService
+
+from .conftest import FakeLiveData, FakeLiveDataFactoryType, MatchFactoryType
+
+
+def _raw(
+    FakeLiveDataFactory: FakeLiveDataFactoryType, **data: int | str | datetime | None
+) -> bytes:
+    return FakeLiveDataFactory(**data).model_dump_json(round_trip=True).encode()
+
+
+@pytest.fixture
+def board(MatchFactory: MatchFactoryType) -> Board[FakeLiveData]:
+    return Board[FakeLiveData](
+        [MatchState(match=MatchFactory(id=matchid)) for matchid in ("1-1", "1-3")]
+    )
+
+
+@pytest.mark.parametrize(
+    "data, key",
+    [
+        ({"court": 3, "deviceid": "dev"}, 3),
+        ({"court": None, "deviceid": "dev"}, "dev"),
+        ({"court": None}, None),
+    ],
+)
+def test_shard_key(
+    FakeLiveDataFactory: FakeLiveDataFactoryType, data: dict[str, Any], key: Any
+) -> None:
+    assert get_shard_key(_raw(FakeLiveDataFactory, **data)) == key
+
+
+@pytest.mark.asyncio
+async def test_ingest_in_order(
+    board: Board[FakeLiveData], FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    sunk: list[LiveData] = []
+
+    async def sink(livedata: LiveData) -> None:
+        sunk.append(livedata)
+
+    statuses = [LiveStatus.WARMUP, LiveStatus.ONGOING, LiveStatus.FINISHED]
+    async with ShardedIngest(board, sink=sink) as ingest:
+        for status in statuses:
+            key = ingest.submit(
+                _raw(
+                    FakeLiveDataFactory,
+                    court=1,
+                    matchid="1-1",
+                    deviceid="dev1",
+                    status=status,
+                )
+            )
+        assert key == 1
+        await ingest.join()
+        assert ingest.lag() == {1: (0, 0.0, 3)}
+
+    assert [ld.status for ld in sunk] == statuses
+    assert (matchstate := board.get("1-1")) is not None
+    assert matchstate.status == "finished"
+
+
+@pytest.mark.asyncio
+async def test_slow_shard_holds_up_no_other(
+    board: Board[FakeLiveData], FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    release = asyncio.Event()
+
+    async def sink(livedata: LiveData) -> None:
+        if livedata.court == 3:
+            await release.wait()
+
+    async with ShardedIngest(board, sink=sink) as ingest:
+        for court, matchid, status in (
+            (3, "1-3", LiveStatus.WARMUP),
+            (3, "1-3", LiveStatus.ONGOING),
+            (1, "1-1", LiveStatus.WARMUP),
+        ):
+            ingest.submit(
+                _raw(
+                    FakeLiveDataFactory,
+                    court=court,
+                    matchid=matchid,
+                    deviceid=f"dev{court}",
+                    status=status,
+                )
+            )
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        lag = ingest.lag()
+        assert lag[1] == (0, 0.0, 1)
+        assert lag[3].queued == 2
+        assert lag[3].delay > 0
+        assert lag[3].handled == 0
+        assert (matchstate := board.get("1-1")) is not None
+        assert matchstate.livedata is not None
+
+        release.set()
+
+    assert ingest.lag() == {}
+
+
+@pytest.mark.asyncio
+async def test_ingest_invalid_dropped(
+    board: Board[FakeLiveData],
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    sunk: list[LiveData] = []
+
+    async def sink(livedata: LiveData) -> None:
+        sunk.append(livedata)
+
+    async with ShardedIngest(board, sink=sink) as ingest:
+        ingest.submit(json.dumps({"court": 1, "what": "ever"}))
+
+    assert "Dropping invalid livedata" in caplog.text
+    assert sunk == []
+
+
+@pytest.mark.asyncio
+async def test_ingest_refused_still_sunk(
+    board: Board[FakeLiveData],
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    sunk: list[LiveData] = []
+
+    async def sink(livedata: LiveData) -> None:
+        sunk.append(livedata)
+
+    async with ShardedIngest(board, sink=sink) as ingest:
+        for court in (1, 2):
+            ingest.submit(
+                _raw(
+                    FakeLiveDataFactory,
+                    court=court,
+                    matchid="1-1",
+                    deviceid="dev1",
+                    status=LiveStatus.WARMUP,
+                )
+            )
+
+    assert "Board refused livedata" in caplog.text
+    assert [ld.court for ld in sunk] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_ingest_survives_failing_sink(
+    board: Board[FakeLiveData],
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    async def sink(livedata: LiveData) -> None:
+        raise RuntimeError("database is gone")
+
+    async with ShardedIngest(board, sink=sink) as ingest:
+        for status in (LiveStatus.WARMUP, LiveStatus.ONGOING):
+            ingest.submit(
+                _raw(FakeLiveDataFactory, court=1, matchid="1-1", status=status)
+            )
+        await ingest.join()
+        assert ingest.lag()[1].handled == 2
+
+    assert caplog.text.count("Failed to ingest livedata") == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_drops_repeats(
+    board: Board[FakeLiveData], FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    sunk: list[LiveData] = []
+
+    async def sink(livedata: LiveData) -> None:
+        sunk.append(livedata)
+
+    dedup = DuplicateFilter()
+    statuses = [LiveStatus.WARMUP, LiveStatus.ONGOING]
+    async with ShardedIngest(board, sink=sink, dedup=dedup) as ingest:
+        for status in statuses:
+            for _ in range(2):
+                ingest.submit(
+                    _raw(FakeLiveDataFactory, court=1, matchid="1-1", status=status)
+                )
+        await ingest.join()
+        assert ingest.lag()[1].handled == 2
+
+    assert [ld.status for ld in sunk] == statuses
+    assert dedup.suppressed == 2
+
+
+@pytest.mark.asyncio
+async def test_submit_when_not_running(board: Board[FakeLiveData]) -> None:
+    with pytest.raises(RuntimeError, match="not running"):
+        ShardedIngest(board).submit(b"{}")
+
+
+@pytest.mark.asyncio
+async def test_ingest_in_process_pool(
+    board: Board[FakeLiveData], FakeLiveDataFactory: FakeLiveDataFactoryType
+) -> None:
+    async with OffloadService(max_workers=1) as offload:
+        async with ShardedIngest(board, offload=offload) as ingest:
+            ingest.submit(
+                _raw(
+                    FakeLiveDataFactory,
+                    court=1,
+                    matchid="1-1",
+                    status=LiveStatus.ONGOING,
+                )
+            )
+
+    assert (matchstate := board.get("1-1")) is not None
+    assert isinstance(matchstate.livedata, FakeLiveData)
+    assert matchstate.livedata.status == LiveStatus.ONGOING
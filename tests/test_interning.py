@@ -0,0 +1,77 @@
+from pydantic import BaseModel
+
+from tcboard.interning import SharedModels, load_json
+
+
+class Inner(BaseModel, extra="forbid"):
+    flag: bool = False
+    name: str = ""
+
+
+def test_shared_model_validated_once() -> None:
+    shared = SharedModels()
+    first = shared.get(Inner, {"name": "a"})
+    assert first == Inner(name="a")
+    assert shared.get(Inner, {"name": "a"}) is first
+    assert (shared.hits, shared.misses) == (1, 1)
+
+
+def test_shared_model_keys_tell_apart_equal_values() -> None:
+    shared = SharedModels()
+    assert shared.get(Inner, {"flag": True}) is not shared.get(Inner, {"flag": 1})
+    assert shared.misses == 2
+
+
+def test_shared_model_invalid_not_shared() -> None:
+    shared = SharedModels()
+    assert shared.get(Inner, {"bogus": 1}) is None
+    assert len(shared) == 0
+
+
+def test_shared_models_evicted() -> None:
+    shared = SharedModels(max_size=1)
+    first = shared.get(Inner, {"name": "a"})
+    shared.get(Inner, {"name": "b"})
+    assert len(shared) == 1
+    assert shared.get(Inner, {"name": "a"}) is not first
+
+
+def test_shared_models_clear() -> None:
+    shared = SharedModels()
+    shared.get(Inner, {"name": "a"})
+    shared.clear()
+    assert len(shared) == 0
+    assert (shared.hits, shared.misses) == (0, 0)
+
+
+def test_share_fields() -> None:
+    shared = SharedModels()
+    data = {"inner": {"name": "a"}, "other": {"name": "a"}, "none": None}
+    ret = shared.share_fields(data, {"inner": Inner, "none": Inner})
+    assert ret == data | {"inner": Inner(name="a")}
+    assert data["inner"] == {"name": "a"}
+
+
+class Outer(BaseModel):
+    inner: Inner
+    other: Inner | None = None
+
+
+def test_share_instances() -> None:
+    shared = SharedModels(max_size=1)
+    a, b = Outer(inner=Inner(name="a")), Outer(inner=Inner(name="a"))
+    for outer in (a, b):
+        shared.share_instances(outer, ("inner", "other"))
+    assert a.inner is b.inner
+    assert (shared.hits, shared.misses) == (1, 1)
+
+    c = Outer(inner=Inner(name="c"))
+    shared.share_instances(c, ("inner",))
+    assert len(shared) == 1
+    assert shared.share(Inner(name="a")) is not a.inner
+
+
+def test_load_json_interns_strings() -> None:
+    a, b = load_json(b'{"s": ["-3R-"]}'), load_json('{"s": ["-3R-"]}')
+    assert a == b == {"s": ["-3R-"]}
+    assert a["s"][0] is b["s"][0]
@@ -0,0 +1,98 @@
+from typing import Any
+
+import pytest
+
+from tcboard.jsonpatch import JSONPatch, apply_patch, make_patch
+
+DOC: dict[str, Any] = {
+    "score": [["R1--", "--L1"], ["R1--"]],
+    "result": "1-0",
+    "isGameBall": False,
+    "timing": [{"start": "10:00", "offsets": [10, 25]}],
+    "a/b": 1,
+    "m~n": None,
+}
+
+
+@pytest.mark.parametrize(
+    "new",
+    [
+        DOC,
+        DOC | {"result": "1-1"},
+        DOC | {"score": [["R1--", "--L1"], ["R1--", "L2--"]]},
+        DOC | {"score": [["R1--", "--L1"]]},
+        DOC | {"score": []},
+        DOC | {"isGameBall": 0},
+        DOC | {"a/b": 1.0},
+        DOC | {"m~n": {"x": [1]}},
+        DOC | {"new": [1, 2, 3]},
+        {k: v for k, v in DOC.items() if k != "timing"},
+        {"timing": DOC["timing"] + [{"start": "10:12", "offsets": [5]}]},
+    ],
+)
+def test_roundtrip(new: dict[str, Any]) -> None:
+    patch = make_patch(DOC, new)
+    patched = apply_patch(DOC, patch)
+    assert patched == new
+    assert [type(v) for v in patched.values()] == [type(v) for v in new.values()]
+
+
+def test_no_change() -> None:
+    assert make_patch(DOC, DOC) == []
+
+
+def test_append_is_small() -> None:
+    new = DOC | {"score": [["R1--", "--L1"], ["R1--", "L2--"]]}
+    assert make_patch(DOC, new) == [
+        {"op": "add", "path": "/score/1/-", "value": "L2--"}
+    ]
+
+
+def test_does_not_modify_inputs() -> None:
+    new = DOC | {"timing": [{"start": "10:00", "offsets": [10, 25, 40]}]}
+    patch = make_patch(DOC, new)
+    apply_patch(DOC, patch)
+    assert DOC["timing"][0]["offsets"] == [10, 25]
+
+
+def test_inplace() -> None:
+    doc = {"a": [1]}
+    ret = apply_patch(doc, [{"op": "add", "path": "/a/-", "value": 2}], inplace=True)
+    assert ret is doc
+    assert doc == {"a": [1, 2]}
+
+
+def test_replace_root() -> None:
+    assert apply_patch(DOC, make_patch(DOC, [1, 2])) == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        [{"op": "add", "path": "/x/0", "value": 1}],
+        [{"op": "replace", "path": "/x/0", "value": 1}],
+        [{"op": "remove", "path": "/x/0"}],
+    ],
+)
+def test_list_ops_by_index(patch: JSONPatch) -> None:
+    doc = {"x": [0, 9]}
+    assert (
+        apply_patch(doc, patch)["x"]
+        == {
+            "add": [1, 0, 9],
+            "replace": [1, 9],
+            "remove": [9],
+        }[patch[0]["op"]]
+    )
+
+
+@pytest.mark.parametrize(
+    "patch, match",
+    [
+        ([{"op": "remove", "path": ""}], "Cannot remove the document root"),
+        ([{"op": "move", "path": "/a", "from": "/b"}], "Unsupported JSON patch"),
+    ],
+)
+def test_invalid(patch: JSONPatch, match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        apply_patch({"a": 1, "b": 2}, patch)
@@ -1,6 +1,7 @@
 import pytest
 
 from tcboard.game import Game, Result
+from tcboard.livedata import LiveData
 from tcboard.livestatus import LiveStatus
 
 from .conftest import FakeLiveData, FakeLiveDataFactoryType
@@ -85,6 +86,15 @@ def test_dump_contains_matchid(FakeLiveDataFactory: FakeLiveDataFactoryType) ->
     assert dump.get("_matchid") == "matchid"
 
 
+def test_dump_contains_lookup_keys(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    ld = FakeLiveDataFactory(deviceid="deviceid", status=LiveStatus.ONGOING)
+    dump = ld.model_dump(round_trip=True)
+    assert dump.get("_deviceid") == "deviceid"
+    assert dump.get("_status") == "ONGOING"
+
+
 def test_ser_val_roundtrip(FakeLiveDataFactory: FakeLiveDataFactoryType) -> None:
     ld = FakeLiveDataFactory()
     dump = ld.model_dump(round_trip=True)
@@ -97,3 +107,40 @@ def test_ser_val_roundtrip_json(FakeLiveDataFactory: FakeLiveDataFactoryType) ->
     json = ld.model_dump_json(round_trip=True)
     validated = FakeLiveData.make_model_instance_json(json)
     assert validated == ld
+
+
+def test_matchscore_memoized(FakeLiveDataFactory: FakeLiveDataFactoryType) -> None:
+    ld = FakeLiveDataFactory(games=[Game(score=(11, 9), winner=0)])
+    assert ld.matchscore is ld.matchscore
+
+
+def test_matchscore_memo_cleared_on_assignment(
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    ld = FakeLiveDataFactory(games=[Game(score=(11, 9), winner=0)])
+    assert ld.matchscore == [1, 0]
+    ld.fakedata = {"games": [Game(score=(9, 11), winner=1)]}
+    assert ld.matchscore == [0, 1]
+
+
+def test_equality_ignores_memo(FakeLiveDataFactory: FakeLiveDataFactoryType) -> None:
+    ld = FakeLiveDataFactory(games=[Game(score=(11, 9), winner=0)])
+    other = ld.model_copy()
+    _ = ld.matchscore
+    assert ld == other
+
+
+def test_equality_other_type(FakeLiveDataFactory: FakeLiveDataFactoryType) -> None:
+    assert FakeLiveDataFactory() != object()
+
+
+def test_ingest_json_by_modelid(FakeLiveDataFactory: FakeLiveDataFactoryType) -> None:
+    ld = FakeLiveDataFactory(matchid="42-1")
+    ingested = LiveData.ingest_json(ld.model_dump_json(round_trip=True).encode())
+    assert isinstance(ingested, FakeLiveData)
+    assert ingested == ld
+
+
+def test_ingest_json_unknown() -> None:
+    with pytest.raises(ValueError, match="Cannot tell which kind of livedata"):
+        LiveData.ingest_json('{"court": 1}')
@@ -1,6 +1,11 @@
 import pytest
 
-from tcboard.livestatus import LiveStatus
+from tcboard.livestatus import (
+    TRANSITIONS,
+    LiveStatus,
+    find_invalid_transitions,
+    get_transition_array,
+)
 
 
 def test_name() -> None:
@@ -29,3 +34,51 @@ EXPECTED[LS.UNKNOWN] = dict.fromkeys(LS, False)
 def test_sequence_validity(cur: LiveStatus, prev: LiveStatus) -> None:
     exp = EXPECTED[cur][prev]
     assert cur.can_come_after(prev) is exp
+
+
+def test_transition_table() -> None:
+    assert TRANSITIONS == tuple(tuple(EXPECTED[cur][prev] for prev in LS) for cur in LS)
+
+
+def test_transition_array() -> None:
+    array = get_transition_array()
+    assert array.shape == (len(LS), len(LS))
+    assert array.tolist() == [list(row) for row in TRANSITIONS]
+    assert not array.flags.writeable
+
+
+SEQUENCE = [
+    LS.WARMUP,
+    LS.READY,
+    LS.ONGOING,
+    LS.GAMEBALL,
+    LS.BETWEENGAMES,
+    LS.ONGOING,
+    LS.PREPARE,
+    LS.FINISHED,
+    LS.ONGOING,
+    LS.UNKNOWN,
+]
+
+
+@pytest.mark.parametrize("have_numpy", [True, False])
+def test_find_invalid_transitions(
+    have_numpy: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("tcboard.livestatus._HAVE_NUMPY", have_numpy)
+    exp = [
+        i
+        for i in range(1, len(SEQUENCE))
+        if not SEQUENCE[i].can_come_after(SEQUENCE[i - 1])
+    ]
+    assert exp == [6, 8, 9]
+    assert find_invalid_transitions(SEQUENCE) == exp
+
+
+@pytest.mark.parametrize("have_numpy", [True, False])
+@pytest.mark.parametrize("statuses", [[], [LS.ONGOING]])
+def test_find_invalid_transitions_short(
+    have_numpy: bool, statuses: list[LiveStatus], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("tcboard.livestatus._HAVE_NUMPY", have_numpy)
+    assert find_invalid_transitions(statuses) == []
@@ -117,10 +117,46 @@ def test_receive_out_of_sequence(
     FakeLiveDataFactory: FakeLiveDataFactoryType,
 ) -> None:
     matchstate = MatchStateFactory(status=LiveStatus.GAMEBALL)
+    previous = matchstate.livedata
+    # a stray packet is ignored, but alerted on if it comes again
+    matchstate.validate_and_receive_livedata(
+        FakeLiveDataFactory(status=LiveStatus.WARMUP)
+    )
+    assert matchstate.livedata is previous
     with pytest.raises(MatchStateConflict):
         matchstate.validate_and_receive_livedata(
             FakeLiveDataFactory(status=LiveStatus.WARMUP)
         )
+    assert matchstate.livedata is previous
+
+
+def test_receive_out_of_sequence_persisting(
+    MatchStateFactory: MatchStateFactoryType,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    matchstate = MatchStateFactory(status=LiveStatus.GAMEBALL)
+    conflicts = 0
+    for _ in range(5):
+        try:
+            matchstate.validate_and_receive_livedata(
+                FakeLiveDataFactory(status=LiveStatus.WARMUP)
+            )
+        except MatchStateConflict:
+            conflicts += 1
+
+    assert conflicts == 1
+    assert matchstate.status == "warmup"
+
+
+def test_receive_in_sequence_forgets_conflicts(
+    MatchStateFactory: MatchStateFactoryType,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    matchstate = MatchStateFactory(status=LiveStatus.GAMEBALL)
+    for status in (LiveStatus.WARMUP, LiveStatus.ONGOING, LiveStatus.WARMUP):
+        matchstate.validate_and_receive_livedata(FakeLiveDataFactory(status=status))
+
+    assert matchstate.status == "ongoing"
 
 
 def test_receive_in_sequence(
@@ -133,6 +169,19 @@ def test_receive_in_sequence(
     )
 
 
+def test_receive_continues_from_previous(
+    MatchStateFactory: MatchStateFactoryType,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+    mocker: MockerFixture,
+) -> None:
+    matchstate = MatchStateFactory(status=LiveStatus.GAMEBALL)
+    previous = matchstate.livedata
+    livedata = FakeLiveDataFactory(status=LiveStatus.ONGOING)
+    spy = mocker.spy(FakeLiveData, "continue_from")
+    matchstate.validate_and_receive_livedata(livedata)
+    spy.assert_called_once_with(livedata, previous)
+
+
 def test_status_property_no_livedata(matchstate: MatchState[FakeLiveData]) -> None:
     assert matchstate.status is None
 
@@ -211,3 +260,56 @@ def test_time_finished(
     ld = FakeLiveDataFactory(endtime=now, status=LiveStatus.FINISHED)
     ms = MatchStateFactory(livedata=ld)
     assert ms.time == now
+
+
+def test_cached_json(matchstate: MatchState[FakeLiveData]) -> None:
+    dump = matchstate.cached_json()
+    assert dump == matchstate.model_dump_json().encode()
+    assert matchstate.cached_json() is dump
+    assert matchstate.cached_json(include={"acked"}) == b'{"acked":false}'
+
+
+@pytest.mark.parametrize("change", ["ack", "lock", "reset"])
+def test_change_invalidates_cached_json(
+    matchstate: MatchState[FakeLiveData], change: str
+) -> None:
+    version, dump = matchstate.version, matchstate.cached_json()
+    getattr(matchstate, change)()
+    assert matchstate.version > version
+    assert matchstate.cached_json() == matchstate.model_dump_json().encode()
+    assert matchstate.cached_json() is not dump
+
+
+def test_receive_livedata_invalidates_cached_json(
+    MatchStateFactory: MatchStateFactoryType,
+    FakeLiveDataFactory: FakeLiveDataFactoryType,
+) -> None:
+    matchstate = MatchStateFactory(status=LiveStatus.WARMUP)
+    version, dump = matchstate.version, matchstate.cached_json()
+    matchstate.validate_and_receive_livedata(
+        FakeLiveDataFactory(status=LiveStatus.ONGOING)
+    )
+    assert matchstate.version > version
+    assert b'"status":"ongoing"' in matchstate.cached_json()
+    assert dump != matchstate.cached_json()
+
+
+def test_copy_does_not_share_cached_json(
+    matchstate: MatchState[FakeLiveData],
+) -> None:
+    matchstate.cached_json()
+    copy = matchstate.model_copy()
+    assert copy.version > matchstate.version
+    copy.ack()
+    assert matchstate.cached_json() == matchstate.model_dump_json().encode()
+    assert copy.cached_json() == copy.model_dump_json().encode()
+
+
+def test_copy_with_update_does_not_share_cached_json(
+    matchstate: MatchState[FakeLiveData],
+) -> None:
+    dump = matchstate.cached_json()
+    copy = matchstate.model_copy(update={"locked": True})
+    assert copy.version > matchstate.version
+    assert b'"locked":true' in copy.cached_json()
+    assert matchstate.cached_json() is dump
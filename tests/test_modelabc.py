@@ -1,6 +1,9 @@
+from abc import abstractmethod
 from typing import Any
 
 import pytest
+from pydantic import ValidationError
+from pytest_mock import MockerFixture
 
 from tcboard.modelabc import ModelABC
 
@@ -38,3 +41,83 @@ def test_instantiate_from_unknown_modelid() -> None:
 def test_instantiate_not_possible_from_base() -> None:
     with pytest.raises(TypeError, match="Model specialisation not known"):
         _ = ModelABC.make_model_instance(data={})
+
+
+def test_validate_with_own_modelid_does_not_dispatch(mocker: MockerFixture) -> None:
+    spy = mocker.spy(ModelABC, "make_model_instance")
+    model = FakeClass.model_validate({"data": {"answer": 42}, "_modelid": MODELID})
+    assert isinstance(model, FakeClass)
+    spy.assert_not_called()
+
+
+def test_validate_with_modelid_dispatches() -> None:
+    model = ModelABC.model_validate({"data": {"answer": 42}, "_modelid": MODELID})
+    assert isinstance(model, FakeClass)
+
+
+class OtherFakeClass(ModelABC):
+    other: int = 0
+
+
+OTHER_MODELID = "tests.test_modelabc.OtherFakeClass"
+
+
+def test_make_instances() -> None:
+    models = ModelABC.make_model_instances(
+        [
+            {"data": {"answer": 42}, "_modelid": MODELID},
+            {"other": 42, "_modelid": OTHER_MODELID},
+            FakeClass(),
+        ]
+    )
+    assert [type(m) for m in models] == [FakeClass, OtherFakeClass, FakeClass]
+
+
+def test_make_instances_restricted_to_class() -> None:
+    with pytest.raises(ValidationError, match="union_tag_invalid"):
+        FakeClass.make_model_instances([{"other": 42, "_modelid": OTHER_MODELID}])
+
+
+@pytest.mark.parametrize("data", [{"data": {}}, 42])
+def test_make_instances_without_modelid(data: Any) -> None:
+    with pytest.raises(ValidationError, match="union_tag_not_found"):
+        ModelABC.make_model_instances([data])
+
+
+def test_make_instances_json() -> None:
+    models = ModelABC.make_model_instances_json(
+        f'[{{"other": 42, "_modelid": "{OTHER_MODELID}"}}]'
+    )
+    assert models == [OtherFakeClass(other=42)]
+
+
+def test_make_instances_ndjson() -> None:
+    models = ModelABC.make_model_instances_ndjson(
+        [
+            f'{{"other": 42, "_modelid": "{OTHER_MODELID}"}}',
+            b"\n",
+            f'{{"data": {{}}, "_modelid": "{MODELID}"}}'.encode(),
+        ]
+    )
+    assert models == [OtherFakeClass(other=42), FakeClass()]
+
+
+def test_make_instances_no_specialisations() -> None:
+    class Abstract(ModelABC):
+        @abstractmethod
+        def method(self) -> None: ...
+
+    with pytest.raises(TypeError, match="No model specialisations known"):
+        Abstract.make_model_instances([])
+
+
+def test_adapters_rebuilt_on_registration() -> None:
+    data = {"other": 1, "_modelid": OTHER_MODELID}
+    assert OtherFakeClass.make_model_instances([data]) == [OtherFakeClass(other=1)]
+
+    class SubClass(OtherFakeClass): ...
+
+    [model] = OtherFakeClass.make_model_instances(
+        [{"_modelid": SubClass._model_name()}]
+    )
+    assert type(model) is SubClass
@@ -0,0 +1,104 @@
+import pickle
+
+import pytest
+from pytest_mock import MockerFixture
+
+from tcboard.boardsnapshot import BoardSnapshot
+from tcboard.livestatus import LiveStatus
+from tcboard.offload import (
+    OffloadService,
+    _dump_json,
+    _dumps,
+    _import_modules,
+    _ingest_livedata,
+    _validate_json,
+)
+
+from .conftest import FakeLiveData, MatchStateFactoryType
+
+
+@pytest.fixture
+def snapshot(MatchStateFactory: MatchStateFactoryType) -> BoardSnapshot[FakeLiveData]:
+    matchstate = MatchStateFactory(matchid="42-1", status=LiveStatus.ONGOING)
+    return BoardSnapshot[FakeLiveData](matchstates=[matchstate], livedata_id=42)
+
+
+def test_negative_workers() -> None:
+    with pytest.raises(ValueError, match="cannot be negative"):
+        OffloadService(max_workers=-1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_workers", [0, 1])
+async def test_dump_json(
+    snapshot: BoardSnapshot[FakeLiveData], max_workers: int
+) -> None:
+    async with OffloadService(max_workers=max_workers) as offload:
+        dump = await offload.dump_json(snapshot, round_trip=True)
+    assert dump == snapshot.model_dump_json(round_trip=True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_workers", [0, 1])
+async def test_validate_json(
+    snapshot: BoardSnapshot[FakeLiveData], max_workers: int
+) -> None:
+    async with OffloadService(max_workers=max_workers) as offload:
+        restored = await offload.validate_json(
+            BoardSnapshot[FakeLiveData], snapshot.dump_json()
+        )
+    assert type(restored) is BoardSnapshot[FakeLiveData]
+    assert restored == snapshot
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_workers", [0, 1])
+async def test_ingest_livedata(
+    snapshot: BoardSnapshot[FakeLiveData], max_workers: int
+) -> None:
+    livedata = snapshot.matchstates[0].livedata
+    assert livedata is not None
+    async with OffloadService(max_workers=max_workers) as offload:
+        ingested = await offload.ingest_livedata(
+            livedata.model_dump_json(round_trip=True)
+        )
+    assert ingested == livedata
+
+
+@pytest.mark.asyncio
+async def test_ingest_livedata_shares_submodels(
+    snapshot: BoardSnapshot[FakeLiveData], mocker: MockerFixture
+) -> None:
+    livedata = snapshot.matchstates[0].livedata
+    assert livedata is not None
+    share = mocker.patch.object(FakeLiveData, "share_submodels", autospec=True)
+    async with OffloadService(max_workers=1) as offload:
+        ingested = await offload.ingest_livedata(
+            livedata.model_dump_json(round_trip=True)
+        )
+    share.assert_called_once_with(ingested)
+
+
+@pytest.mark.asyncio
+async def test_inline_unless_entered(snapshot: BoardSnapshot[FakeLiveData]) -> None:
+    offload = OffloadService(max_workers=1)
+    assert await offload.dump_json(snapshot) == snapshot.model_dump_json()
+
+
+def test_import_modules() -> None:
+    _import_modules(("tcboard.ext.squore.livedata",))
+
+
+def test_pool_functions(snapshot: BoardSnapshot[FakeLiveData]) -> None:
+    # as run in the pool, where coverage does not see them
+    model = _dumps(snapshot)
+    assert _dump_json(model, {}) == snapshot.model_dump_json()
+    raw = snapshot.dump_json()
+    assert (
+        pickle.loads(_validate_json(_dumps(BoardSnapshot[FakeLiveData]), raw))
+        == snapshot
+    )
+    livedata = snapshot.matchstates[0].livedata
+    assert livedata is not None
+    raw = livedata.model_dump_json(round_trip=True)
+    assert pickle.loads(_ingest_livedata(raw)) == livedata
@@ -0,0 +1,78 @@
+import pytest
+
+from tcboard.point import Point
+from tcboard.scoreline import Scoreline
+
+
+@pytest.fixture
+def points() -> list[Point]:
+    return [
+        Point(server=0, serveside="R", player=0, data=1, duration=12),
+        Point(server=1, serveside="L", player=1, data=1),
+        Point(server=None, serveside=None, player=0, data="S", duration=0),
+        Point(server=None, serveside=None, player=1, data="L", duration=3),
+        Point(server=None, serveside=None, player=1, data="N", duration=4),
+        Point(server=1, serveside="R", player=0, data=2, duration=5),
+    ]
+
+
+def test_dump_like_points(points: list[Point]) -> None:
+    assert Scoreline(points).dump() == [p.model_dump() for p in points]
+
+
+def test_len(points: list[Point]) -> None:
+    assert len(Scoreline(points)) == len(points)
+
+
+def test_iter(points: list[Point]) -> None:
+    assert list(Scoreline(points)) == points
+
+
+def test_getitem(points: list[Point]) -> None:
+    scoreline = Scoreline(points)
+    assert scoreline[0] == points[0]
+    assert scoreline[-1] == points[-1]
+
+
+@pytest.mark.parametrize("index", [6, -7])
+def test_getitem_out_of_range(points: list[Point], index: int) -> None:
+    with pytest.raises(IndexError):
+        Scoreline(points)[index]
+
+
+def test_getitem_slice(points: list[Point]) -> None:
+    scoreline = Scoreline(points)[1:3]
+    assert isinstance(scoreline, Scoreline)
+    assert scoreline == points[1:3]
+
+
+def test_add(points: list[Point]) -> None:
+    scoreline = Scoreline()
+    for point in points:
+        scoreline.add(
+            point.server, point.serveside, point.player, point.data, point.duration
+        )
+    assert scoreline == points
+
+
+def test_extend_scoreline(points: list[Point]) -> None:
+    scoreline = Scoreline(points[:2])
+    scoreline.extend(Scoreline(points[2:]))
+    assert scoreline == Scoreline(points)
+
+
+def test_eq_other_length(points: list[Point]) -> None:
+    assert Scoreline(points) != points[:-1]
+
+
+def test_eq_other_type(points: list[Point]) -> None:
+    assert Scoreline(points) != 42
+
+
+def test_unhashable(points: list[Point]) -> None:
+    with pytest.raises(TypeError):
+        hash(Scoreline(points))
+
+
+def test_repr(points: list[Point]) -> None:
+    assert repr(Scoreline(points[:1])) == f"Scoreline({points[:1]!r})"